@@ -1,10 +1,12 @@
 import streamlit as st
 import streamlit.components.v1 as components
+from streamlit.runtime.scriptrunner import get_script_run_ctx
 import pandas as pd
 import warnings
 import os
 import typing
 import logging
+import gzip
 from decouple import config
 from typing import Union, Literal
 
@@ -22,8 +24,13 @@ from st_aggrid.shared import (
 from st_aggrid.aggrid_utils import (
     parse_update_mode,
     _parse_data_and_grid_options,
+    _grid_options_fingerprint,
+    _frame_fingerprint,
 )
 from st_aggrid.AgGridReturn import AgGridReturn
+from st_aggrid.AgGridLayout import _current_layout
+from st_aggrid.grid_payload import decode_component_value
+from st_aggrid.grid_response_store import EditsStore, GridStateStore, ViewCache
 from io import StringIO
 
 # Track shown deprecation warnings to avoid repetition in Streamlit
@@ -31,6 +38,23 @@ _shown_deprecation_warnings = set()
 
 _RELEASE = config("AGGRID_RELEASE", default=True, cast=bool)
 
+# Memory budget for cached grid views (data, selected_data) of each session
+_SESSION_VIEW_CACHE_MB = config("AGGRID_SESSION_VIEW_CACHE_MB", default=256, cast=int)
+
+# Payloads smaller than this are not worth compressing (compress_payloads=True)
+_COMPRESSION_THRESHOLD_KB = config("AGGRID_COMPRESSION_THRESHOLD_KB", default=64, cast=int)
+
+# Size of the IndexedDB dataset cache of each browser (browser_cache=True)
+_BROWSER_CACHE_MB = config("AGGRID_BROWSER_CACHE_MB", default=512, cast=int)
+
+# Smaller datasets are always sent, a cache miss would cost more than sending them
+_BROWSER_CACHE_MIN_KB = config("AGGRID_BROWSER_CACHE_MIN_KB", default=1024, cast=int)
+_SESSION_VIEW_CACHE_KEY = "__st_aggrid_view_cache__"
+_SESSION_STATE_STORE_KEY = "__st_aggrid_state_store__"
+_SESSION_EDITS_STORE_KEY = "__st_aggrid_edits_store__"
+_SESSION_BROWSER_DATA_KEY = "__st_aggrid_browser_data__"
+_SESSION_RETURN_SEQS_KEY = "__st_aggrid_return_seqs__"
+
 if not _RELEASE:
     warnings.warn("WARNING: ST_AGGRID is in development mode.")
     _component_func = components.declare_component(
@@ -43,6 +67,46 @@ else:
     _component_func = components.declare_component("agGrid", path=build_dir)
 
 
+def _session_object(key, factory):
+    """Returns the object kept under ``key`` in the session state, created with ``factory`` on first use.
+
+    Session objects are shared by all grids of a session (view cache, stores,
+    ...). Returns None when there is no script run context (e.g. bare mode),
+    callers then fall back to working without them.
+    """
+    if get_script_run_ctx(suppress_warning=True) is None:
+        return None
+    value = st.session_state.get(key)
+    if value is None:
+        value = factory()
+        st.session_state[key] = value
+    return value
+
+
+def _take_return_meta(component_value):
+    """Decodes a grid return and takes out the fields the grid adds to every return.
+
+    Returns ``(component_value, return_seq, data_cache_hash)``, ``data_cache_hash``
+    being the data_hash of the dataset the grid stored in the browser cache.
+    """
+    component_value = decode_component_value(component_value)
+    if not isinstance(component_value, dict) or not (
+        "returnSeq" in component_value or "dataCacheHash" in component_value
+    ):
+        return component_value, None, None
+    component_value = dict(component_value)
+    return (
+        component_value,
+        component_value.pop("returnSeq", None),
+        component_value.pop("dataCacheHash", None),
+    )
+
+
+def _is_data_cache_miss(component_value):
+    """Whether the component value is the grid asking for data missing from the browser cache."""
+    return isinstance(component_value, dict) and "dataCacheMiss" in component_value
+
+
 def AgGrid(
     data: Union[pd.DataFrame, str] = None,
     gridOptions: typing.Dict = None,
@@ -53,7 +117,7 @@ def AgGrid(
     ] = GridUpdateMode.NO_UPDATE,
     data_return_mode: DataReturnMode
     | Literal[
-        "AS_INPUT", "FILTERED", "FILTERED_AND_SORTED", "MINIMAL", "CUSTOM"
+        "AS_INPUT", "FILTERED", "FILTERED_AND_SORTED", "MINIMAL", "CUSTOM", "EDITS"
     ] = DataReturnMode.FILTERED_AND_SORTED,
     allow_unsafe_jscode: bool = False,
     enable_enterprise_modules: bool
@@ -75,6 +139,10 @@ def AgGrid(
     should_grid_return: JsCode = None,
     use_json_serialization: bool | Literal["auto"] = "auto",
     server_sync_strategy: Literal["client_wins", "server_wins"] = "client_wins",
+    fragment: bool = False,
+    compress_payloads: bool = False,
+    columnar_row_store: bool = False,
+    browser_cache: bool = False,
     **default_column_parameters,
 ) -> AgGridReturn:
     """Renders a DataFrame using AgGrid.
@@ -107,6 +175,9 @@ def AgGrid(
     update_mode : GridUpdateMode, optional
         DEPRECATED. Use update_on parameter instead.
         Defines how the grid sends results back to Streamlit.
+        GridUpdateMode.MANUAL holds edits, selection, filter and sort changes
+        in the browser and sends them in a single return when the toolbar
+        update button is clicked.
         Defaults to GridUpdateMode.NO_UPDATE.
 
     data_return_mode : DataReturnMode, optional
@@ -115,6 +186,8 @@ def AgGrid(
             - FILTERED: Returns filtered data in original order
             - FILTERED_AND_SORTED: Returns filtered and sorted data
             - CUSTOM: Returns CustomResponse with user-defined data structure (requires custom_jscode_for_grid_return set)
+            - EDITS: Returns only the cells edited since the last return, see AgGridReturn.edits and AgGridReturn.apply_edits.
+              AgGridReturn.data is the input data with every edit made since the grid was mounted applied
         Defaults to DataReturnMode.FILTERED_AND_SORTED.
 
     allow_unsafe_jscode : bool, optional
@@ -248,6 +321,41 @@ def AgGrid(
         to preserve user edits before re-rendering.
         Defaults to 'client_wins'.
 
+    fragment : bool, optional
+        Renders the grid inside st.fragment, so grid events rerun only the grid instead of
+        the whole script. Requires key. The latest AgGridReturn is kept in st.session_state[key],
+        where the rest of the page can read it on its next run.
+        To rerun code that depends on the grid together with it, call AgGrid from your own
+        function decorated with @st.fragment instead.
+        Defaults to False.
+
+    compress_payloads : bool, optional
+        Gzip compress large payloads in both directions: the JSON rowData sent when
+        use_json_serialization is True, and grid returns. Payloads smaller than
+        AGGRID_COMPRESSION_THRESHOLD_KB (64 by default) are sent uncompressed.
+        Requires a browser supporting CompressionStream/DecompressionStream.
+        Defaults to False.
+
+    columnar_row_store : bool, optional
+        Keeps rows in the browser as thin handles reading straight from the Arrow columns
+        instead of one JS object per row, cutting browser memory on large frames.
+        params.data.column, field based columnDefs and valueGetters work as usual, but
+        columns are inherited properties of the row objects: JsCode spreading rows
+        ({...params.data}) or using hasOwnProperty only sees edited values.
+        Ignored with JSON serialization.
+        Defaults to False.
+
+    browser_cache : bool, optional
+        Caches the data in the browser's IndexedDB, keyed by its hash, so reruns don't send
+        an unchanged dataset again. The grid stores the dataset after it is first sent and
+        reports it with its next return, from then on no data is sent: the grid reads it from
+        the cache, or asks for it with an extra rerun when the cache evicted it. Least
+        recently used datasets are evicted when the cache goes over AGGRID_BROWSER_CACHE_MB
+        (512 by default). Datasets smaller than AGGRID_BROWSER_CACHE_MIN_KB (1024 by
+        default) are always sent instead.
+        Requires key. Ignored with JSON serialization.
+        Defaults to False.
+
     **default_column_parameters
         Additional parameters passed to gridOptions.defaultColDef.
 
@@ -257,6 +365,7 @@ def AgGrid(
         The return type depends on the data_return_mode:
 
         - AS_INPUT, FILTERED, FILTERED_AND_SORTED: Returns AgGridReturn object with full grid data
+        - EDITS: Returns AgGridReturn object with the change log of edited cells
         - MINIMAL: Returns MinimalResponse object with lightweight access to raw data
         - CUSTOM: Returns CustomResponse object with user-defined data structure
 
@@ -354,7 +463,9 @@ def AgGrid(
     if update_mode:
         update_on = list(update_on)
         if update_mode == GridUpdateMode.MANUAL:
+            # Model changes are held in the browser and only counted until the update button is clicked
             manual_update = True
+            update_on = parse_update_mode(GridUpdateMode.MODEL_CHANGED, update_on)
         else:
             manual_update = False
             update_on.extend(parse_update_mode(update_mode))
@@ -393,6 +504,18 @@ def AgGrid(
     if not isinstance(data, pd.DataFrame):
         try_to_convert_back_to_original_types = False
 
+    compression_threshold = _COMPRESSION_THRESHOLD_KB * 1024 if compress_payloads else None
+    compressed_row_data = None
+    row_data = gridOptions.get("rowData")
+    if (
+        compression_threshold is not None
+        and isinstance(row_data, str)
+        and len(row_data) >= compression_threshold
+    ):
+        # Record oriented JSON is very redundant, the grid inflates it with DecompressionStream
+        compressed_row_data = gzip.compress(row_data.encode("utf-8"), compresslevel=1)
+        del gridOptions["rowData"]
+
     custom_css = custom_css or dict()
 
     if height is None:
@@ -405,6 +528,56 @@ def AgGrid(
         )
         gridOptions["autoSizeStrategy"] = {"type": "fitGridWidth"}
 
+    def _compute_data_hash(df):
+        if df is None:
+            return ""
+
+        try:
+            return _frame_fingerprint(df, pd.util.hash_pandas_object(df))
+        except TypeError:
+            import logging
+
+            logging.warning(
+                "DataFrame contains non-hashable data, attempting type conversion..."
+            )
+
+            try:
+                df_copy = df.copy()
+                for col in df_copy.columns:
+                    df_copy[col] = df_copy[col].apply(
+                        lambda x: tuple(x)
+                        if isinstance(x, list)
+                        else frozenset(x)
+                        if isinstance(x, set)
+                        else frozenset(x.items())
+                        if isinstance(x, dict)
+                        else x
+                    )
+                return _frame_fingerprint(df, pd.util.hash_pandas_object(df_copy))
+            except (TypeError, ValueError, AttributeError) as e:
+                logging.warning(
+                    f"Type conversion failed ({e}), falling back to string-based hashing..."
+                )
+                return str(hash(df.to_string()))
+
+    data_hash = _compute_data_hash(data)
+
+    if browser_cache and not key:
+        raise ValueError("Component key must be set to use the browser cache.")
+
+    browser_cache = (
+        browser_cache
+        and isinstance(data, pd.DataFrame)
+        and data.memory_usage(index=True, deep=True).sum() >= _BROWSER_CACHE_MIN_KB * 1024
+    )
+
+    # Skip sending data the browser reported it stored in its cache. The grid
+    # adds the hash of the stored dataset to its returns, a miss costs one rerun.
+    data_cached = False
+    browser_data = _session_object(_SESSION_BROWSER_DATA_KEY, dict) if browser_cache else None
+    if browser_data is not None and data is not None and data_hash:
+        data_cached = browser_data.get(key) == data_hash
+
     # Create collector based solely on data_return_mode
     if data_return_mode == DataReturnMode.MINIMAL:
         from .collectors.minimal import MinimalCollector
@@ -415,7 +588,7 @@ def AgGrid(
 
         collector = CustomCollector(original_custom_jscode_for_grid_return.js_code)
     else:
-        # Use LegacyCollector for AS_INPUT, FILTERED, FILTERED_AND_SORTED
+        # Use LegacyCollector for AS_INPUT, FILTERED, FILTERED_AND_SORTED, EDITS
         from .collectors.legacy import LegacyCollector
 
         collector = LegacyCollector(
@@ -434,28 +607,72 @@ def AgGrid(
             else data
         )
 
+    state_store = _session_object(_SESSION_STATE_STORE_KEY, GridStateStore)
     response = collector.create_initial_response(
         original_data=original_data,
         grid_options=gridOptions,
         try_to_convert_back_to_original_types=try_to_convert_back_to_original_types,
         conversion_errors=conversion_errors,
+        data_hash=data_hash,
+        view_cache=_session_object(
+            _SESSION_VIEW_CACHE_KEY,
+            lambda: ViewCache(max_bytes=_SESSION_VIEW_CACHE_MB * 1024 * 1024),
+        ),
+        state_store=state_store,
+        edits_store=_session_object(_SESSION_EDITS_STORE_KEY, EditsStore),
     )
 
+    if fragment and not key:
+        raise ValueError("Component key must be set to render the grid in a fragment.")
+    if fragment and not hasattr(st, "fragment"):
+        raise ValueError("fragment=True requires streamlit >= 1.37.")
+
+    def _forget_browser_data():
+        # The browser cache evicted the data, it is sent on the next run
+        if browser_data is not None:
+            browser_data[key] = None
+
+    return_seqs = _session_object(_SESSION_RETURN_SEQS_KEY, dict) if key else None
+
+    def _received(component_value):
+        # Remembers the return number, echoed to the grid as ack_seq, and the
+        # dataset the browser cache holds
+        component_value, return_seq, data_cache_hash = _take_return_meta(component_value)
+        if return_seq is not None and return_seqs is not None:
+            return_seqs[key] = return_seq
+        if data_cache_hash is not None and browser_data is not None:
+            browser_data[key] = data_cache_hash
+        return component_value
+
     if callback and not key:
         raise ValueError("Component key must be set to use a callback.")
 
     elif key and not callback:
         # This allows the table to keep its state up to date (eg #176)
-        def _inner_callback():
-            component_value = st.session_state.get(key)
+        def _inner_callback(component_value=None):
+            # AgGridLayout passes the value routed to this grid
+            if component_value is None:
+                component_value = st.session_state.get(key)
+            component_value = _received(component_value)
+            if _is_data_cache_miss(component_value):
+                _forget_browser_data()
+                st.session_state[key] = response
+                return
             # Update the existing response object with new component value and store the wrapped response
             updated_response = collector.update_response(response, component_value)
             st.session_state[key] = updated_response
 
     elif callback and key:
         # User defined callback
-        def _inner_callback():
-            component_value = st.session_state.get(key)
+        def _inner_callback(component_value=None):
+            # AgGridLayout passes the value routed to this grid
+            if component_value is None:
+                component_value = st.session_state.get(key)
+            component_value = _received(component_value)
+            if _is_data_cache_miss(component_value):
+                _forget_browser_data()
+                st.session_state[key] = response
+                return
             # Update the existing response object with new component value and store the wrapped response
             updated_response = collector.update_response(response, component_value)
             st.session_state[key] = updated_response
@@ -465,44 +682,12 @@ def AgGrid(
 
     pro_assets = default_column_parameters.pop("pro_assets", None)
 
-    def _compute_data_hash(df):
-        if df is None:
-            return ""
-
-        try:
-            return str(pd.util.hash_pandas_object(df).sum())
-        except TypeError:
-            import logging
-
-            logging.warning(
-                "DataFrame contains non-hashable data, attempting type conversion..."
-            )
-
-            try:
-                df_copy = df.copy()
-                for col in df_copy.columns:
-                    df_copy[col] = df_copy[col].apply(
-                        lambda x: tuple(x)
-                        if isinstance(x, list)
-                        else frozenset(x)
-                        if isinstance(x, set)
-                        else frozenset(x.items())
-                        if isinstance(x, dict)
-                        else x
-                    )
-                return str(pd.util.hash_pandas_object(df_copy).sum())
-            except (TypeError, ValueError, AttributeError) as e:
-                logging.warning(
-                    f"Type conversion failed ({e}), falling back to string-based hashing..."
-                )
-                return str(hash(df.to_string()))
-
-    data_hash = _compute_data_hash(data)
-
     _component_func_args = dict(
-        data=data,
+        data=None if data_cached else data,
         data_hash=data_hash,
+        data_cached=data_cached,
         gridOptions=gridOptions,
+        grid_options_fingerprint=_grid_options_fingerprint(gridOptions),
         height=height,
         data_return_mode=data_return_mode,
         frame_dtypes=str(frame_dtypes),
@@ -526,49 +711,80 @@ def AgGrid(
         update_on=update_on,
         use_json_serialization=use_json_serialization,
         server_sync_strategy=server_sync_strategy,
+        state_tokens=state_store.known_tokens() if state_store is not None else [],
+        compressed_row_data=compressed_row_data,
+        compression_threshold=compression_threshold,
+        columnar_row_store=columnar_row_store,
+        browser_cache_max_bytes=_BROWSER_CACHE_MB * 1024 * 1024 if browser_cache else None,
+        ack_seq=return_seqs.get(key) if return_seqs is not None else None,
     )
 
-    try:
-        component_value = _component_func(**_component_func_args)
-    except Exception as ex:
-        # Check if this is a PyArrow conversion error and we should try JSON serialization
-        error_msg = str(ex)
-        is_pyarrow_error = (
-            "Could not convert" in error_msg
-            or "pyarrow" in error_msg.lower()
-            or "ArrowInvalid" in error_msg
-            or "Conversion failed" in error_msg
-        )
-
-        if use_json_serialization == "auto" and data is not None and is_pyarrow_error:
-            logging.warning(
-                f"PyArrow conversion failed, automatically retrying with JSON serialization: {error_msg}"
+    def _render_grid():
+        try:
+            component_value = _component_func(**_component_func_args)
+        except Exception as ex:
+            # Check if this is a PyArrow conversion error and we should try JSON serialization
+            error_msg = str(ex)
+            is_pyarrow_error = (
+                "Could not convert" in error_msg
+                or "pyarrow" in error_msg.lower()
+                or "ArrowInvalid" in error_msg
+                or "Conversion failed" in error_msg
             )
-            # Retry with JSON serialization enabled
-            _component_func_args["use_json_serialization"] = True
-            return AgGrid(**_component_func_args)
-        elif not use_json_serialization and data is not None and is_pyarrow_error:
-            # User explicitly disabled JSON serialization, raise the PyArrow error
-            raise ex
-        else:
-            # For other exceptions, add the original error message enhancement
+
+            if use_json_serialization == "auto" and data is not None and is_pyarrow_error:
+                logging.warning(
+                    f"PyArrow conversion failed, automatically retrying with JSON serialization: {error_msg}"
+                )
+                # Retry with JSON serialization enabled
+                _component_func_args["use_json_serialization"] = True
+                return AgGrid(**_component_func_args)
+            elif not use_json_serialization and data is not None and is_pyarrow_error:
+                # User explicitly disabled JSON serialization, raise the PyArrow error
+                raise ex
+            else:
+                # For other exceptions, add the original error message enhancement
+                args = list(ex.args)
+                args[0] += (
+                    ". If you're using custom JsCode objects on gridOptions, ensure that allow_unsafe_jscode is True."
+                )
+                raise type(ex)(*args)
+
+        return _update_response(component_value)
+
+    def _update_response(component_value):
+        component_value, _, _ = _take_return_meta(component_value)
+        # Data requests are not grid returns
+        if _is_data_cache_miss(component_value):
+            component_value = None
+
+        # Update the response object with final component data
+        try:
+            updated_response = collector.update_response(response, component_value)
+        except Exception as ex:
+            # Enhanced error message for collector issues
             args = list(ex.args)
-            args[0] += (
-                ". If you're using custom JsCode objects on gridOptions, ensure that allow_unsafe_jscode is True."
-            )
+            args[0] += f". Error in {collector.__class__.__name__} processing."
+            if data_return_mode == DataReturnMode.CUSTOM:
+                args[0] += (
+                    " Check your custom_jscode_for_grid_return JsCode implementation."
+                )
             raise type(ex)(*args)
 
-    # Update the response object with final component data
-    try:
-        response = collector.update_response(response, component_value)
-    except Exception as ex:
-        # Enhanced error message for collector issues
-        args = list(ex.args)
-        args[0] += f". Error in {collector.__class__.__name__} processing."
-        if data_return_mode == DataReturnMode.CUSTOM:
-            args[0] += (
-                " Check your custom_jscode_for_grid_return JsCode implementation."
-            )
-        raise type(ex)(*args)
+        return updated_response
+
+    layout = _current_layout()
+    if layout is not None:
+        if fragment:
+            raise ValueError("fragment=True is not supported inside an AgGridLayout.")
+        # Rendered with the other grids of the layout when its with block exits
+        return _update_response(
+            layout.add_grid(key, _component_func_args, _inner_callback)
+        )
+
+    if fragment:
+        # Grid events rerun only this fragment, the rest of the page reads the
+        # latest response from st.session_state[key]
+        return st.fragment(_render_grid)()
 
-    return response
+    return _render_grid()
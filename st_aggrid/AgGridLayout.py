@@ -0,0 +1,123 @@
+import threading
+
+import pandas as pd
+import streamlit as st
+
+from st_aggrid.grid_payload import split_layout_value
+
+_SESSION_LAYOUT_VALUES_KEY = "__st_aggrid_layout_values__"
+
+# Component args that belong to the layout, not to its grids
+_LAYOUT_ARGS = ("key", "default", "on_change")
+
+_active = threading.local()
+
+
+def _current_layout():
+    """Returns the AgGridLayout whose ``with`` block is running in this thread, if any."""
+    return getattr(_active, "layout", None)
+
+
+class AgGridLayout:
+    """Renders several grids in a single component iframe.
+
+    Every grid of a Streamlit page is an iframe loading its own copy of React,
+    AG Grid, themes and fonts. Grids rendered by ``AgGrid`` calls inside a
+    layout's ``with`` block share one iframe instead, and are laid out in
+    ``columns`` columns. Each grid still returns its own ``AgGridReturn``,
+    callbacks and ``st.session_state[key]`` work as with a standalone grid.
+
+    Example
+    -------
+    >>> with AgGridLayout(key="dashboard", columns=2):
+    ...     orders = AgGrid(orders_df, key="orders", height=300)
+    ...     customers = AgGrid(customers_df, key="customers", height=300)
+
+    Grids are rendered when the ``with`` block exits, every grid needs a key
+    and fragment=True is not supported inside a layout.
+    """
+
+    def __init__(self, key, columns: int = 1):
+        if not key:
+            raise ValueError("Component key must be set to use an AgGridLayout.")
+        if columns < 1:
+            raise ValueError("columns must be at least 1.")
+        self.key = key
+        self.columns = columns
+        self._grids = {}
+        self._callbacks = {}
+        self._values = {}
+
+    def __enter__(self):
+        if _current_layout() is not None:
+            raise ValueError("AgGridLayout can not be nested.")
+
+        from st_aggrid.AgGrid import _session_object
+
+        # Last component value of each grid of each layout, by grid key
+        layout_values = _session_object(_SESSION_LAYOUT_VALUES_KEY, dict)
+        if layout_values is None:
+            # No session (e.g. bare mode), grids start without a value
+            self._values = {}
+        else:
+            self._values = layout_values.setdefault(self.key, {})
+            self._route(st.session_state.get(self.key))
+
+        _active.layout = self
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        _active.layout = None
+        if exc_type is not None:
+            return False
+
+        from st_aggrid.AgGrid import _component_func
+
+        # DataFrames and bytes are only serialized as top level component args
+        layout_args = {}
+        grids = []
+        for grid_key, grid_args in self._grids.items():
+            spec = {"grid_key": grid_key, "hoisted_args": []}
+            for name, value in grid_args.items():
+                if name in _LAYOUT_ARGS:
+                    continue
+                if isinstance(value, (pd.DataFrame, bytes)):
+                    layout_args[f"{name}::{grid_key}"] = value
+                    spec["hoisted_args"].append(name)
+                else:
+                    spec[name] = value
+            grids.append(spec)
+
+        _component_func(
+            layout_grids=grids,
+            layout_columns=self.columns,
+            key=self.key,
+            default=None,
+            on_change=self._on_change,
+            **layout_args,
+        )
+        return False
+
+    def add_grid(self, grid_key, component_args, callback):
+        """Adds a grid to the layout, returns its last component value."""
+        if not grid_key:
+            raise ValueError("Component key must be set to render the grid in an AgGridLayout.")
+        if grid_key in self._grids:
+            raise ValueError(f"Duplicate grid key {grid_key!r} in AgGridLayout.")
+        self._grids[grid_key] = component_args
+        self._callbacks[grid_key] = callback
+        return self._values.get(grid_key)
+
+    def _route(self, value):
+        """Stores a layout return under the key of the grid that sent it."""
+        grid_key, grid_value = split_layout_value(value)
+        if grid_key is None:
+            return None
+        self._values[grid_key] = grid_value
+        return grid_key
+
+    def _on_change(self):
+        grid_key = self._route(st.session_state.get(self.key))
+        callback = self._callbacks.get(grid_key)
+        if callback is not None:
+            return callback(self._values[grid_key])
@@ -7,6 +7,110 @@ import numpy as np
 import inspect
 import re
 import warnings
+import functools
+
+from st_aggrid.grid_payload import decode_component_value
+from st_aggrid.grid_response_store import (
+    CompactNodes,
+    EditsStore,
+    ViewCache,
+    SELECTED,
+    NOT_SELECTED,
+)
+
+
+# getRowId functions returning a field of the row, e.g. "params => params.data.id"
+_ROW_ID_FIELD_RE = re.compile(
+    r"""\bdata\s*(?:\.\s*([A-Za-z_$][\w$]*)|\[\s*['"]([^'"]+)['"]\s*\])"""
+)
+
+
+def _row_id_field(grid_options):
+    """Name of the row field used as row id by ``getRowId``, if it can be read from its code."""
+    get_row_id = (grid_options or {}).get("getRowId")
+    code = getattr(get_row_id, "js_code", get_row_id)
+    if not isinstance(code, str):
+        return None
+
+    fields = {a or b for a, b in _ROW_ID_FIELD_RE.findall(code)}
+    return fields.pop() if len(fields) == 1 else None
+
+
+@functools.lru_cache(maxsize=4096)
+def _parse_aggrid_group_ids(parent_path: str) -> tuple:
+    """Parse AG-Grid auto-generated IDs to extract meaningful group names.
+
+    Only used for responses carrying a legacy ``parentPath`` instead of
+    ``groupKeys``. Results are cached across reruns.
+
+    Based on actual observed structure:
+    Example: "ROOT_NODE_ID.row-group-sport-Swimming.row-group-sport-Swimming-athlete-Michael Phelps"
+
+    Pattern analysis:
+    - Level 1: "row-group-sport-Swimming" -> key is "Swimming"
+    - Level 2: "row-group-sport-Swimming-athlete-Michael Phelps" -> new key is "Michael Phelps"
+
+    Each level adds: -{colId}-{key} to the previous path
+    We need to extract just the keys in order: ("Swimming", "Michael Phelps")
+    """
+    if not parent_path:
+        return ()
+
+    # Remove ROOT_NODE_ID prefix if present
+    if parent_path.startswith("ROOT_NODE_ID."):
+        parent_path = parent_path[13:]  # len("ROOT_NODE_ID.") = 13
+
+    # Split by dots to get each level
+    parts = parent_path.split(".")
+    group_keys = []
+
+    for i, part in enumerate(parts):
+        if part.startswith("row-group-"):
+            # Remove 'row-group-' prefix
+            content = part[10:]  # len('row-group-') = 10
+
+            if not content:
+                continue
+
+            if i == 0:
+                # First level: row-group-{colId}-{key}
+                # Find the first dash and take everything after it
+                first_dash = content.find("-")
+                if first_dash > 0:
+                    key = content[first_dash + 1 :]
+                    group_keys.append(key)
+            else:
+                # Subsequent levels contain the full path: {previousPath}-{colId}-{key}
+                # We need to find what's new compared to the previous level
+
+                # Get the previous part to compare
+                prev_part = parts[i - 1]
+                if prev_part.startswith("row-group-"):
+                    prev_content = prev_part[10:]
+
+                    # The current content should start with prev_content
+                    # followed by -{colId}-{key}
+                    if content.startswith(prev_content):
+                        # Extract the new part: -{colId}-{key}
+                        new_part = content[len(prev_content) :]
+                        if new_part.startswith("-"):
+                            new_part = new_part[1:]  # Remove leading dash
+
+                            # Find the next dash (after colId) and extract key
+                            dash_pos = new_part.find("-")
+                            if dash_pos > 0:
+                                key = new_part[dash_pos + 1 :]
+                                group_keys.append(key)
+                            else:
+                                # No dash found, the whole thing is the key
+                                group_keys.append(new_part)
+                    else:
+                        # Fallback: extract the last key-like segment
+                        segments = content.split("-")
+                        if len(segments) >= 2:
+                            group_keys.append(segments[-1])
+
+    return tuple(group_keys)
 
 
 class AgGridReturn(Mapping):
@@ -24,6 +128,12 @@ class AgGridReturn(Mapping):
         data_return_mode=DataReturnMode.AS_INPUT,
         conversion_errors="coerce",
         frame_dtypes=None,
+        data_hash=None,
+        view_cache=None,
+        auto_row_ids=True,
+        state_store=None,
+        row_id_field=None,
+        edits_store=None,
     ) -> None:
         super().__init__()
 
@@ -31,55 +141,144 @@ class AgGridReturn(Mapping):
         self._original_data = originalData
         self._data_return_mode = data_return_mode
         self._conversion_errors = conversion_errors
+        self._data_hash = data_hash
+        self._auto_row_ids = auto_row_ids
+        self._state_store = state_store
+        self._row_id_field = row_id_field
+        self._edits_store = edits_store if edits_store is not None else EditsStore()
 
         # State
         self._component_value_set = grid_response is True
+        self._nodes = CompactNodes(None)
+        self._all_edits = []
+        self._views = {}
+        self._view_cache = view_cache if view_cache is not None else ViewCache()
         self.__dict__["grid_response"] = grid_response
         self.frame_dtypes = frame_dtypes
 
     def _set_component_value(self, component_value):
-        """Set the response value from the AgGrid component."""
+        """Set the response value from the AgGrid component.
+
+        The raw node list is converted to a compact columnar form right away and
+        is not kept, so stored responses don't hold one dict per grid node.
+        """
         self._component_value_set = True
+        component_value = dict(decode_component_value(component_value))
+        self._nodes = CompactNodes(
+            component_value.pop("nodes", None),
+            selected_ranges=component_value.pop("selectedRanges", None),
+            indeterminate_ranges=component_value.pop("indeterminateRanges", None),
+            leaf_columns=component_value.pop("leafColumns", None),
+        )
+        self._merge_state_slices(component_value)
+        if component_value.get("editsToken") is not None:
+            # Edits made before the grid got new data don't apply to it
+            self._all_edits = self._edits_store.merge(
+                (component_value["editsToken"], self._data_hash),
+                component_value.get("editsStart"),
+                component_value.get("edits"),
+            )
         self.__dict__["grid_response"] = component_value
+        self._clear_views()
 
         # Ensure gridOptions is a dict
         grid_options = self.__dict__["grid_response"].get("gridOptions")
         if grid_options and not isinstance(grid_options, dict):
             self.__dict__["grid_response"]["gridOptions"] = json.loads(grid_options)
 
+    def _merge_state_slices(self, component_value):
+        """Replace the grid/columns state slices sent by the grid with the full merged state."""
+        token = component_value.pop("stateToken", None)
+        seq = component_value.pop("stateSeq", None)
+        full = component_value.pop("stateFull", True)
+        if token is None or self._state_store is None:
+            return
+
+        grid_state, columns_state = self._state_store.merge(
+            token,
+            seq,
+            full,
+            component_value.get("gridState"),
+            component_value.get("columnsState"),
+        )
+        component_value["gridState"] = grid_state
+        component_value["columnsState"] = columns_state
+
+    # ==========================================
+    # Cached Views
+    # ==========================================
+
+    def _cached_view(self, name, build):
+        """Return a view built from the response, caching it in the session view cache."""
+        if name in self._views:
+            self._view_cache.touch(self, name)
+            return self._views[name]
+
+        value = build()
+        self._views[name] = value
+        self._view_cache.add(self, name, value)
+        return value
+
+    def _clear_views(self):
+        for name in list(self._views):
+            self._view_cache.discard(self, name)
+        self._views.clear()
+
     # ==========================================
     # Basic Properties - Direct Grid Response Access
     # ==========================================
 
     @property
-    def grid_response(self):
-        """Raw response from component."""
+    def _response(self):
+        """Component response without the node list."""
         return self.__dict__["grid_response"]
 
+    @property
+    def grid_response(self):
+        """Raw response from component.
+
+        The ``nodes`` list is rebuilt from the compact storage on each access,
+        prefer ``data``/``selected_data`` on large grids.
+        """
+        response = self._response
+        if not self._component_value_set or not isinstance(response, dict):
+            return response
+        return {**response, "nodes": self._nodes.to_nodes()}
+
     @property
     def rows_id_after_sort_and_filter(self):
         """The row indexes after sort and filter is applied"""
-        return self.grid_response.get("rowIdsAfterSortAndFilter")
+        return self._response.get("rowIdsAfterSortAndFilter")
 
     @property
     def rows_id_after_filter(self):
         """The filtered row indexes"""
-        return self.grid_response.get("rowIdsAfterFilter")
+        return self._response.get("rowIdsAfterFilter")
 
     @property
     def grid_options(self):
         """GridOptions as applied on the grid."""
-        return self.grid_response.get("gridOptions", {})
+        return self._response.get("gridOptions", {})
 
     @property
     def columns_state(self):
         """Gets the state of the columns. Typically used when saving column state."""
-        return self.grid_response.get("columnsState")
+        return self._response.get("columnsState")
 
     @property
     def grid_state(self):
         """Gets the grid state. Tipically used on initialState option. (https://ag-grid.com/javascript-data-grid//grid-options/#reference-miscellaneous-initialState)"""
-        return self.grid_response.get("gridState")
+        return self._cached_view("grid_state", self._build_grid_state)
+
+    def _build_grid_state(self):
+        grid_state = self._response.get("gridState")
+
+        # Row selection is sent as ranges, rebuild the id list AgGrid's state expects
+        if isinstance(grid_state, dict) and "rowSelection" not in grid_state:
+            selected_ids = self._nodes.selected_ids()
+            if selected_ids:
+                grid_state = {**grid_state, "rowSelection": selected_ids}
+        return grid_state
 
     @property
     def selected_rows_id(self):
@@ -184,135 +383,79 @@ class AgGridReturn(Mapping):
 
         return column.apply(safe_timedelta).astype(original_dtype, copy=False)
 
-    def _create_dataframe_from_nodes(self, nodes):
-        """Create a DataFrame from grid nodes."""
-        # Extract data from non-group nodes
-        data = pd.DataFrame(
-            [n.get("data", {}) for n in nodes if not n.get("group", False)],
-            dtype=object,
-        )
+    def _create_dataframe_from_nodes(self, leaf_mask=None):
+        """Create a DataFrame from the leaf nodes, optionally only those in ``leaf_mask``."""
+        data = self._nodes.leaf_data
+        if leaf_mask is not None:
+            data = data[leaf_mask]
 
         # Set index from auto_unique_id if available
         if "::auto_unique_id::" in data.columns:
-            data.index = pd.Index(data["::auto_unique_id::"], name="index")
             # Remove the internal column - it's only used for indexing
-            data = data.drop(columns=["::auto_unique_id::"])
+            data = data.set_index("::auto_unique_id::")
+            data.index.name = "index"
 
         if self.frame_dtypes is not None:
             data = self._convert_column_types(data)
         return data
 
-    def _process_grouped_response(self, nodes):
+    def _process_grouped_response(self, leaf_mask=None):
         """Process nodes with grouping information."""
+        group_keys = self._nodes.group_keys
+
         # Create data with parent information
-        data_rows = []
-        for node in nodes:
-            if not node.get("group", False):  # Only leaf nodes
-                parent_path = node.get("parentPath", "")
-                row_data = {**node.get("data", {}), "parentPath": parent_path}
-                data_rows.append(row_data)
+        data = self._nodes.leaf_data.copy()
+        data["::parent_id::"] = self._nodes.leaf_parents
+        if leaf_mask is not None:
+            data = data[leaf_mask]
 
         # Set index and clean up
-        data = pd.DataFrame(data_rows)
         if "::auto_unique_id::" in data.columns:
             data = data.set_index("::auto_unique_id::")
             # Apply filtering and sorting if needed
             data = self._apply_filtering_and_sorting(data, only_selected=False)
             data.index.name = ""
 
-        # Group by parent path and parse AG-Grid IDs for meaningful group names
-        # Use sort=False to preserve original order and improve performance
+        # Split rows by parent in a single pass, keeping first-seen group order.
+        # Leaves outside any group have parent "" and form their own group, only
+        # leaves whose parent is missing (None/NaN) get code -1 and are dropped.
+        codes, parents = pd.factorize(data.pop("::parent_id::"), sort=False)
+        order = np.argsort(codes, kind="stable")
+        order = order[codes[order] >= 0]
+        bounds = np.searchsorted(codes[order], np.arange(1, len(parents)))
+
         groups = []
-        for parent_path, group_data in data.groupby("parentPath", sort=False):
-            group_key = self._parse_aggrid_group_ids(parent_path)
-            clean_data = group_data.drop("parentPath", axis=1)
-            groups.append({group_key: clean_data})
+        for parent, positions in zip(parents, np.split(order, bounds)):
+            if parent in group_keys:
+                group_key = group_keys[parent]
+            else:
+                group_key = _parse_aggrid_group_ids(parent)
+            groups.append({group_key: data.take(positions)})
 
         return groups
 
     def _parse_aggrid_group_ids(self, parent_path: str) -> tuple:
-        """Parse AG-Grid auto-generated IDs to extract meaningful group names.
-
-        Based on actual observed structure:
-        Example: "ROOT_NODE_ID.row-group-sport-Swimming.row-group-sport-Swimming-athlete-Michael Phelps"
-
-        Pattern analysis:
-        - Level 1: "row-group-sport-Swimming" -> key is "Swimming"
-        - Level 2: "row-group-sport-Swimming-athlete-Michael Phelps" -> new key is "Michael Phelps"
-
-        Each level adds: -{colId}-{key} to the previous path
-        We need to extract just the keys in order: ("Swimming", "Michael Phelps")
-        """
-        if not parent_path:
-            return ()
-
-        # Remove ROOT_NODE_ID prefix if present
-        if parent_path.startswith("ROOT_NODE_ID."):
-            parent_path = parent_path[13:]  # len("ROOT_NODE_ID.") = 13
-
-        # Split by dots to get each level
-        parts = parent_path.split(".")
-        group_keys = []
-
-        for i, part in enumerate(parts):
-            if part.startswith("row-group-"):
-                # Remove 'row-group-' prefix
-                content = part[10:]  # len('row-group-') = 10
-
-                if not content:
-                    continue
-
-                if i == 0:
-                    # First level: row-group-{colId}-{key}
-                    # Find the first dash and take everything after it
-                    first_dash = content.find("-")
-                    if first_dash > 0:
-                        key = content[first_dash + 1 :]
-                        group_keys.append(key)
-                else:
-                    # Subsequent levels contain the full path: {previousPath}-{colId}-{key}
-                    # We need to find what's new compared to the previous level
-
-                    # Get the previous part to compare
-                    prev_part = parts[i - 1]
-                    if prev_part.startswith("row-group-"):
-                        prev_content = prev_part[10:]
-
-                        # The current content should start with prev_content
-                        # followed by -{colId}-{key}
-                        if content.startswith(prev_content):
-                            # Extract the new part: -{colId}-{key}
-                            new_part = content[len(prev_content) :]
-                            if new_part.startswith("-"):
-                                new_part = new_part[1:]  # Remove leading dash
-
-                                # Find the next dash (after colId) and extract key
-                                dash_pos = new_part.find("-")
-                                if dash_pos > 0:
-                                    key = new_part[dash_pos + 1 :]
-                                    group_keys.append(key)
-                                else:
-                                    # No dash found, the whole thing is the key
-                                    group_keys.append(new_part)
-                        else:
-                            # Fallback: extract the last key-like segment
-                            segments = content.split("-")
-                            if len(segments) >= 2:
-                                group_keys.append(segments[-1])
-
-        return tuple(group_keys)
+        """Parse AG-Grid auto-generated IDs to extract meaningful group names."""
+        return _parse_aggrid_group_ids(parent_path)
 
     def _get_data(self, only_selected=False):
         """Get data from the grid, optionally filtering to selected rows only."""
         if not self._component_value_set:
             return None if only_selected else self._original_data
 
-        nodes = self.grid_response.get("nodes", [])
+        # Only edited cells are returned, selection isn't tracked
+        if self._data_return_mode == DataReturnMode.EDITS:
+            if only_selected:
+                return None
+            if isinstance(self._original_data, pd.DataFrame):
+                return self._patch(self._original_data, self._all_edits)
+            return self._original_data
 
         # Filter to selected nodes if requested
+        leaf_mask = None
         if only_selected:
-            nodes = [n for n in nodes if n.get("isSelected", False)]
-            if not nodes:
+            leaf_mask = self._nodes.leaf_selected == SELECTED
+            if not leaf_mask.any():
                 return None
 
         # Handle DataFrame data
@@ -320,12 +463,12 @@ class AgGridReturn(Mapping):
             isinstance(self._original_data, pd.DataFrame)
             and not self._original_data.empty
         ):
-            data = self._create_dataframe_from_nodes(nodes)
+            data = self._create_dataframe_from_nodes(leaf_mask)
             return self._apply_filtering_and_sorting(data, only_selected)
 
         # Handle JSON/string data or empty DataFrame
         if self._should_return_json_data():
-            return self._create_json_response(nodes)
+            return self._create_json_response(leaf_mask)
 
         return self._original_data if not only_selected else None
 
@@ -340,11 +483,13 @@ class AgGridReturn(Mapping):
             reindex_ids = None
 
         if reindex_ids:
-            reindex_ids = pd.Index(reindex_ids)
-            if only_selected:
-                reindex_ids = reindex_ids.intersection(data.index)
+            # Resolve ids to row positions using the cached index for this dataset
+            # when the rows still line up with it, then apply them with one take.
+            index = self._get_id_index(data.index)
+            positions = index.get_indexer(reindex_ids)
+            positions = positions[positions >= 0]
 
-            data = data.reindex(index=reindex_ids).reset_index(drop=True)
+            data = data.take(positions).reset_index(drop=True)
 
             # Remove auto_unique_id column if present
             columns = [col for col in data.columns if col != "::auto_unique_id::"]
@@ -352,6 +497,24 @@ class AgGridReturn(Mapping):
 
         return data
 
+    def _get_id_index(self, index):
+        """Return the session's cached id index for this dataset in place of ``index``.
+
+        The cached ``pd.Index`` keeps its hash table between reruns, so looking
+        ids up in it doesn't rehash every row id. Only indexes covering every
+        row of the original dataset are cached, subsets of rows (e.g. selected
+        rows only) use their own index.
+        """
+        original = self._original_data
+        if (
+            not self._data_hash
+            or not isinstance(original, pd.DataFrame)
+            or len(index) != len(original)
+        ):
+            return index
+
+        return self._view_cache.id_index((self._data_hash, len(index)), index)
+
     def _should_return_json_data(self):
         """Check if we should return JSON data instead of DataFrame."""
         data = self._original_data
@@ -369,8 +532,8 @@ class AgGridReturn(Mapping):
         except (json.JSONDecodeError, TypeError):
             return False
 
-    def _create_json_response(self, nodes):
-        """Create JSON response from nodes."""
+    def _create_json_response(self, leaf_mask=None):
+        """Create JSON response from the leaf nodes."""
         if self._data_return_mode == DataReturnMode.FILTERED:
             filter_ids = self.rows_id_after_filter or []
         elif self._data_return_mode == DataReturnMode.FILTERED_AND_SORTED:
@@ -378,20 +541,23 @@ class AgGridReturn(Mapping):
         else:
             filter_ids = None
 
-        sorted_nodes = sorted(nodes, key=lambda n: n.get("rowIndex", 0))
+        nodes = self._nodes
+        data = nodes.leaf_data
+        ids = nodes.ids[nodes.leaf_positions]
+        row_index = nodes.row_index[nodes.leaf_positions]
 
+        keep = np.ones(len(data), dtype=bool) if leaf_mask is None else leaf_mask
         if filter_ids:
-            data_list = [n["data"] for n in sorted_nodes if n["id"] in filter_ids]
-        else:
-            data_list = [n["data"] for n in sorted_nodes]
+            keep = keep & pd.Index(ids).isin(filter_ids)
 
-        # Remove internal columns from each data item
-        data_list = [
-            {k: v for k, v in item.items() if not k.startswith("::")}
-            for item in data_list
-        ]
+        # Sort by rowIndex (missing last) and remove internal columns
+        positions = np.flatnonzero(keep)
+        positions = positions[np.argsort(np.nan_to_num(row_index[positions], nan=0), kind="stable")]
+        columns = [c for c in data.columns if not str(c).startswith("::")]
+        data = data.iloc[positions][columns].astype(object)
+        data = data.where(data.notna(), None)
 
-        return json.dumps(data_list)
+        return json.dumps(data.to_dict(orient="records"))
 
     # ==========================================
     # Main Data Access Properties
@@ -399,42 +565,147 @@ class AgGridReturn(Mapping):
 
     @property
     def data(self):
-        """Data from the grid. If rows are grouped, return only the leaf rows."""
-        return self._get_data(only_selected=False)
+        """Data from the grid. If rows are grouped, return only the leaf rows.
+
+        The result is cached until the next grid response, treat it as read-only.
+        """
+        return self._cached_view("data", lambda: self._get_data(only_selected=False))
 
     @property
     def selected_data(self):
-        """Selected data from the grid."""
-        return self._get_data(only_selected=True)
+        """Selected data from the grid.
+
+        The result is cached until the next grid response, treat it as read-only.
+        """
+        return self._cached_view(
+            "selected_data", lambda: self._get_data(only_selected=True)
+        )
+
+    @property
+    def edits(self):
+        """Change log of the cells edited since the previous return (DataReturnMode.EDITS).
+
+        DataFrame with one row per edit and columns rowId, column, oldValue and newValue,
+        in the order the edits happened. Edits whose return was not acknowledged by a
+        rerun (e.g. lost while another return was sent) are sent again in the next one.
+        """
+        return pd.DataFrame(
+            self._response.get("edits") or [],
+            columns=["rowId", "column", "oldValue", "newValue"],
+        )
+
+    @property
+    def edits_batch_id(self):
+        """Identifies the batch of edits in this return. Reruns not triggered by the grid repeat the last batch id."""
+        token = self._response.get("editsToken")
+        if token is None:
+            return None
+        return f"{token}:{self._response.get('editsSeq')}"
+
+    def apply_edits(self, df):
+        """Returns a copy of ``df`` with the edited cells of this return applied.
+
+        Rows are matched by position when the grid generated its own row ids (no getRowId
+        on gridOptions). Otherwise they are matched on the field read by getRowId when it
+        is a plain ``params.data.<field>`` lookup and ``df`` has that column, or else on
+        ``df.index`` converted to string. Applying the same batch twice gives the same
+        result, so it's safe to call on every rerun.
+
+        ``data`` applies every edit made since the grid was mounted, not only this
+        return's batch.
+
+        Args:
+            df: DataFrame to patch, usually the one passed to AgGrid
+
+        Returns:
+            Patched DataFrame
+        """
+        return self._patch(df, self._response.get("edits"))
+
+    def _patch(self, df, records):
+        """Returns a copy of ``df`` with the edit ``records`` applied."""
+        edits = pd.DataFrame(
+            records or [], columns=["rowId", "column", "oldValue", "newValue"]
+        )
+        if edits.empty:
+            return df
+
+        # Only the last value of each cell matters
+        edits = edits.drop_duplicates(["rowId", "column"], keep="last")
+        edits = edits[edits["column"].isin(df.columns)]
+
+        if self._auto_row_ids:
+            # Auto row ids are the row positions (::auto_unique_id::)
+            positions = pd.to_numeric(edits["rowId"], errors="coerce")
+            positions = positions.where(positions < len(df)).fillna(-1).to_numpy(np.int64)
+        else:
+            if self._row_id_field in df.columns:
+                row_ids = pd.Index(df[self._row_id_field].astype(str))
+            else:
+                row_ids = df.index.astype(str)
+            positions = row_ids.get_indexer(edits["rowId"].astype(str))
+
+        found = positions >= 0
+        edits = edits[found]
+        positions = positions[found]
+
+        patched = df.copy()
+        new_values = edits["newValue"].to_numpy(dtype=object)
+        for column, rows in edits.groupby("column", sort=False).indices.items():
+            values = pd.Series(new_values[rows], dtype=object)
+            dtype = patched.dtypes[column]
+            if isinstance(dtype, pd.CategoricalDtype):
+                # Casting to the categorical dtype turns unknown values into NaN
+                unknown = [
+                    value
+                    for value in values.dropna().unique()
+                    if value not in dtype.categories
+                ]
+                if unknown:
+                    try:
+                        patched[column] = patched[column].cat.add_categories(unknown)
+                    except (TypeError, ValueError):
+                        patched[column] = patched[column].astype(object)
+                    dtype = patched.dtypes[column]
+            try:
+                values = values.astype(dtype)
+            except (TypeError, ValueError):
+                patched[column] = patched[column].astype(object)
+            patched.iloc[positions[rows], patched.columns.get_loc(column)] = values.to_numpy()
+
+        return patched
 
     def _get_data_groups(self, only_selected=False):
         """Get grouped data from the grid."""
         if not self._component_value_set:
             return [{(): pd.DataFrame()}]
 
-        nodes = self.grid_response.get("nodes", [])
+        nodes = self._nodes
+        node_mask = np.ones(len(nodes), dtype=bool)
 
         if only_selected:
-            # Default is True because AgGrid sets undefined for half-selected groups
-            nodes = [n for n in nodes if n.get("isSelected", True)]
-            if not nodes:
+            # Undefined counts as selected because AgGrid sets undefined for half-selected groups
+            node_mask = nodes.selected != NOT_SELECTED
+            if not node_mask.any():
                 fallback_data = self._get_data(only_selected)
                 return [{(): fallback_data}]
 
         # Check if response has groups
-        has_groups = any(n.get("group", False) for n in nodes)
+        has_groups = bool((nodes.is_group & node_mask).any())
 
         if has_groups:
-            # Additional safety check: ensure we have leaf nodes with parent paths
-            leaf_nodes = [n for n in nodes if not n.get("group", False)]
-            leaf_with_parent_path = [n for n in leaf_nodes if n.get("parentPath")]
+            # Additional safety check: ensure we have leaf nodes pointing to a parent group
+            leaf_mask = node_mask[nodes.leaf_positions]
+            leaf_with_parent = nodes.leaf_parents[leaf_mask].astype(bool)
 
-            if leaf_with_parent_path:
-                return self._process_grouped_response(nodes)
+            if leaf_with_parent.any():
+                return self._process_grouped_response(
+                    leaf_mask if only_selected else None
+                )
             else:
-                # Has groups but no proper parent paths - fall back to regular data
+                # Has groups but no parent references - fall back to regular data
                 print(
-                    "Warning: Grouped data detected but no parentPath found in leaf nodes. Falling back to regular data."
+                    "Warning: Grouped data detected but no parentId found in leaf nodes. Falling back to regular data."
                 )
 
         # No groups or invalid grouped data - return single group with all data
@@ -463,17 +734,15 @@ class AgGridReturn(Mapping):
         Returns selected rows as a DataFrame.
         If there are grouped rows, returns a dict of {key: pd.DataFrame}.
         """
-        nodes = self.grid_response.get("nodes", [])
-        selected_items = pd.DataFrame(
-            [n.get("data", None) for n in nodes if n.get("isSelected", None) is True]
-        )
+        nodes = self._nodes
+        selected_items = nodes.leaf_data[nodes.leaf_selected == SELECTED]
 
         if selected_items.empty:
             return None
 
         # Set pandas index if available and remove the internal column
         if "::auto_unique_id::" in selected_items.columns:
-            selected_items.set_index("::auto_unique_id::", inplace=True)
+            selected_items = selected_items.set_index("::auto_unique_id::")
             selected_items.index.name = "index"
 
         return selected_items
@@ -481,7 +750,16 @@ class AgGridReturn(Mapping):
     @property
     def event_data(self):
         """Returns information about the event that triggered AgGrid response."""
-        return self.grid_response.get("eventData", None)
+        return self._response.get("eventData", None)
+
+    @property
+    def batch(self):
+        """Grid events coalesced into this response, e.g. {"size": 5000, "events": {"cellValueChanged": 5000}}.
+
+        Events fired in the same frame or during a paste, fill or undo/redo operation are
+        sent as a single response, event_data holds the last one of them.
+        """
+        return self._response.get("batch", None)
 
     # ==========================================
     # Dictionary Interface for Backwards Compatibility
@@ -498,6 +776,8 @@ class AgGridReturn(Mapping):
         grid_response = self.__dict__.get("grid_response", {})
         if isinstance(grid_response, dict) and key in grid_response:
             return grid_response[key]
+        if key == "nodes" and self._component_value_set:
+            return self._nodes.to_nodes()
 
         # Fall back to __dict__ access
         return self.__dict__[key]
@@ -522,7 +802,7 @@ class AgGridReturn(Mapping):
         ]
 
         # Get grid_response keys for backward compatibility
-        grid_response = self.__dict__.get("grid_response", {})
+        grid_response = self.grid_response
         if isinstance(grid_response, dict):
             grid_keys = [k for k in grid_response.keys() if k not in attr_keys]
             return attr_keys + grid_keys
@@ -1,4 +1,5 @@
 from st_aggrid.AgGrid import AgGrid
+from st_aggrid.AgGridLayout import AgGridLayout
 from st_aggrid.grid_options_builder import GridOptionsBuilder
 from st_aggrid.shared import (
     GridUpdateMode,
@@ -14,6 +15,7 @@ from st_aggrid.AgGridReturn import AgGridReturn
 
 __all__ = [
     "AgGrid",
+    "AgGridLayout",
     "GridOptionsBuilder",
     "AgGridReturn",
     "GridUpdateMode",
@@ -1,5 +1,6 @@
 import os
 import json
+import hashlib
 import pandas as pd
 
 from typing import Any, Mapping, Tuple
@@ -102,6 +103,43 @@ def _parse_data_and_grid_options(
     
     return data, grid_options, column_types
 
+def _fingerprint(value):
+    return hashlib.blake2b(
+        json.dumps(value, sort_keys=True, default=str).encode("utf-8"), digest_size=8
+    ).hexdigest()
+
+
+def _frame_fingerprint(df, row_hashes):
+    """Hash of a DataFrame from its per row hashes (values and index), column names and dtypes."""
+    digest = hashlib.blake2b(digest_size=8)
+    digest.update(row_hashes.to_numpy().tobytes())
+    digest.update(
+        json.dumps(
+            [list(df.columns), [str(t) for t in df.dtypes], list(df.index.names)],
+            default=str,
+        ).encode("utf-8")
+    )
+    return digest.hexdigest()
+
+
+def _grid_options_fingerprint(grid_options):
+    """Hash of each gridOptions key and of each columnDef, the grid only applies the ones that changed."""
+    column_defs = grid_options.get("columnDefs")
+    column_hashes = (
+        [_fingerprint(c) for c in column_defs] if isinstance(column_defs, list) else []
+    )
+
+    options = {}
+    for key, value in grid_options.items():
+        if key == "rowData":
+            continue
+        if key == "columnDefs" and isinstance(value, list):
+            options[key] = _fingerprint(column_hashes)
+        else:
+            options[key] = _fingerprint(value)
+
+    return {"options": options, "columnDefs": column_hashes}
+
 def parse_update_mode(update_mode: GridUpdateMode, update_on=None):
     def add_unique_update_event(update_on, event):
         if event not in update_on:
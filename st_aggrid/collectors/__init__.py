@@ -2,7 +2,7 @@
 AgGrid Collectors - Response processing components
 
 This module provides different collector strategies for processing AgGrid responses:
-- LegacyCollector: Maintains backward compatibility with AgGridReturn (DataReturnMode: AS_INPUT, FILTERED, FILTERED_AND_SORTED)
+- LegacyCollector: Maintains backward compatibility with AgGridReturn (DataReturnMode: AS_INPUT, FILTERED, FILTERED_AND_SORTED, EDITS)
 - CustomCollector: Handles user-provided JsCode collectors (legacy compatibility)
 - MinimalCollector: Lightweight collector for minimal responses (DataReturnMode: MINIMAL)
 """
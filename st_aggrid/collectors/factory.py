@@ -61,7 +61,7 @@ def determine_collector(
         Currently passed to frontend but doesn't affect collector choice.
     data_return_mode : DataReturnMode
         Determines which collector to use:
-        - AS_INPUT, FILTERED, FILTERED_AND_SORTED: LegacyCollector
+        - AS_INPUT, FILTERED, FILTERED_AND_SORTED, EDITS: LegacyCollector
         - MINIMAL: MinimalCollector
     try_to_convert_back_to_original_types : bool
         Whether to attempt type conversion (for LegacyCollector)
@@ -86,13 +86,13 @@ def determine_collector(
         # For MINIMAL mode, use MinimalCollector
         return MinimalCollector()
     
-    # For the first 3 modes (AS_INPUT, FILTERED, FILTERED_AND_SORTED), use LegacyCollector
-    elif data_return_mode in (DataReturnMode.AS_INPUT, DataReturnMode.FILTERED, DataReturnMode.FILTERED_AND_SORTED):
+    # For AS_INPUT, FILTERED, FILTERED_AND_SORTED and EDITS, use LegacyCollector
+    elif data_return_mode in (DataReturnMode.AS_INPUT, DataReturnMode.FILTERED, DataReturnMode.FILTERED_AND_SORTED, DataReturnMode.EDITS):
         # Legacy support: if collect_grid_return is provided with legacy modes, use CustomCollector
         if collect_grid_return is not None:
             return CustomCollector(collect_grid_return.js_code)
         
-        # Otherwise use LegacyCollector for the first 3 modes
+        # Otherwise use LegacyCollector
         return LegacyCollector(
             data_return_mode=data_return_mode,
             try_to_convert_back_to_original_types=try_to_convert_back_to_original_types,
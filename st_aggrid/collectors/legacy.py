@@ -4,7 +4,7 @@ Legacy collector that maintains backward compatibility with AgGridReturn
 
 from typing import Any, Dict
 from .base import BaseCollector
-from ..AgGridReturn import AgGridReturn
+from ..AgGridReturn import AgGridReturn, _row_id_field
 from ..shared import DataReturnMode
 
 
@@ -47,7 +47,13 @@ class LegacyCollector(BaseCollector):
             originalData=original_data,
             data_return_mode=self.data_return_mode,
             frame_dtypes=self.frame_dtypes,
-            conversion_errors='coerce' if self.try_to_convert_back_to_original_types else 'raise'
+            conversion_errors='coerce' if self.try_to_convert_back_to_original_types else 'raise',
+            data_hash=kwargs.get("data_hash"),
+            view_cache=kwargs.get("view_cache"),
+            state_store=kwargs.get("state_store"),
+            auto_row_ids="getRowId" not in (grid_options or {}),
+            row_id_field=_row_id_field(grid_options),
+            edits_store=kwargs.get("edits_store"),
         )
         
         # Note: component value is not set yet - will be set by update_response
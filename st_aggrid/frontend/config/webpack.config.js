@@ -291,6 +291,23 @@ module.exports = function (webpackEnv) {
         // This is only used in production mode
         new CssMinimizerPlugin(),
       ],
+      splitChunks: {
+        cacheGroups: {
+          // Loaded by dynamic import when enable_enterprise_modules asks for them
+          agGridEnterprise: {
+            test: /[\\/]node_modules[\\/]ag-grid-enterprise[\\/]/,
+            name: 'ag-grid-enterprise',
+            chunks: 'async',
+            enforce: true,
+          },
+          agCharts: {
+            test: /[\\/]node_modules[\\/]ag-charts-[^\\/]+[\\/]/,
+            name: 'ag-charts-enterprise',
+            chunks: 'async',
+            enforce: true,
+          },
+        },
+      },
     },
     resolve: {
       // This allows you to set a fallback for where webpack should look for modules.
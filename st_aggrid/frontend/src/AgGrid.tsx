@@ -1,32 +1,29 @@
 import { AgGridReact } from "ag-grid-react"
 import React, { ReactNode } from "react"
 
-import {
-  ComponentProps,
-  Streamlit,
-  withStreamlitConnection,
-} from "streamlit-component-lib"
+import { ComponentProps, Streamlit } from "streamlit-component-lib"
 
 import {
-  AllCommunityModule,
   CellValueChangedEvent,
   DetailGridInfo,
   GetRowIdParams,
   GridApi,
   GridReadyEvent,
   GridSizeChangedEvent,
-  ModuleRegistry,
 } from "ag-grid-community"
 
-import { AgChartsEnterpriseModule } from "ag-charts-enterprise"
-import { AllEnterpriseModule, LicenseManager } from "ag-grid-enterprise"
-
 import debounce from 'lodash/debounce'
 import isEqual from 'lodash/isEqual'
+import isPlainObject from 'lodash/isPlainObject'
 import omit from 'lodash/omit'
 
 import { ThemeParser } from "./ThemeParser"
-import { CustomCollector, LegacyCollector } from "./collectors"
+import {
+  CustomCollector,
+  EditsCollector,
+  LegacyCollector,
+  MinimalCollector,
+} from "./collectors"
 import type { CollectorContext } from "./collectors"
 
 import "@fontsource/source-sans-pro"
@@ -40,10 +37,40 @@ import {
   parseJsCodeFromPython,
 } from "./utils/gridUtils"
 
-import { State } from "./types/AgGridTypes"
-import { parseGridOptions, parseData } from "./utils/parsers"
+import { AgGridProps, State } from "./types/AgGridTypes"
+import {
+  parseGridOptions,
+  parseGridOptionsUpdate,
+  parseData,
+  parseCompressedData,
+  selectDataTable,
+  tableToRowData,
+} from "./utils/parsers"
+import { getCachedTable, putCachedTable } from "./utils/dataCache"
+import { EditTracker } from "./utils/editTracker"
+import { GridStateSlicer } from "./utils/gridStateSlices"
+import { GroupPathCache } from "./utils/groupPaths"
+import { registerGridModules } from "./utils/gridModules"
+import { QuickSearchIndex } from "./utils/quickSearch"
+import { exportCsvInChunks } from "./utils/csvExport"
+import { changedOptionKeys, ColumnDefsCache } from "./utils/gridOptionsDiff"
+import {
+  PROGRESSIVE_MIN_ROWS,
+  ProgressiveLoader,
+} from "./utils/progressiveLoader"
+import { ReturnEncoder } from "./utils/returnEncoder"
+import {
+  BatchInfo,
+  BULK_OPERATIONS,
+  mergeBatches,
+  ReturnBatcher,
+} from "./utils/returnBatcher"
+import { ReturnFlowControl } from "./utils/returnFlowControl"
+
+// Pause in typing after which the toolbar search is applied
+const QUICK_SEARCH_DEBOUNCE_MS = 200
 
-class AgGrid extends React.Component<ComponentProps, State> {
+class AgGrid extends React.Component<AgGridProps, State> {
   public state: State
 
   private gridContainerRef: React.RefObject<HTMLDivElement>
@@ -52,8 +79,41 @@ class AgGrid extends React.Component<ComponentProps, State> {
   private themeParser: ThemeParser | undefined = undefined
   private shouldGridReturn: Function | undefined = undefined
   private collectGridReturn: Function | undefined = undefined
-
-  constructor(props: ComponentProps) {
+  private editTracker: EditTracker = new EditTracker()
+  private stateSlicer: GridStateSlicer = new GridStateSlicer()
+  private groupPaths: GroupPathCache = new GroupPathCache()
+  private returnEncoder: ReturnEncoder = new ReturnEncoder()
+  // Rows inflated or read from the browser cache asynchronously, set on grid ready
+  private pendingRowData: Promise<any[] | undefined> | undefined = undefined
+  private columnDefs: ColumnDefsCache = new ColumnDefsCache()
+  // Toolbar search applied as external filter, undefined when gridOptions define their own
+  private quickSearch: QuickSearchIndex | undefined = undefined
+  // Enterprise and charts chunks being loaded, the grid is rendered once they are registered
+  private modulesLoading: Promise<void> | undefined = undefined
+  // data_hash of the last dataset written to the browser cache
+  private cachedDataHash: string | undefined = undefined
+  // data_hash of the dataset the browser cache holds, reported to Python with each return
+  private storedDataHash: string | undefined = undefined
+  private flowControl: ReturnFlowControl = new ReturnFlowControl(
+    (eventData, eventName, batch, returnSeq) =>
+      this.sendGridValue(eventData, eventName, batch, returnSeq),
+    (eventData, eventName, batch) => {
+      // Edits of a lost return are kept, they are sent again
+      if (this.editTracker.hasPending) {
+        this.flowControl.submit(eventData, eventName, batch)
+      }
+    }
+  )
+  // Changes held back in manual update mode until the update button is clicked
+  private manualBatch: BatchInfo | undefined = undefined
+  // Adds the rows of large tables after the first block is rendered
+  private progressiveLoader: ProgressiveLoader | undefined = undefined
+  // Returns held back until all rows are loaded
+  private heldReturn:
+    | { eventData: any; eventName: string; batch: BatchInfo }
+    | undefined = undefined
+
+  constructor(props: AgGridProps) {
     super(props)
     this.gridContainerRef = React.createRef()
 
@@ -67,25 +127,7 @@ class AgGrid extends React.Component<ComponentProps, State> {
         injectProAssets(asset?.js, asset?.css)
       })
     }
-    const enableEnterpriseModules = props.args.enable_enterprise_modules
-    if (enableEnterpriseModules === "enterprise+AgCharts") {
-      ModuleRegistry.registerModules([
-        AllEnterpriseModule.with(AgChartsEnterpriseModule),
-      ])
-      if ("license_key" in props.args) {
-        LicenseManager.setLicenseKey(props.args["license_key"])
-      }
-    } else if (
-      enableEnterpriseModules === true ||
-      enableEnterpriseModules === "enterpriseOnly"
-    ) {
-      ModuleRegistry.registerModules([AllEnterpriseModule])
-      if ("license_key" in props.args) {
-        LicenseManager.setLicenseKey(props.args["license_key"])
-      }
-    } else {
-      ModuleRegistry.registerModules([AllCommunityModule])
-    }
+    this.modulesLoading = registerGridModules(props.args)
 
     const StreamlitAgGridPro = (window as any)?.StreamlitAgGridPro
     if (StreamlitAgGridPro) {
@@ -107,10 +149,52 @@ class AgGrid extends React.Component<ComponentProps, State> {
       this.props.args.gridOptions?.domLayout === "autoHeight"
 
     var go = parseGridOptions(props)
-    go.rowData = parseData(props)
+    const fingerprint = props.args.grid_options_fingerprint
+    if (fingerprint && Array.isArray(go.columnDefs)) {
+      // Seeds the cache, later updates only parse changed columnDefs
+      go.columnDefs = this.columnDefs.update(
+        go.columnDefs,
+        fingerprint.columnDefs,
+        (colDef: any) => colDef
+      )
+    }
+    if (props.args.compressed_row_data) {
+      // Inflated asynchronously, set on grid ready. The loading overlay shows meanwhile
+      this.pendingRowData = parseCompressedData(props)
+      go.rowData = undefined
+    } else if (props.args.data_cached) {
+      // Python skipped the data, the browser cache holds it
+      this.pendingRowData = this.loadCachedRowData()
+      go.rowData = undefined
+    } else if (this.shouldLoadProgressively(props)) {
+      this.progressiveLoader = new ProgressiveLoader(
+        selectDataTable(props),
+        (loaded, total) => this.onRowsLoaded(loaded, total)
+      )
+      go.rowData = this.progressiveLoader.firstBlock()
+    } else {
+      go.rowData = parseData(props)
+    }
+    this.cacheData()
+
+    // Toolbar search runs as an external filter, unless the grid defines its own
+    if (
+      this.isSearchShown(props) &&
+      !("isExternalFilterPresent" in go) &&
+      !("doesExternalFilterPass" in go)
+    ) {
+      const quickSearch = new QuickSearchIndex()
+      go.isExternalFilterPresent = () => quickSearch.active
+      go.doesExternalFilterPass = (node) => quickSearch.passes(node)
+      this.quickSearch = quickSearch
+    }
 
     if (!("getRowId" in go)) {
-      if (
+      if (props.args.compressed_row_data || props.args.data_cached) {
+        // Python adds the auto id column whenever getRowId is not set
+        go.getRowId = (params: GetRowIdParams) =>
+          params.data["::auto_unique_id::"] as string
+      } else if (
         Array.isArray(go.rowData) &&
         go.rowData.length > 0 &&
         go.rowData[0].hasOwnProperty("::auto_unique_id::")
@@ -135,6 +219,10 @@ class AgGrid extends React.Component<ComponentProps, State> {
       enterprise_features_enabled: props.args.enable_enterprise_modules,
       debug: props.args.debug || false,
       editedRows: new Set(),
+      pendingChanges: 0,
+      loadingProgress: undefined,
+      modulesReady: this.modulesLoading === undefined,
+      exportProgress: undefined,
     } as State
 
     if (this.state.debug) {
@@ -146,6 +234,15 @@ class AgGrid extends React.Component<ComponentProps, State> {
   private attachStreamlitRerunToEvents(api: GridApi) {
     const updateEvents = this.props.args.update_on
 
+    // Events fired in the same frame or bulk operation (paste, fill...) trigger a single return
+    const batcher = new ReturnBatcher((e, eventName, batch) =>
+      this.onGridChange(e, eventName, batch)
+    )
+    BULK_OPERATIONS.forEach(([startEvent, endEvent]) => {
+      api.addEventListener(startEvent as any, () => batcher.beginOperation())
+      api.addEventListener(endEvent as any, () => batcher.endOperation())
+    })
+
     updateEvents.forEach((element: any) => {
       if (Array.isArray(element)) {
         // If element is a tuple (eventName, timeout), apply debounce for the timeout duration
@@ -154,7 +251,7 @@ class AgGrid extends React.Component<ComponentProps, State> {
           eventName,
           debounce(
             (e: any) => {
-              this.returnGridValue(e, eventName)
+              this.onGridChange(e, eventName)
             },
             timeout,
             {
@@ -167,7 +264,7 @@ class AgGrid extends React.Component<ComponentProps, State> {
       } else {
         // Attach event listener for non-tuple events
         api.addEventListener(element, (e: any) => {
-          this.returnGridValue(e, element)
+          batcher.push(e, element)
         })
       }
       if (this.state.debug) {
@@ -177,6 +274,10 @@ class AgGrid extends React.Component<ComponentProps, State> {
   }
 
   private resizeGridContainer() {
+    // The layout sizes the frame to fit all its grids
+    if (this.props.gridKey !== undefined) {
+      return
+    }
     const renderedGridHeight = this.gridContainerRef.current?.clientHeight
     if (
       renderedGridHeight &&
@@ -188,10 +289,139 @@ class AgGrid extends React.Component<ComponentProps, State> {
     }
   }
 
-  private async returnGridValue(
+  private onGridChange(
     eventData: any,
-    streamlitRerunEventTriggerName: string
+    streamlitRerunEventTriggerName: string,
+    batch?: BatchInfo
   ) {
+    if (this.props.args.manual_update !== true) {
+      this.returnGridValue(eventData, streamlitRerunEventTriggerName, batch)
+      return
+    }
+
+    // Manual update mode: count the change, the grid state is collected on click
+    batch = batch || {
+      size: 1,
+      events: { [streamlitRerunEventTriggerName]: 1 },
+    }
+    this.manualBatch = this.manualBatch
+      ? mergeBatches(this.manualBatch, batch)
+      : batch
+    this.setState({ pendingChanges: this.manualBatch.size })
+  }
+
+  private onManualUpdateClick() {
+    if (this.state.debug) {
+      console.log("Manual update triggered")
+    }
+
+    const batch = this.manualBatch || { size: 0, events: {} }
+    this.manualBatch = undefined
+    this.setState({ pendingChanges: 0 })
+    this.returnGridValue({ type: "manualUpdate" }, "manualUpdate", batch)
+  }
+
+  private returnGridValue(
+    eventData: any,
+    streamlitRerunEventTriggerName: string,
+    batch?: BatchInfo
+  ) {
+    batch = batch || {
+      size: 1,
+      events: { [streamlitRerunEventTriggerName]: 1 },
+    }
+
+    // Python would only see part of the rows, the return is sent once loading completes
+    if (this.progressiveLoader?.loading) {
+      this.heldReturn = {
+        eventData: eventData,
+        eventName: streamlitRerunEventTriggerName,
+        batch: this.heldReturn
+          ? mergeBatches(this.heldReturn.batch, batch)
+          : batch,
+      }
+      return
+    }
+
+    // Returns submitted while a rerun is running are collapsed into one
+    this.flowControl.submit(eventData, streamlitRerunEventTriggerName, batch)
+  }
+
+  private shouldLoadProgressively(props: ComponentProps): boolean {
+    if (!props.args.data || props.args.columnar_row_store) {
+      return false
+    }
+    const table = selectDataTable(props)
+    return table !== undefined && table.numRows > PROGRESSIVE_MIN_ROWS
+  }
+
+  private onRowsLoaded(loaded: number, total: number) {
+    if (loaded < total) {
+      this.setState({ loadingProgress: loaded / total })
+      return
+    }
+
+    this.progressiveLoader = undefined
+    this.setState({ loadingProgress: undefined })
+    this.resizeGridContainer()
+
+    const held = this.heldReturn
+    this.heldReturn = undefined
+    if (held) {
+      this.returnGridValue(held.eventData, held.eventName, held.batch)
+    }
+  }
+
+  private isSearchShown(props: AgGridProps): boolean {
+    const toolbarShown =
+      (props.args.show_toolbar ?? true) ||
+      props.args.manual_update === true
+    return toolbarShown && (props.args.show_search ?? true)
+  }
+
+  // Typing in the toolbar search box only refilters once it pauses
+  private applyQuickSearch = debounce((value: string) => {
+    const api = this.state.api
+    if (!api) {
+      return
+    }
+    if (this.quickSearch) {
+      this.quickSearch.search(api, value)
+      api.onFilterChanged()
+    } else {
+      api.setGridOption("quickFilterText", value)
+    }
+    api.hideOverlay() // Hide any overlay if present
+  }, QUICK_SEARCH_DEBOUNCE_MS)
+
+  private onDownloadClick() {
+    const api = this.state.api
+    if (!api || this.state.exportProgress !== undefined) {
+      return
+    }
+
+    this.setState({ exportProgress: 0 })
+    exportCsvInChunks(api, (exported, total) =>
+      this.setState({ exportProgress: exported / total })
+    )
+      .catch((error) => console.error("CSV export failed:", error))
+      .finally(() => this.setState({ exportProgress: undefined }))
+  }
+
+  private setComponentValue(value: any, returnSeq?: number) {
+    if (this.props.sendValue) {
+      this.props.sendValue(value, returnSeq)
+    } else {
+      Streamlit.setComponentValue(value)
+    }
+  }
+
+  private async sendGridValue(
+    eventData: any,
+    streamlitRerunEventTriggerName: string,
+    batch: BatchInfo,
+    returnSeq: number
+  ): Promise<boolean> {
     if (this.state.debug) {
       console.log(`refreshing grid from ${streamlitRerunEventTriggerName}`)
       console.log("dataReturnMode is ", this.props.args.data_return_mode)
@@ -203,13 +433,15 @@ class AgGrid extends React.Component<ComponentProps, State> {
       props: this.props,
       eventData: eventData,
       streamlitRerunEventTriggerName: streamlitRerunEventTriggerName,
+      batch: batch,
     }
 
     const collectorFactory = {
-      AS_INPUT: new LegacyCollector(),
-      FILTERED: new LegacyCollector(),
-      FILTERED_AND_SORTED: new LegacyCollector(),
-      MINIMAL: new LegacyCollector(),
+      AS_INPUT: new LegacyCollector(this.stateSlicer, this.groupPaths),
+      FILTERED: new LegacyCollector(this.stateSlicer, this.groupPaths),
+      FILTERED_AND_SORTED: new LegacyCollector(this.stateSlicer, this.groupPaths),
+      MINIMAL: new MinimalCollector(),
+      EDITS: new EditsCollector(this.editTracker),
       CUSTOM: new CustomCollector(this.collectGridReturn || (() => {})),
     }
 
@@ -237,10 +469,29 @@ class AgGrid extends React.Component<ComponentProps, State> {
             if (this.state.debug) {
               console.log(`shouldGridReturn blocked return for event: ${streamlitRerunEventTriggerName}`);
             }
-            return; // Don't send value back
+            return false; // Don't send value back
           }
         }
-        Streamlit.setComponentValue(result.data)
+        // Echoed back by Python as ack_seq once the return reached it
+        const data = isPlainObject(result.data)
+          ? {
+              ...result.data,
+              returnSeq: returnSeq,
+              dataCacheHash: this.storedDataHash,
+            }
+          : result.data
+        const value = collector.encodesPayload()
+          ? await this.returnEncoder.encode(
+              data,
+              this.props.args.compression_threshold
+            )
+          : data
+        this.setComponentValue(
+          value,
+          isPlainObject(result.data) ? returnSeq : undefined
+        )
+        collector.onValueSent(data)
+        return true
       } else {
         console.error(`Collector processing failed: ${result.error}`)
         // Fallback to no return to avoid breaking the UI
@@ -249,6 +500,7 @@ class AgGrid extends React.Component<ComponentProps, State> {
       console.error("Error in returnGridValue collector processing:", error)
       // Fallback to no return to avoid breaking the UI
     }
+    return false
   }
 
   private defineContainerHeight() {
@@ -265,6 +517,19 @@ class AgGrid extends React.Component<ComponentProps, State> {
   }
 
   public componentDidUpdate(prevProps: any, prevState: State, snapshot?: any) {
+    // Python echoes the number of the last return it received. Grids without
+    // a key only get their value after sending args, new args acknowledge them
+    const ackSeq = this.props.args.ack_seq
+    if (ackSeq !== undefined && ackSeq !== null) {
+      if (ackSeq !== prevProps.args.ack_seq) {
+        this.flowControl.acknowledgeSeq(ackSeq)
+        this.editTracker.acknowledge(ackSeq)
+      }
+    } else if (prevProps.args !== this.props.args) {
+      this.flowControl.acknowledge()
+      this.editTracker.acknowledge()
+    }
+
     if (this.state.debug) {
       console.log("********** componentDidUpdate.prevProps")
       console.log(prevProps)
@@ -273,12 +538,24 @@ class AgGrid extends React.Component<ComponentProps, State> {
     }
 
     //Check update on grid options. TODO: exclude `initial` options
-    const prevGridOptions = omit(prevProps.args.gridOptions, "rowData")
-    const currGridOptions = omit(this.props.args.gridOptions, "rowData")
+    const prevFingerprint = prevProps.args.grid_options_fingerprint
+    const fingerprint = this.props.args.grid_options_fingerprint
+    if (prevFingerprint && fingerprint) {
+      // Python hashes each option and columnDef, only changed ones are parsed and applied
+      const changedKeys = changedOptionKeys(prevFingerprint, fingerprint)
+      if (changedKeys.length > 0) {
+        this.state.api?.updateGridOptions(
+          parseGridOptionsUpdate(this.props, changedKeys, this.columnDefs)
+        )
+      }
+    } else {
+      const prevGridOptions = omit(prevProps.args.gridOptions, "rowData")
+      const currGridOptions = omit(this.props.args.gridOptions, "rowData")
 
-    if (!isEqual(prevGridOptions, currGridOptions)) {
-      let go = parseGridOptions(this.props)
-      this.state.api?.updateGridOptions(go)
+      if (!isEqual(prevGridOptions, currGridOptions)) {
+        let go = parseGridOptions(this.props)
+        this.state.api?.updateGridOptions(go)
+      }
     }
 
     //Theme object Changes here
@@ -296,18 +573,23 @@ class AgGrid extends React.Component<ComponentProps, State> {
 
     //Check if data changed and updates
 
+    // Data sent after the browser cache missed it
+    const cacheMissAnswered =
+      prevProps.args.data_cached && !this.props.args.data_cached
+
     const serverSyncStragegy = this.props.args?.server_sync_strategy
     if (serverSyncStragegy === "client_wins") {
       if (!this.state.isRowDataEdited) {
-        if (this.props.args.data_hash !== prevProps.args.data_hash) {
-          const rowData = parseData(this.props) || []
-          this.state.api?.updateGridOptions({ rowData })
+        if (
+          this.props.args.data_hash !== prevProps.args.data_hash ||
+          cacheMissAnswered
+        ) {
+          this.updateRowData()
         }
       }
     } else if (serverSyncStragegy === "server_wins") {
-      const rowData = parseData(this.props) || []
       this.state.api?.stopEditing(true)
-      this.state.api?.updateGridOptions({ rowData })
+      this.updateRowData()
     }
 
     //check if columnStates changed
@@ -322,6 +604,84 @@ class AgGrid extends React.Component<ComponentProps, State> {
     }
   }
 
+  private updateRowData() {
+    // New data replaces the rows still being loaded
+    this.cancelProgressiveLoading()
+
+    if (this.props.args.compressed_row_data) {
+      parseCompressedData(this.props)
+        .then((rowData) =>
+          this.state.api?.updateGridOptions({ rowData: rowData || [] })
+        )
+        .catch((error) => console.error("Failed to inflate row data:", error))
+    } else if (this.props.args.data_cached) {
+      this.loadCachedRowData().then((rowData) => {
+        if (rowData) {
+          this.state.api?.updateGridOptions({ rowData })
+        }
+      })
+    } else {
+      const rowData = parseData(this.props) || []
+      this.state.api?.updateGridOptions({ rowData })
+      this.cacheData()
+    }
+  }
+
+  private async loadCachedRowData(): Promise<any[] | undefined> {
+    const hash = this.props.args.data_hash
+    const table = await getCachedTable(hash)
+    if (table === undefined) {
+      // Python sends the data on the rerun
+      this.storedDataHash = undefined
+      this.setComponentValue({ dataCacheMiss: hash })
+      return undefined
+    }
+    return tableToRowData(table, this.props)
+  }
+
+  private cacheData() {
+    const maxBytes = this.props.args.browser_cache_max_bytes
+    const hash = this.props.args.data_hash
+    if (!maxBytes || !this.props.args.data || hash === this.cachedDataHash) {
+      return
+    }
+    this.cachedDataHash = hash
+    const table = selectDataTable(this.props)
+    // Serialized after the grid is rendered. Python only skips sending the
+    // data once a return reported it stored
+    setTimeout(
+      () =>
+        putCachedTable(hash, table, maxBytes).then((stored) => {
+          if (stored) {
+            this.storedDataHash = hash
+          }
+        }),
+      0
+    )
+  }
+
+  private cancelProgressiveLoading() {
+    if (!this.progressiveLoader) {
+      return
+    }
+    this.progressiveLoader.cancel()
+    this.onRowsLoaded(1, 1)
+  }
+
+  public componentDidMount() {
+    this.modulesLoading
+      ?.then(() => this.setState({ modulesReady: true }))
+      .catch((error) =>
+        console.error("Failed to load AG Grid enterprise modules:", error)
+      )
+  }
+
+  public componentWillUnmount() {
+    this.applyQuickSearch.cancel()
+    this.progressiveLoader?.cancel()
+    this.returnEncoder.terminate()
+  }
+
   private onGridReady(event: GridReadyEvent) {
     this.setState({ api: event.api })
 
@@ -338,6 +698,19 @@ class AgGrid extends React.Component<ComponentProps, State> {
       this.resizeGridContainer()
     )
 
+    // Cached group paths are only valid until grouping or row data change
+    this.state.api?.addEventListener("rowGroupOpened", () =>
+      this.groupPaths.invalidate()
+    )
+    this.state.api?.addEventListener("columnRowGroupChanged", () =>
+      this.groupPaths.invalidate()
+    )
+    this.state.api?.addEventListener("modelUpdated", (e: any) => {
+      if (e.newData) {
+        this.groupPaths.invalidate()
+      }
+    })
+
     this.state.api?.addEventListener("firstDataRendered", (e: any) => {
       this.resizeGridContainer()
     })
@@ -360,6 +733,26 @@ class AgGrid extends React.Component<ComponentProps, State> {
       )
     }
 
+    this.quickSearch?.attach(event.api)
+
+    // Edits must be recorded before the rerun listeners collect them
+    if (this.props.args.data_return_mode === "EDITS") {
+      this.state.api.addEventListener(
+        "cellValueChanged",
+        (event: CellValueChangedEvent) => this.editTracker.record(event)
+      )
+    }
+
+    this.pendingRowData
+      ?.then((rowData) => {
+        if (rowData) {
+          event.api.setGridOption("rowData", rowData)
+        }
+      })
+      .catch((error) => console.error("Failed to load row data:", error))
+
+    this.progressiveLoader?.start(event.api)
+
     //Attach events
     this.attachStreamlitRerunToEvents(this.state.api)
 
@@ -401,38 +794,43 @@ class AgGrid extends React.Component<ComponentProps, State> {
 
   public render = (): ReactNode => {
     let manualUpdate = this.props.args.manual_update === true
+    let loadingProgress = this.state.loadingProgress
+    let progress = loadingProgress ?? this.state.exportProgress
 
     return (
       <div
         id="gridContainer"
+        className={loadingProgress !== undefined ? "rows-loading" : undefined}
         ref={this.gridContainerRef}
         style={this.defineContainerHeight()}
       >
+        {progress !== undefined && (
+          <div className="rows-loading-progress">
+            <div
+              className="rows-loading-progress-bar"
+              style={{ width: `${Math.round(progress * 100)}%` }}
+            />
+          </div>
+        )}
         <GridToolBar
           showManualUpdateButton={manualUpdate}
-          enabled={this.props.args.show_toolbar ?? true}
+          pendingChanges={this.state.pendingChanges}
+          enabled={(this.props.args.show_toolbar ?? true) || manualUpdate}
           showSearch={this.props.args.show_search ?? true}
           showDownloadButton={this.props.args.show_download_button ?? true}
-          onQuickSearchChange={(value) => {
-            this.state.api?.setGridOption("quickFilterText", value)
-            this.state.api?.hideOverlay() // Hide any overlay if present
-          }}
-          onDownloadClick={() => {
-            this.state.api?.exportDataAsCsv()
-          }}
-          onManualUpdateClick={() => {
-            if (this.state.debug) {
-              console.log("Manual update triggered")
-            }
-          }}
+          onQuickSearchChange={(value) => this.applyQuickSearch(value)}
+          onDownloadClick={() => this.onDownloadClick()}
+          onManualUpdateClick={() => this.onManualUpdateClick()}
         />
-        <AgGridReact
-          onGridReady={(e: GridReadyEvent<any, any>) => this.onGridReady(e)}
-          gridOptions={this.state.gridOptions}
-        ></AgGridReact>
+        {this.state.modulesReady && (
+          <AgGridReact
+            onGridReady={(e: GridReadyEvent<any, any>) => this.onGridReady(e)}
+            gridOptions={this.state.gridOptions}
+          ></AgGridReact>
+        )}
       </div>
     )
   }
 }
 
-export default withStreamlitConnection(AgGrid)
+export default AgGrid
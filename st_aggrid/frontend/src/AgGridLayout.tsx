@@ -0,0 +1,157 @@
+import React, { ReactNode } from "react"
+import { ComponentProps, Streamlit } from "streamlit-component-lib"
+
+import AgGrid from "./AgGrid"
+import { routeToGrid } from "./utils/payloadEncoding"
+
+// Space between grids, in pixels
+const LAYOUT_GAP = 16
+// A value not acknowledged after this long is considered lost
+const IN_FLIGHT_TIMEOUT_MS = 10000
+
+interface GridValue {
+  value: any
+  returnSeq: number | undefined
+}
+
+type SendValue = (value: any, returnSeq?: number) => void
+
+/**
+ * Renders the grids of a Python AgGridLayout in one iframe, sharing React,
+ * AG Grid modules, themes and fonts. Each grid routes its returns with its key.
+ *
+ * All grids share the layout's component value, so a value sent before
+ * Python read the previous one would overwrite it. Values are sent one at a
+ * time: the next one is sent once Python echoed the return number of the
+ * grid that sent the last one (its ack_seq). Meanwhile only the latest value
+ * of each grid is queued.
+ */
+class AgGridLayout extends React.Component<ComponentProps> {
+  private containerRef: React.RefObject<HTMLDivElement> = React.createRef()
+  private resizeObserver: ResizeObserver | undefined = undefined
+  // Grid args keep their identity while Streamlit args don't change
+  private gridArgs: { args: any; grids: any[] } | undefined = undefined
+  private senders: { [gridKey: string]: SendValue } = {}
+  // Values waiting to be sent, by grid key in the order they were queued
+  private queued: Map<string, GridValue> = new Map()
+  private inFlight: (GridValue & { gridKey: string }) | undefined = undefined
+  private inFlightTimer: ReturnType<typeof setTimeout> | undefined = undefined
+
+  public componentDidMount() {
+    const container = this.containerRef.current
+    if (container && typeof ResizeObserver !== "undefined") {
+      this.resizeObserver = new ResizeObserver(() =>
+        Streamlit.setFrameHeight(container.scrollHeight)
+      )
+      this.resizeObserver.observe(container)
+    }
+  }
+
+  public componentDidUpdate(prevProps: ComponentProps) {
+    const inFlight = this.inFlight
+    if (!inFlight || prevProps.args === this.props.args) {
+      return
+    }
+    // Values without a return number (data requests) are released by the rerun
+    const spec = this.props.args.layout_grids.filter(
+      (gridSpec: any) => gridSpec.grid_key === inFlight.gridKey
+    )[0]
+    if (
+      inFlight.returnSeq === undefined ||
+      spec?.ack_seq === inFlight.returnSeq
+    ) {
+      this.sendNext()
+    }
+  }
+
+  public componentWillUnmount() {
+    this.resizeObserver?.disconnect()
+    if (this.inFlightTimer !== undefined) {
+      clearTimeout(this.inFlightTimer)
+    }
+  }
+
+  private sender(gridKey: string): SendValue {
+    if (!this.senders[gridKey]) {
+      this.senders[gridKey] = (value, returnSeq) => {
+        // A newer value of the grid replaces the one still queued
+        this.queued.delete(gridKey)
+        this.queued.set(gridKey, { value, returnSeq })
+        if (!this.inFlight) {
+          this.sendNext()
+        }
+      }
+    }
+    return this.senders[gridKey]
+  }
+
+  private sendNext() {
+    if (this.inFlightTimer !== undefined) {
+      clearTimeout(this.inFlightTimer)
+      this.inFlightTimer = undefined
+    }
+    this.inFlight = undefined
+
+    const next = this.queued.keys().next()
+    if (next.done) {
+      return
+    }
+    const gridKey = next.value as string
+    const queued = this.queued.get(gridKey) as GridValue
+    this.queued.delete(gridKey)
+
+    this.inFlight = { ...queued, gridKey }
+    this.inFlightTimer = setTimeout(
+      () => this.sendNext(),
+      IN_FLIGHT_TIMEOUT_MS
+    )
+    Streamlit.setComponentValue(routeToGrid(gridKey, queued.value))
+  }
+
+  private grids(): any[] {
+    const args = this.props.args
+    if (this.gridArgs?.args !== args) {
+      // DataFrames and bytes are sent as top level args named <arg>::<grid key>
+      const grids = args.layout_grids.map((spec: any) => {
+        const gridArgs = { ...spec }
+        spec.hoisted_args.forEach((name: string) => {
+          gridArgs[name] = args[`${name}::${spec.grid_key}`]
+        })
+        return gridArgs
+      })
+      this.gridArgs = { args, grids }
+    }
+    return this.gridArgs.grids
+  }
+
+  public render = (): ReactNode => {
+    const columns = this.props.args.layout_columns || 1
+    const width = (this.props.width - LAYOUT_GAP * (columns - 1)) / columns
+
+    return (
+      <div
+        className="grid-layout"
+        ref={this.containerRef}
+        style={{
+          gridTemplateColumns: `repeat(${columns}, minmax(0, 1fr))`,
+          gap: LAYOUT_GAP,
+        }}
+      >
+        {this.grids().map((gridArgs: any) => (
+          <div className="grid-layout-cell" key={gridArgs.grid_key}>
+            <AgGrid
+              args={gridArgs}
+              width={width}
+              disabled={this.props.disabled}
+              theme={this.props.theme}
+              gridKey={gridArgs.grid_key}
+              sendValue={this.sender(gridArgs.grid_key)}
+            />
+          </div>
+        ))}
+      </div>
+    )
+  }
+}
+
+export default AgGridLayout
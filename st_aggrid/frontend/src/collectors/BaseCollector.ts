@@ -15,6 +15,18 @@ export abstract class BaseCollector {
    */
   abstract getCollectorType(): string
 
+  /**
+   * Whether the collected data is sent as a binary payload encoded off the main thread - override if needed
+   */
+  encodesPayload(): boolean {
+    return false
+  }
+
+  /**
+   * Called after the collected data was sent to Streamlit - override if needed
+   */
+  onValueSent(data: any): void {}
+
   /**
    * Validate the collector context - override if needed
    */
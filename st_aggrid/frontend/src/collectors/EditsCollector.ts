@@ -0,0 +1,67 @@
+/**
+ * Edits collector, returns only the cells changed since the last acknowledged return
+ */
+
+import { BaseCollector } from "./BaseCollector"
+import { CollectorContext, CollectorResult } from "./types"
+import { EditTracker } from "../utils/editTracker"
+
+export class EditsCollector extends BaseCollector {
+  private editTracker: EditTracker
+
+  constructor(editTracker: EditTracker) {
+    super()
+    this.editTracker = editTracker
+  }
+
+  /**
+   * Process response sending the edits not acknowledged yet as (rowId, column, oldValue, newValue) records
+   */
+  async processResponse(context: CollectorContext): Promise<CollectorResult> {
+    if (!this.validateContext(context)) {
+      return this.createErrorResult("Invalid collector context for EditsCollector")
+    }
+
+    const { token, seq, start, edits } = this.editTracker.snapshot()
+
+    return this.createSuccessResult({
+      edits: edits,
+      editsToken: token,
+      editsSeq: seq,
+      editsStart: start,
+      eventData: {
+        streamlitRerunEventTriggerName: context.streamlitRerunEventTriggerName,
+      },
+      batch: context.batch,
+    })
+  }
+
+  /**
+   * Large pastes produce large returns, sent as a (compressed) binary payload
+   */
+  encodesPayload(): boolean {
+    return true
+  }
+
+  /**
+   * Edits are kept until Python acknowledges the return carrying them (ack_seq)
+   */
+  onValueSent(data: any): void {
+    this.editTracker.sent(
+      {
+        token: data.editsToken,
+        seq: data.editsSeq,
+        start: data.editsStart,
+        edits: data.edits,
+      },
+      data.returnSeq
+    )
+  }
+
+  /**
+   * Get collector type
+   */
+  getCollectorType(): string {
+    return "EditsCollector"
+  }
+}
@@ -6,146 +6,43 @@
 import { BaseCollector } from "./BaseCollector"
 import { CollectorContext, CollectorResult } from "./types"
 import { IRowNode } from "ag-grid-community"
+import { RangeEncoder } from "../utils/ranges"
+import { GridStateSlicer } from "../utils/gridStateSlices"
+import { GroupPathCache } from "../utils/groupPaths"
+import { extractEventData } from "../utils/eventExtractors"
+import { ColumnarRowWriter, columnPlanFromSchema } from "../utils/columnarRows"
 
 export class LegacyCollector extends BaseCollector {
-  
+  private stateSlicer: GridStateSlicer | undefined
+  private groupPaths: GroupPathCache
 
+  constructor(stateSlicer?: GridStateSlicer, groupPaths?: GroupPathCache) {
+    super()
+    this.stateSlicer = stateSlicer
+    this.groupPaths = groupPaths || new GroupPathCache()
+  }
 
   private fetch_node_props(n: IRowNode | null): any {
     if (n == null) {
       return null
     }
 
-    // Only calculate parentPath for non-group nodes (leaf nodes) to improve performance
-    const parentPath = n.group ? "" : this.get_parent_path(n)
-
-    const sanitizeData = (obj: any): any => {
-      if (obj === null || obj === undefined) return obj
-      
-      const type = typeof obj
-      if (type === 'bigint') return Number(obj)
-      if (type === 'function' || type === 'symbol') return undefined
-      if (type !== 'object') return obj
-      
-      if (Array.isArray(obj)) return obj.map(sanitizeData)
-      
-      const result: any = {}
-      for (const key in obj) {
-        if (obj.hasOwnProperty(key)) {
-          result[key] = sanitizeData(obj[key])
-        }
-      }
-      return result
-    }
-
-    return {
+    // Leaf data is sent separately, one array per column
+    const props: any = {
       id: n.id,
       rowIndex: n.rowIndex,
-      data: sanitizeData({...n.data}),
       group: n.group,
-      isSelected: n.isSelected(),
-      parentPath: parentPath,
-    }
-  }
-
-  private get_parent_path(node: IRowNode | null): string {
-    if (!node || !node.parent) {
-      return ""
-    }
-    
-    // Build path iteratively using row IDs instead of display values
-    const pathParts: string[] = []
-    let current: IRowNode | null = node.parent
-    const visited = new Set<string>() // Use string IDs instead of object references
-    let depth = 0
-    const MAX_DEPTH = 10 // Safety limit to prevent infinite loops
-    
-    // Traverse up the parent chain, collecting row IDs
-    while (current && depth < MAX_DEPTH) {
-      const nodeId = current.id
-      
-      // Check for circular references using ID
-      if (nodeId && visited.has(nodeId)) {
-        console.warn(`Circular reference detected in group hierarchy at node: ${nodeId}`)
-        break
-      }
-      
-      if (nodeId) {
-        visited.add(nodeId)
-        pathParts.unshift(nodeId) // Add to beginning to maintain order
-      }
-      
-      current = current.parent
-      depth++
-    }
-    
-    if (depth >= MAX_DEPTH) {
-      console.warn(`Maximum group hierarchy depth (${MAX_DEPTH}) exceeded`)
-    }
-    
-    return pathParts.join(".")
-  }
-
-  private filterSerializableEventData = (
-    obj: any,
-    maxDepth = 2,
-    depth = 0
-  ): any => {
-    if (depth > maxDepth || obj === null || obj === undefined) {
-      return undefined
-    }
-
-    // Return primitive types as-is (only these should be included)
-    if (
-      typeof obj === "string" ||
-      typeof obj === "number" ||
-      typeof obj === "boolean"
-    ) {
-      return obj
-    }
-
-    // Filter out functions, symbols, and other non-serializable types
-    if (
-      typeof obj === "function" ||
-      typeof obj === "symbol" ||
-      typeof obj === "bigint"
-    ) {
-      return undefined
-    }
-
-    // Handle arrays - filter out empty arrays
-    if (Array.isArray(obj)) {
-      const filteredArray = obj
-        .map((item) =>
-          this.filterSerializableEventData(item, maxDepth, depth + 1)
-        )
-        .filter((item) => item !== undefined && item !== null && item !== "")
-
-      // Return undefined if array is empty after filtering
-      return filteredArray.length > 0 ? filteredArray : undefined
     }
 
-    // Handle objects - filter out empty objects
-    if (typeof obj === "object") {
-      const filtered: any = {}
-      for (const key in obj) {
-        if (obj.hasOwnProperty(key)) {
-          const value = this.filterSerializableEventData(
-            obj[key],
-            maxDepth,
-            depth + 1
-          )
-          if (value !== undefined && value !== null && value !== "") {
-            filtered[key] = value
-          }
-        }
-      }
-
-      // Return undefined if object is empty after filtering
-      return Object.keys(filtered).length > 0 ? filtered : undefined
+    // Group nodes carry their key tuple once; leaves only reference their parent group
+    if (n.group) {
+      props.groupKeys = this.groupPaths.groupKeys(n)
+      props.groupRef = this.groupPaths.groupRef(n)
+    } else if (n.parent && n.parent.level >= 0) {
+      props.parentRef = this.groupPaths.groupRef(n.parent)
     }
 
-    return undefined
+    return props
   }
 
   /**
@@ -156,14 +53,34 @@ export class LegacyCollector extends BaseCollector {
     let api = state.api
 
     // Create functions for all data collection operations
-    const collectNodes = (): any[] => {
-      if (!api) return []
-
+    // Selection is sent as ranges of node positions instead of a flag on every node
+    const collectNodes = () => {
       const nodes: any[] = []
-      api.forEachNode((n: any) => {
+      const selected = new RangeEncoder()
+      const indeterminate = new RangeEncoder()
+      const arrowTable = props.args.data?.dataTable || props.args.data?.table
+      const leafData = new ColumnarRowWriter(
+        columnPlanFromSchema(arrowTable?.schema)
+      )
+
+      api?.forEachNode((n: IRowNode) => {
+        const isSelected = n.isSelected()
+        if (isSelected === true) {
+          selected.add(nodes.length)
+        } else if (isSelected === undefined) {
+          indeterminate.add(nodes.length)
+        }
         nodes.push(this.fetch_node_props(n))
+        if (!n.group) {
+          leafData.add(n.data)
+        }
       })
-      return nodes
+      return {
+        nodes: nodes,
+        leafColumns: leafData.toObject(),
+        selectedRanges: selected.toArray(),
+        indeterminateRanges: indeterminate.toArray(),
+      }
     }
 
     const collectRowsAfterFilter = (): any[] => {
@@ -187,27 +104,42 @@ export class LegacyCollector extends BaseCollector {
     }
 
     const collectGridState = () => {
-      return api?.getState()
+      const gridState: any = api?.getState()
+
+      // Client side row selection repeats every selected id, Python rebuilds it from the ranges
+      if (gridState && Array.isArray(gridState.rowSelection)) {
+        const compactState = { ...gridState }
+        delete compactState.rowSelection
+        return compactState
+      }
+      return gridState
     }
 
     const collectColumnsState = () => {
       return api?.getColumnState()
     }
 
-    const processEventData = () => {
-      const rawEventData = {
-        ...eventData,
-        streamlitRerunEventTriggerName: streamlitRerunEventTriggerName,
+    // Only the state slices changed by the batched events, Python merges them
+    const collectStateSlices = () => {
+      if (!this.stateSlicer) {
+        return { gridState: collectGridState(), columnsState: collectColumnsState() }
       }
-      return this.filterSerializableEventData(rawEventData)
+      const eventNames = context.batch && Object.keys(context.batch.events).length > 0
+        ? Object.keys(context.batch.events)
+        : [streamlitRerunEventTriggerName]
+      return this.stateSlicer.collect(api, eventNames, props.args.state_tokens)
+    }
+
+    const processEventData = () => {
+      return extractEventData(eventData, streamlitRerunEventTriggerName)
     }
 
     // Execute all collection operations synchronously
-    const nodes = collectNodes()
+    const { nodes, leafColumns, selectedRanges, indeterminateRanges } =
+      collectNodes()
     const rowsAfterFilter = collectRowsAfterFilter()
     const rowsAfterSortAndFilter = collectRowsAfterSortAndFilter()
-    const gridState = collectGridState()
-    const columnsState = collectColumnsState()
+    const stateSlices = collectStateSlices()
     const eventDataProcessed = processEventData()
 
     // Debug output removed - use browser dev tools if needed to inspect getRowId
@@ -216,17 +148,36 @@ export class LegacyCollector extends BaseCollector {
     const returnValue = {
       originalDtypes: props.args.frame_dtypes,
       nodes: nodes,
-      gridState: gridState,
-      columnsState: columnsState,
+      leafColumns: leafColumns,
+      selectedRanges: selectedRanges,
+      indeterminateRanges: indeterminateRanges,
+      ...stateSlices,
       rowIdsAfterFilter: rowsAfterFilter,
       rowIdsAfterSortAndFilter: rowsAfterSortAndFilter,
       eventData: eventDataProcessed,
+      batch: context.batch,
     }
 
     const result = returnValue // this.serializeForPostMessage(returnValue)
     return this.createSuccessResult(result)
   }
 
+  /**
+   * Leaf data holds typed arrays, encoded in a worker before being sent
+   */
+  encodesPayload(): boolean {
+    return true
+  }
+
+  /**
+   * Sent state slices are merged by Python, the next return only needs new changes
+   */
+  onValueSent(data: any): void {
+    if (this.stateSlicer && data.stateSeq !== undefined) {
+      this.stateSlicer.acknowledge(data.stateSeq)
+    }
+  }
+
   /**
    * Get collector type
    */
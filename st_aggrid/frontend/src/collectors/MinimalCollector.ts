@@ -0,0 +1,121 @@
+/**
+ * Minimal collector, returns every node with its data as plain objects
+ *
+ * This is the payload LegacyCollector sent before leaf data was sent as
+ * columns and selection as ranges. DataReturnMode.MINIMAL hands it to Python
+ * code unprocessed (MinimalResponse.raw_data), so its shape is kept as is.
+ */
+
+import { BaseCollector } from "./BaseCollector"
+import { CollectorContext, CollectorResult } from "./types"
+import { IRowNode } from "ag-grid-community"
+import { extractEventData } from "../utils/eventExtractors"
+
+// Safety limit on the depth of the group hierarchy
+const MAX_GROUP_DEPTH = 10
+
+const sanitizeData = (obj: any): any => {
+  if (obj === null || obj === undefined) return obj
+
+  const type = typeof obj
+  if (type === "bigint") return Number(obj)
+  if (type === "function" || type === "symbol") return undefined
+  if (type !== "object") return obj
+
+  if (Array.isArray(obj)) return obj.map(sanitizeData)
+
+  const result: any = {}
+  for (const key in obj) {
+    if (obj.hasOwnProperty(key)) {
+      result[key] = sanitizeData(obj[key])
+    }
+  }
+  return result
+}
+
+/**
+ * Ids of the groups above a node, from the top level group down, joined with "."
+ */
+function parentPath(node: IRowNode): string {
+  const pathParts: string[] = []
+  const visited = new Set<string>()
+  let current: IRowNode | null = node.parent
+  let depth = 0
+
+  while (current && depth < MAX_GROUP_DEPTH) {
+    const nodeId = current.id
+    if (nodeId && visited.has(nodeId)) {
+      console.warn(`Circular reference detected in group hierarchy at node: ${nodeId}`)
+      break
+    }
+    if (nodeId) {
+      visited.add(nodeId)
+      pathParts.unshift(nodeId)
+    }
+    current = current.parent
+    depth++
+  }
+
+  if (depth >= MAX_GROUP_DEPTH) {
+    console.warn(`Maximum group hierarchy depth (${MAX_GROUP_DEPTH}) exceeded`)
+  }
+  return pathParts.join(".")
+}
+
+export class MinimalCollector extends BaseCollector {
+  private fetch_node_props(n: IRowNode): any {
+    return {
+      id: n.id,
+      rowIndex: n.rowIndex,
+      data: sanitizeData({ ...n.data }),
+      group: n.group,
+      isSelected: n.isSelected(),
+      parentPath: n.group ? "" : parentPath(n),
+    }
+  }
+
+  /**
+   * Process response sending nodes, full grid and column state and row ids
+   */
+  async processResponse(context: CollectorContext): Promise<CollectorResult> {
+    const { state, props, eventData, streamlitRerunEventTriggerName } = context
+    const api = state.api
+
+    const nodes: any[] = []
+    api?.forEachNode((n: IRowNode) => {
+      nodes.push(this.fetch_node_props(n))
+    })
+
+    const rowsAfterFilter: any[] = []
+    api?.forEachNodeAfterFilter((row: IRowNode) => {
+      if (!row.group) {
+        rowsAfterFilter.push(row.id)
+      }
+    })
+
+    const rowsAfterSortAndFilter: any[] = []
+    api?.forEachNodeAfterFilterAndSort((row: IRowNode) => {
+      if (!row.group) {
+        rowsAfterSortAndFilter.push(row.id)
+      }
+    })
+
+    return this.createSuccessResult({
+      originalDtypes: props.args.frame_dtypes,
+      nodes: nodes,
+      gridState: api?.getState(),
+      columnsState: api?.getColumnState(),
+      rowIdsAfterFilter: rowsAfterFilter,
+      rowIdsAfterSortAndFilter: rowsAfterSortAndFilter,
+      eventData: extractEventData(eventData, streamlitRerunEventTriggerName),
+      batch: context.batch,
+    })
+  }
+
+  /**
+   * Get collector type
+   */
+  getCollectorType(): string {
+    return "MinimalCollector"
+  }
+}
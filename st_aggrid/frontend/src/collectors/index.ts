@@ -4,11 +4,15 @@
  * This module provides different collector strategies for processing AgGrid responses:
  * - LegacyCollector: Maintains backward compatibility with existing getGridReturnValue
  * - CustomCollector: Handles user-provided JavaScript functions
+ * - EditsCollector: Returns only the cells edited since the last return
+ * - MinimalCollector: Returns nodes with their data as plain objects (DataReturnMode.MINIMAL)
  * - Future collectors can be added for specific use cases
  */
 
 export { BaseCollector } from './BaseCollector'
 export { LegacyCollector } from './LegacyCollector'
 export { CustomCollector } from './CustomCollector'
+export { EditsCollector } from './EditsCollector'
+export { MinimalCollector } from './MinimalCollector'
 export { determineCollector, validateCollectorConfig, CollectorType } from './CollectorFactory'
 export type { CollectorContext, CollectorResult } from './types'
\ No newline at end of file
@@ -3,12 +3,14 @@
  */
 
 import { State } from "../types/AgGridTypes"
+import { BatchInfo } from "../utils/returnBatcher"
 
 export interface CollectorContext {
   state: State
   props: any
   eventData: any
   streamlitRerunEventTriggerName: string
+  batch?: BatchInfo
 }
 
 export interface CollectorResult {
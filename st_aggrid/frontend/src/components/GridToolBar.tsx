@@ -10,6 +10,7 @@ interface GridToolBarProps {
   showDownloadButton?: boolean;
   showSearch?: boolean;
   showManualUpdateButton?: boolean; // New prop to enable/disable manual update button
+  pendingChanges?: number; // Changes waiting for a manual update, shown as a badge
 }
 
 const GridToolBar: React.FC<GridToolBarProps> = ({
@@ -21,6 +22,7 @@ const GridToolBar: React.FC<GridToolBarProps> = ({
   showDownloadButton = true,
   showSearch = true,
   showManualUpdateButton = false,
+  pendingChanges = 0,
 }) => {
   const [searchValue, setSearchValue] = useState("");
   const [position, setPosition] = useState({ x: 10, y: 10 });
@@ -40,7 +42,9 @@ const GridToolBar: React.FC<GridToolBarProps> = ({
 
   return (
     <div
-      className={`grid-toolbar ${collapsed ? "collapsed" : ""}`}
+      className={`grid-toolbar ${collapsed ? "collapsed" : ""} ${
+        pendingChanges > 0 ? "has-pending" : ""
+      }`}
       style={{ top: position.y, right: collapsed ? 0 : position.x, left: "auto" }}
     >
       {/* Collapse/Expand Button */}
@@ -117,7 +121,11 @@ const GridToolBar: React.FC<GridToolBarProps> = ({
         <button
           className="toolbar-button update-button"
           onClick={onManualUpdateClick}
-          title="Manual Update"
+          title={
+            pendingChanges > 0
+              ? `Manual Update (${pendingChanges} pending)`
+              : "Manual Update"
+          }
         >
           <svg
             viewBox="0 0 48 48"
@@ -139,6 +147,11 @@ const GridToolBar: React.FC<GridToolBarProps> = ({
               stroke-linejoin="round"
             ></path>
           </svg>
+          {pendingChanges > 0 && (
+            <span className="pending-badge">
+              {pendingChanges > 99 ? "99+" : pendingChanges}
+            </span>
+          )}
         </button>
       )}
 
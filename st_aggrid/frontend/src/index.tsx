@@ -1,9 +1,16 @@
 import React from "react"
 import { createRoot } from 'react-dom/client';
+import { ComponentProps, withStreamlitConnection } from "streamlit-component-lib"
 import AgGrid from "./AgGrid"
+import AgGridLayout from "./AgGridLayout"
+
+// One component renders either a single grid or the grids of an AgGridLayout
+const StreamlitAgGrid = withStreamlitConnection((props: ComponentProps) =>
+  props.args.layout_grids ? <AgGridLayout {...props} /> : <AgGrid {...props} />
+)
 
 const domNode = document.getElementById("root")
 if (domNode) {
    const root = createRoot(domNode)
-   root.render(<AgGrid />)
+   root.render(<StreamlitAgGrid />)
   }
@@ -1,4 +1,12 @@
 import { GridApi, GridOptions } from "ag-grid-community"
+import { ComponentProps } from "streamlit-component-lib"
+
+export interface AgGridProps extends ComponentProps {
+  // Key of the grid inside an AgGridLayout, its returns are routed by it
+  gridKey?: string
+  // Sends the component values of a grid inside an AgGridLayout, which queues them
+  sendValue?: (value: any, returnSeq?: number) => void
+}
 
 export interface State {
   gridHeight: number
@@ -8,4 +16,11 @@ export interface State {
   enterprise_features_enabled: boolean
   debug: boolean
   editedRows: Set<any>;
+  pendingChanges: number
+  // Fraction of the rows loaded while a large table is added progressively
+  loadingProgress?: number
+  // Whether the AG Grid modules are registered, enterprise modules load asynchronously
+  modulesReady: boolean
+  // Fraction of the rows written while a CSV export runs
+  exportProgress?: number
 }
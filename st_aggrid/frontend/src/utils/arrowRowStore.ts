@@ -0,0 +1,74 @@
+import { arrowValueKind } from "./arrowTypes"
+
+// Row position in the Arrow table, a symbol so it never shows up as a column
+export const ROW_INDEX = Symbol("rowIndex")
+
+// Values of a column as JSON would give them (dates as ISO strings, structs as objects...)
+export const toPlainValues = (vector: any): any[] =>
+  JSON.parse(
+    JSON.stringify(Array.from(vector), (key, value) =>
+      typeof value === "bigint" ? Number(value) : value
+    )
+  )
+
+/**
+ * Builds rowData as thin row handles reading straight from the Arrow columns.
+ *
+ * Each row only holds its index in the table. Columns are accessors defined
+ * once on a shared prototype, so `data.col`, field based columnDefs,
+ * valueGetters and getRowId work unchanged while numbers stay in typed arrays
+ * and strings in the (dictionary encoded) Arrow vectors. Columns of other
+ * types (dates, lists, structs) are converted to plain values once.
+ *
+ * Assigning a column (e.g. a cell edit) stores the value on the row itself.
+ * Columns are inherited properties: spreading a row or JSON.stringify only
+ * see edited values, read columns by name instead.
+ */
+export function createArrowRowStore(table: any): any[] {
+  const proto: any = {}
+
+  table.schema.fields.forEach((field: any) => {
+    const name = field.name
+    const kind = arrowValueKind(field.type)
+    const vector = table.getChild(name)
+
+    let get: (this: any) => any
+    if (kind === "number" || kind === "primitive") {
+      get = function () {
+        return vector.get(this[ROW_INDEX])
+      }
+    } else if (kind === "bigint") {
+      get = function () {
+        const value = vector.get(this[ROW_INDEX])
+        return value === null || value === undefined ? value : Number(value)
+      }
+    } else {
+      const values = toPlainValues(vector)
+      get = function () {
+        return values[this[ROW_INDEX]]
+      }
+    }
+
+    Object.defineProperty(proto, name, {
+      enumerable: true,
+      configurable: true,
+      get: get,
+      set(value: any) {
+        Object.defineProperty(this, name, {
+          value: value,
+          writable: true,
+          enumerable: true,
+          configurable: true,
+        })
+      },
+    })
+  })
+
+  const rows = new Array(table.numRows)
+  for (let i = 0; i < rows.length; i++) {
+    const row = Object.create(proto)
+    row[ROW_INDEX] = i
+    rows[i] = row
+  }
+  return rows
+}
@@ -0,0 +1,36 @@
+// Arrow type ids, see apache-arrow's Type enum
+const ARROW_DICTIONARY = -1
+const ARROW_INT = 2
+const ARROW_FLOAT = 3
+const ARROW_UTF8 = 5
+const ARROW_BOOL = 6
+const ARROW_LARGE_UTF8 = 20
+
+// JS values read from an Arrow vector of a given type
+//  - number: int (up to 32 bits) and float
+//  - bigint: 64 bits integers
+//  - primitive: strings, booleans
+//  - other: dates, lists, structs... that need converting to plain values
+// Dictionary encoded vectors read as the values of their dictionary
+export type ArrowValueKind = "number" | "bigint" | "primitive" | "other"
+
+export function arrowValueKind(type: any): ArrowValueKind {
+  switch (type?.typeId) {
+    case ARROW_INT:
+      return type.bitWidth === 64 ? "bigint" : "number"
+    case ARROW_FLOAT:
+      return "number"
+    case ARROW_UTF8:
+    case ARROW_LARGE_UTF8:
+    case ARROW_BOOL:
+      return "primitive"
+    case ARROW_DICTIONARY:
+      return arrowValueKind(type.dictionary)
+    default:
+      return "other"
+  }
+}
+
+export function isArrowDictionary(type: any): boolean {
+  return type?.typeId === ARROW_DICTIONARY
+}
@@ -0,0 +1,156 @@
+import { arrowValueKind } from "./arrowTypes"
+
+// How values of a column are made safe to send with postMessage
+//  - number: numbers, written to a Float64Array (null is NaN)
+//  - bigint: 64 bits integers, converted to Number and written like numbers
+//  - direct: read as is (strings, booleans)
+//  - deep: anything else, nested values are sanitized recursively
+export type ColumnKind = "number" | "bigint" | "direct" | "deep"
+
+const INITIAL_CAPACITY = 1024
+
+/**
+ * Decides the sanitization of each column from the Arrow schema of the data sent by Python.
+ * Columns missing from the schema (e.g. added by valueSetters) are sanitized deeply.
+ */
+export function columnPlanFromSchema(schema: any): Map<string, ColumnKind> {
+  const plan = new Map<string, ColumnKind>()
+  schema?.fields?.forEach((field: any) => {
+    const kind = arrowValueKind(field.type)
+    plan.set(
+      field.name,
+      kind === "primitive" ? "direct" : kind === "other" ? "deep" : kind
+    )
+  })
+  return plan
+}
+
+function sanitizeDeep(obj: any): any {
+  if (obj === null || obj === undefined) return obj
+
+  const type = typeof obj
+  if (type === "bigint") return Number(obj)
+  if (type === "function" || type === "symbol") return undefined
+  if (type !== "object") return obj
+
+  if (Array.isArray(obj)) return obj.map(sanitizeDeep)
+
+  const result: any = {}
+  for (const key in obj) {
+    if (Object.prototype.hasOwnProperty.call(obj, key)) {
+      result[key] = sanitizeDeep(obj[key])
+    }
+  }
+  return result
+}
+
+interface Column {
+  name: string
+  kind: ColumnKind
+  values: any[]
+  // Numeric columns are kept in a typed array, transferable to the encoding worker
+  numbers: Float64Array | null
+}
+
+/**
+ * Writes row data objects into one array per column, without copying rows.
+ * Columns are added as they are found in the rows. Numeric columns holding
+ * a non numeric value (e.g. text typed in the cell) fall back to a plain array.
+ */
+export class ColumnarRowWriter {
+  private plan: Map<string, ColumnKind>
+  private columns: Column[] = []
+  private columnNames: Set<string> = new Set()
+  private rowCount: number = 0
+
+  constructor(plan: Map<string, ColumnKind>) {
+    this.plan = plan
+  }
+
+  get length(): number {
+    return this.rowCount
+  }
+
+  add(data: any): void {
+    if (data !== null && data !== undefined) {
+      // Inherited keys are included, rows of the Arrow row store define columns on their prototype
+      for (const key in data) {
+        if (!this.columnNames.has(key)) {
+          this.addColumn(key)
+        }
+      }
+    }
+
+    const row = this.rowCount
+    for (let i = 0; i < this.columns.length; i++) {
+      const column = this.columns[i]
+      const value = data?.[column.name]
+      if (column.numbers !== null) {
+        if (value === undefined || value === null) {
+          this.setNumber(column, row, NaN)
+          continue
+        }
+        const type = typeof value
+        if (type === "number" || type === "bigint") {
+          this.setNumber(column, row, Number(value))
+          continue
+        }
+        this.toArray(column, row)
+      }
+      if (value === undefined || value === null) {
+        column.values.push(null)
+      } else if (column.kind === "direct") {
+        column.values.push(value)
+      } else {
+        column.values.push(sanitizeDeep(value) ?? null)
+      }
+    }
+    this.rowCount++
+  }
+
+  toObject(): { [name: string]: any[] | Float64Array } {
+    const result: { [name: string]: any[] | Float64Array } = {}
+    this.columns.forEach((column) => {
+      result[column.name] =
+        column.numbers !== null
+          ? column.numbers.slice(0, this.rowCount)
+          : column.values
+    })
+    return result
+  }
+
+  private addColumn(name: string): void {
+    const kind = this.plan.get(name) ?? "deep"
+    // Rows added before the column was seen don't have it
+    if (kind === "number" || kind === "bigint") {
+      const numbers = new Float64Array(
+        Math.max(INITIAL_CAPACITY, this.rowCount * 2)
+      )
+      numbers.fill(NaN, 0, this.rowCount)
+      this.columns.push({ name, kind, values: [], numbers })
+    } else {
+      const values = new Array(this.rowCount).fill(null)
+      this.columns.push({ name, kind, values, numbers: null })
+    }
+    this.columnNames.add(name)
+  }
+
+  private setNumber(column: Column, row: number, value: number): void {
+    let numbers = column.numbers as Float64Array
+    if (row >= numbers.length) {
+      const grown = new Float64Array(numbers.length * 2)
+      grown.set(numbers)
+      column.numbers = numbers = grown
+    }
+    numbers[row] = value
+  }
+
+  private toArray(column: Column, rowCount: number): void {
+    const numbers = column.numbers as Float64Array
+    column.values = Array.from(numbers.subarray(0, rowCount), (v) =>
+      Number.isNaN(v) ? null : v
+    )
+    column.numbers = null
+    column.kind = "deep"
+  }
+}
@@ -0,0 +1,165 @@
+import { CsvExportParams, GridApi } from "ag-grid-community"
+
+// Grids with fewer rows are exported in one go with exportDataAsCsv
+const CHUNKED_EXPORT_MIN_ROWS = 100000
+// Rows written between two yields to the browser
+const CHUNK_ROWS = 50000
+
+type ProgressCallback = (exported: number, total: number) => void
+
+interface CsvSink {
+  write(text: string): Promise<void>
+  close(): Promise<void>
+}
+
+const nextTask = (): Promise<void> =>
+  new Promise((resolve) => setTimeout(resolve, 0))
+
+/**
+ * Writes to a file picked by the user, so the CSV never has to fit in memory.
+ * Undefined when the File System Access API is not available or was refused.
+ */
+async function fileSink(fileName: string): Promise<CsvSink | undefined> {
+  const showSaveFilePicker = (window as any).showSaveFilePicker
+  if (typeof showSaveFilePicker !== "function") {
+    return undefined
+  }
+  let handle: any
+  try {
+    handle = await showSaveFilePicker({
+      suggestedName: fileName,
+      types: [{ description: "CSV", accept: { "text/csv": [".csv"] } }],
+    })
+  } catch (error: any) {
+    if (error?.name === "AbortError") {
+      throw error
+    }
+    // Not allowed in this frame
+    return undefined
+  }
+  const writable = await handle.createWritable()
+  return {
+    write: (text) => writable.write(text),
+    close: () => writable.close(),
+  }
+}
+
+/**
+ * Keeps each chunk in its own Blob and downloads them as one file at the end.
+ * The whole CSV is held in memory until then, browsers may only page Blobs
+ * out to disk.
+ */
+function blobSink(fileName: string): CsvSink {
+  const parts: Blob[] = []
+  return {
+    write: async (text) => {
+      parts.push(new Blob([text], { type: "text/csv" }))
+    },
+    close: async () => {
+      const url = URL.createObjectURL(new Blob(parts, { type: "text/csv" }))
+      const link = document.createElement("a")
+      link.href = url
+      link.download = fileName
+      document.body.appendChild(link)
+      link.click()
+      document.body.removeChild(link)
+      setTimeout(() => URL.revokeObjectURL(url), 0)
+    },
+  }
+}
+
+function exportedRowCount(api: GridApi, params: CsvExportParams): number {
+  let count = 0
+  const countRow = () => {
+    count++
+  }
+  if (params.exportedRows === "all") {
+    api.forEachNode(countRow)
+  } else {
+    api.forEachNodeAfterFilterAndSort(countRow)
+  }
+  return count
+}
+
+/**
+ * Params exporting the rows [start, end) of the export described by params.
+ * Headers and prepended content go with the first chunk, pinned bottom rows
+ * and appended content with the last one.
+ */
+function chunkParams(
+  params: CsvExportParams,
+  start: number,
+  end: number,
+  last: boolean
+): CsvExportParams {
+  const first = start === 0
+  let row = 0
+  return {
+    ...params,
+    skipColumnHeaders: params.skipColumnHeaders || !first,
+    skipColumnGroupHeaders: params.skipColumnGroupHeaders || !first,
+    skipPinnedTop: params.skipPinnedTop || !first,
+    skipPinnedBottom: params.skipPinnedBottom || !last,
+    prependContent: first ? params.prependContent : undefined,
+    appendContent: last ? params.appendContent : undefined,
+    shouldRowBeSkipped: (rowParams) => {
+      if (params.shouldRowBeSkipped?.(rowParams)) {
+        return true
+      }
+      if (rowParams.node.rowPinned) {
+        return false
+      }
+      const index = row++
+      return index < start || index >= end
+    },
+  }
+}
+
+/**
+ * Exports the grid to CSV like exportDataAsCsv, the grid's
+ * defaultCsvExportParams (columnKeys, processCellCallback...) apply.
+ *
+ * Grids over CHUNKED_EXPORT_MIN_ROWS rows are exported in chunks of
+ * CHUNK_ROWS rows with getDataAsCsv, yielding to the browser between chunks
+ * so the page stays responsive. Chunks are written to a file picked by the
+ * user where the browser allows it, otherwise they are downloaded as a Blob
+ * once all are exported.
+ */
+export async function exportCsvInChunks(
+  api: GridApi,
+  onProgress: ProgressCallback
+): Promise<void> {
+  const params: CsvExportParams =
+    api.getGridOption("defaultCsvExportParams") || {}
+  const total = exportedRowCount(api, params)
+  if (total < CHUNKED_EXPORT_MIN_ROWS) {
+    api.exportDataAsCsv()
+    return
+  }
+
+  const fileName = params.fileName || "export.csv"
+
+  // Must be requested while the click still counts as a user gesture
+  let sink: CsvSink
+  try {
+    sink = (await fileSink(fileName)) || blobSink(fileName)
+  } catch (error) {
+    // The user cancelled the save dialog
+    return
+  }
+
+  let written = false
+  for (let start = 0; start < total; start += CHUNK_ROWS) {
+    const end = Math.min(start + CHUNK_ROWS, total)
+    const csv = api.getDataAsCsv(chunkParams(params, start, end, end === total))
+    if (csv) {
+      // Rows of a chunk are separated by line breaks, not followed by one
+      await sink.write(written ? "\r\n" + csv : csv)
+      written = true
+    }
+    onProgress(end, total)
+    await nextTask()
+  }
+
+  await sink.close()
+}
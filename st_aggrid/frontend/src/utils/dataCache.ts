@@ -0,0 +1,138 @@
+import { tableFromIPC, tableToIPC } from "apache-arrow"
+
+const DB_NAME = "st_aggrid"
+const DB_VERSION = 1
+const STORE_NAME = "datasets"
+
+interface CachedDataset {
+  hash: string
+  bytes: Uint8Array
+  size: number
+  lastUsed: number
+}
+
+// The last dataset read or written, so reruns don't read IndexedDB again
+let lastDataset: { hash: string; table: any } | undefined = undefined
+
+let database: Promise<IDBDatabase | undefined> | undefined = undefined
+
+function openDatabase(): Promise<IDBDatabase | undefined> {
+  if (database === undefined) {
+    database = new Promise((resolve) => {
+      try {
+        const request = indexedDB.open(DB_NAME, DB_VERSION)
+        request.onupgradeneeded = () => {
+          const store = request.result.createObjectStore(STORE_NAME, {
+            keyPath: "hash",
+          })
+          store.createIndex("lastUsed", "lastUsed")
+        }
+        request.onsuccess = () => resolve(request.result)
+        // Private browsing or storage disabled, the cache is skipped
+        request.onerror = () => resolve(undefined)
+        request.onblocked = () => resolve(undefined)
+      } catch (error) {
+        resolve(undefined)
+      }
+    })
+  }
+  return database
+}
+
+function requestResult<T>(request: IDBRequest<T>): Promise<T> {
+  return new Promise((resolve, reject) => {
+    request.onsuccess = () => resolve(request.result)
+    request.onerror = () => reject(request.error)
+  })
+}
+
+function transactionDone(transaction: IDBTransaction): Promise<void> {
+  return new Promise((resolve, reject) => {
+    transaction.oncomplete = () => resolve()
+    transaction.onerror = () => reject(transaction.error)
+    transaction.onabort = () => reject(transaction.error)
+  })
+}
+
+/**
+ * Arrow table cached for data_hash, undefined when the browser doesn't hold it
+ */
+export async function getCachedTable(hash: string): Promise<any | undefined> {
+  if (lastDataset?.hash === hash) {
+    return lastDataset.table
+  }
+
+  const db = await openDatabase()
+  if (!db) {
+    return undefined
+  }
+  try {
+    const transaction = db.transaction(STORE_NAME, "readwrite")
+    const store = transaction.objectStore(STORE_NAME)
+    const dataset: CachedDataset | undefined = await requestResult(
+      store.get(hash)
+    )
+    if (!dataset) {
+      return undefined
+    }
+    dataset.lastUsed = Date.now()
+    store.put(dataset)
+
+    const table = tableFromIPC(dataset.bytes)
+    lastDataset = { hash, table }
+    return table
+  } catch (error) {
+    console.warn("Failed to read cached grid data:", error)
+    return undefined
+  }
+}
+
+/**
+ * Caches an Arrow table for data_hash, least recently used datasets are
+ * evicted until the cache fits in maxBytes. Resolves to whether the table
+ * was stored.
+ */
+export async function putCachedTable(
+  hash: string,
+  table: any,
+  maxBytes: number
+): Promise<boolean> {
+  lastDataset = { hash, table }
+
+  const db = await openDatabase()
+  if (!db) {
+    return false
+  }
+  try {
+    const bytes = tableToIPC(table, "stream")
+    if (bytes.byteLength > maxBytes) {
+      return false
+    }
+
+    const transaction = db.transaction(STORE_NAME, "readwrite")
+    const store = transaction.objectStore(STORE_NAME)
+    store.put({ hash, bytes, size: bytes.byteLength, lastUsed: Date.now() })
+
+    // Walk datasets from the most recently used, deleting those over the budget
+    let total = 0
+    const cursors = store.index("lastUsed").openCursor(null, "prev")
+    cursors.onsuccess = () => {
+      const cursor = cursors.result
+      if (!cursor) {
+        return
+      }
+      const dataset = cursor.value as CachedDataset
+      total += dataset.size
+      if (total > maxBytes && dataset.hash !== hash) {
+        cursor.delete()
+      }
+      cursor.continue()
+    }
+    await transactionDone(transaction)
+    return true
+  } catch (error) {
+    // Quota exceeded or storage unavailable, the data is sent again next time
+    console.warn("Failed to cache grid data:", error)
+    return false
+  }
+}
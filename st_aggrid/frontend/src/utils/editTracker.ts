@@ -0,0 +1,95 @@
+import { CellValueChangedEvent } from "ag-grid-community"
+
+export interface EditRecord {
+  rowId: string | undefined
+  column: string
+  oldValue: any
+  newValue: any
+}
+
+export interface EditsSnapshot {
+  token: string
+  seq: number
+  // Number of the first edit, edits are numbered from 0 since the grid was mounted
+  start: number
+  edits: EditRecord[]
+}
+
+/**
+ * Keeps the cells edited and not yet acknowledged by Streamlit.
+ *
+ * Edits are kept until Python echoes the number of a return carrying them
+ * (ack_seq), so every return sends again the edits of returns that were
+ * lost. Edits are numbered and, together with a per mount token, let Python
+ * skip the edits it already received.
+ */
+export class EditTracker {
+  private token: string = Math.random().toString(36).slice(2)
+  private seq: number = 0
+  // Number of edits recorded since the grid was mounted
+  private recorded: number = 0
+  private pending: EditRecord[] = []
+  // Number of the edit following the last one sent, by return number
+  private sentReturns: Map<number, number> = new Map()
+  private lastReturnSeq: number | undefined = undefined
+
+  record(event: CellValueChangedEvent): void {
+    this.pending.push({
+      rowId: event.node.id,
+      column: event.column.getColId(),
+      oldValue: event.oldValue,
+      newValue: event.newValue,
+    })
+    this.recorded++
+  }
+
+  /**
+   * Whether some edits were not acknowledged yet
+   */
+  get hasPending(): boolean {
+    return this.pending.length > 0
+  }
+
+  snapshot(): EditsSnapshot {
+    this.seq++
+    return {
+      token: this.token,
+      seq: this.seq,
+      start: this.recorded - this.pending.length,
+      edits: this.pending.slice(),
+    }
+  }
+
+  /**
+   * Remembers the edits a snapshot sent with the return numbered returnSeq
+   */
+  sent(snapshot: EditsSnapshot, returnSeq: number): void {
+    this.sentReturns.set(returnSeq, snapshot.start + snapshot.edits.length)
+    this.lastReturnSeq = returnSeq
+  }
+
+  /**
+   * Drops the edits sent with the return numbered returnSeq and earlier ones,
+   * the last return sent when returnSeq is undefined
+   */
+  acknowledge(returnSeq?: number): void {
+    const acknowledged =
+      returnSeq === undefined ? this.lastReturnSeq : returnSeq
+    if (acknowledged === undefined) {
+      return
+    }
+
+    let end = -1
+    this.sentReturns.forEach((sentEnd, sentSeq) => {
+      if (sentSeq <= acknowledged) {
+        end = Math.max(end, sentEnd)
+        this.sentReturns.delete(sentSeq)
+      }
+    })
+
+    const first = this.recorded - this.pending.length
+    if (end > first) {
+      this.pending.splice(0, end - first)
+    }
+  }
+}
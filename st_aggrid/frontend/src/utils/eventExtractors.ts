@@ -0,0 +1,244 @@
+// Hard limit on the serialized size of the event data sent back to Streamlit
+export const MAX_EVENT_DATA_BYTES = 4096
+// Longest string value kept from an event, edited values are not shortened
+const MAX_STRING_LENGTH = 256
+
+// Event fields holding edited cell values, sent whole and never dropped
+const EDITED_VALUE_FIELDS: { [eventName: string]: string[] } = {
+  cellValueChanged: ["oldValue", "newValue"],
+  cellEditingStopped: ["oldValue", "newValue"],
+}
+
+type Extractor = (e: any) => { [field: string]: any }
+
+const colId = (column: any): any =>
+  typeof column === "string" ? column : column?.getColId?.()
+
+const colIds = (e: any): any =>
+  Array.isArray(e.columns) ? e.columns.map(colId) : undefined
+
+// `data` is the row data, its primitive fields are sent as far as the budget allows
+const rowFields = (e: any) => ({
+  rowId: e.node?.id,
+  rowIndex: e.rowIndex ?? e.node?.rowIndex,
+  rowPinned: e.rowPinned ?? e.node?.rowPinned,
+  data: e.data ?? e.node?.data,
+})
+
+const cellFields = (e: any) => ({
+  ...rowFields(e),
+  colId: colId(e.column),
+})
+
+const columnFields = (e: any) => ({
+  colId: colId(e.column),
+  colIds: colIds(e),
+  source: e.source,
+})
+
+/**
+ * Fields kept for each grid event, only documented event properties are read.
+ * Events not listed here keep their top level primitive fields.
+ */
+export const EVENT_EXTRACTORS: { [eventName: string]: Extractor } = {
+  cellValueChanged: (e) => ({
+    ...cellFields(e),
+    oldValue: e.oldValue,
+    newValue: e.newValue,
+    source: e.source,
+  }),
+  cellEditingStarted: (e) => ({ ...cellFields(e), value: e.value }),
+  cellEditingStopped: (e) => ({
+    ...cellFields(e),
+    oldValue: e.oldValue,
+    newValue: e.newValue,
+    valueChanged: e.valueChanged,
+  }),
+  cellClicked: (e) => ({ ...cellFields(e), value: e.value }),
+  cellDoubleClicked: (e) => ({ ...cellFields(e), value: e.value }),
+  cellContextMenu: (e) => ({ ...cellFields(e), value: e.value }),
+  cellFocused: (e) => ({
+    rowIndex: e.rowIndex,
+    rowPinned: e.rowPinned,
+    colId: colId(e.column),
+  }),
+  rowValueChanged: rowFields,
+  rowClicked: rowFields,
+  rowDoubleClicked: rowFields,
+  rowSelected: (e) => ({ ...rowFields(e), isSelected: e.node?.isSelected() }),
+  rowGroupOpened: (e) => ({ ...rowFields(e), expanded: e.expanded }),
+  selectionChanged: (e) => ({ source: e.source }),
+  filterChanged: (e) => ({ colIds: colIds(e), source: e.source }),
+  filterModified: (e) => ({ colId: colId(e.column) }),
+  sortChanged: (e) => ({ colIds: colIds(e), source: e.source }),
+  columnResized: (e) => ({
+    ...columnFields(e),
+    width: e.column?.getActualWidth?.(),
+    finished: e.finished,
+  }),
+  columnMoved: (e) => ({
+    ...columnFields(e),
+    toIndex: e.toIndex,
+    finished: e.finished,
+  }),
+  columnPinned: (e) => ({ ...columnFields(e), pinned: e.pinned }),
+  columnVisible: (e) => ({ ...columnFields(e), visible: e.visible }),
+  columnRowGroupChanged: columnFields,
+  columnPivotChanged: columnFields,
+  columnValueChanged: columnFields,
+  paginationChanged: (e) => ({
+    newPage: e.newPage,
+    newPageSize: e.newPageSize,
+    newData: e.newData,
+  }),
+}
+
+/**
+ * Serializable value or undefined. Objects are copied one level deep with their primitive values.
+ */
+function toSafeValue(
+  value: any,
+  depth: number = 0,
+  shorten: boolean = true
+): any {
+  if (value === null || value === undefined) {
+    return undefined
+  }
+  switch (typeof value) {
+    case "number":
+      return Number.isFinite(value) ? value : undefined
+    case "boolean":
+      return value
+    case "string":
+      return shorten && value.length > MAX_STRING_LENGTH
+        ? value.slice(0, MAX_STRING_LENGTH)
+        : value
+    case "bigint":
+      return Number(value)
+    case "object": {
+      if (value instanceof Date) {
+        return value.toISOString()
+      }
+      if (depth > 0) {
+        return undefined
+      }
+      if (Array.isArray(value)) {
+        return value.map((v) => toSafeValue(v, depth + 1, shorten) ?? null)
+      }
+      const copy: any = {}
+      for (const key of Object.keys(value)) {
+        const v = toSafeValue(value[key], depth + 1, shorten)
+        if (v !== undefined) {
+          copy[key] = v
+        }
+      }
+      return copy
+    }
+    default:
+      return undefined
+  }
+}
+
+/**
+ * Primitive fields of a row's data, as many as fit in `budget` bytes once serialized.
+ */
+function rowDataWithin(
+  rowData: any,
+  budget: number
+): { data: any; complete: boolean } {
+  const data: any = {}
+  let size = 0
+  let complete = true
+  for (const key of Object.keys(rowData)) {
+    const value = toSafeValue(rowData[key], 1)
+    if (value === undefined) {
+      continue
+    }
+    // "key":value and the comma separating it from the previous field
+    const fieldSize = JSON.stringify(key).length + JSON.stringify(value).length + 2
+    if (size + fieldSize > budget) {
+      complete = false
+      continue
+    }
+    data[key] = value
+    size += fieldSize
+  }
+  return { data, complete }
+}
+
+/**
+ * Serialized size of an event summary, leaving out its top level `excluded` fields.
+ */
+function sizeWithout(result: any, excluded: string[]): number {
+  return JSON.stringify(result, function (this: any, key: string, value: any) {
+    return this === result && excluded.indexOf(key) >= 0 ? undefined : value
+  }).length
+}
+
+/**
+ * Serializable summary of a grid event, never larger than MAX_EVENT_DATA_BYTES
+ * once serialized, not counting its edited values (EDITED_VALUE_FIELDS).
+ */
+export function extractEventData(
+  eventData: any,
+  streamlitRerunEventTriggerName: string
+): any {
+  const extractor = EVENT_EXTRACTORS[streamlitRerunEventTriggerName]
+
+  let fields: { [field: string]: any } = {}
+  if (eventData) {
+    if (extractor) {
+      fields = extractor(eventData)
+    } else {
+      for (const key of Object.keys(eventData)) {
+        if (typeof eventData[key] !== "object") {
+          fields[key] = eventData[key]
+        }
+      }
+    }
+  }
+
+  const editedValueFields = EDITED_VALUE_FIELDS[streamlitRerunEventTriggerName] || []
+  const result: any = {
+    type: toSafeValue(eventData?.type),
+    streamlitRerunEventTriggerName: streamlitRerunEventTriggerName,
+  }
+  for (const key of Object.keys(fields)) {
+    if (key === "data" && extractor) {
+      continue
+    }
+    const edited = editedValueFields.indexOf(key) >= 0
+    const value = toSafeValue(fields[key], 0, !edited)
+    if (value !== undefined && value !== "") {
+      result[key] = value
+    }
+  }
+
+  // Drop the last fields (values before ids) until the budget is met
+  const keys = Object.keys(result)
+    .slice(2)
+    .filter((key) => editedValueFields.indexOf(key) < 0)
+  let size = sizeWithout(result, editedValueFields)
+  while (size > MAX_EVENT_DATA_BYTES && keys.length > 0) {
+    delete result[keys.pop() as string]
+    result.truncated = true
+    size = sizeWithout(result, editedValueFields)
+  }
+
+  // Then the row data, with the fields that still fit
+  const rowData = extractor ? fields.data : undefined
+  if (rowData && typeof rowData === "object") {
+    const reserved = ',"data":{}'.length + ',"truncated":true'.length
+    const { data, complete } = rowDataWithin(
+      rowData,
+      MAX_EVENT_DATA_BYTES - size - reserved
+    )
+    if (Object.keys(data).length > 0) {
+      result.data = data
+    }
+    if (!complete) {
+      result.truncated = true
+    }
+  }
+  return result
+}
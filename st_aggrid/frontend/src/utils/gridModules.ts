@@ -0,0 +1,46 @@
+import { AllCommunityModule, ModuleRegistry } from "ag-grid-community"
+
+function setLicenseKey(LicenseManager: any, args: any): void {
+  if ("license_key" in args) {
+    LicenseManager.setLicenseKey(args["license_key"])
+  }
+}
+
+/**
+ * Registers the AG Grid modules requested by enable_enterprise_modules.
+ *
+ * Enterprise and charts code is split in its own chunks, downloaded only by
+ * grids enabling them. Community modules are registered synchronously and
+ * undefined is returned, otherwise the promise resolves once the chunks are
+ * loaded and registered.
+ */
+export function registerGridModules(args: any): Promise<void> | undefined {
+  const enableEnterpriseModules = args.enable_enterprise_modules
+
+  if (enableEnterpriseModules === "enterprise+AgCharts") {
+    return Promise.all([
+      import(/* webpackChunkName: "ag-grid-enterprise" */ "ag-grid-enterprise"),
+      import(/* webpackChunkName: "ag-charts-enterprise" */ "ag-charts-enterprise"),
+    ]).then(([enterprise, charts]) => {
+      ModuleRegistry.registerModules([
+        enterprise.AllEnterpriseModule.with(charts.AgChartsEnterpriseModule),
+      ])
+      setLicenseKey(enterprise.LicenseManager, args)
+    })
+  }
+
+  if (
+    enableEnterpriseModules === true ||
+    enableEnterpriseModules === "enterpriseOnly"
+  ) {
+    return import(
+      /* webpackChunkName: "ag-grid-enterprise" */ "ag-grid-enterprise"
+    ).then((enterprise) => {
+      ModuleRegistry.registerModules([enterprise.AllEnterpriseModule])
+      setLicenseKey(enterprise.LicenseManager, args)
+    })
+  }
+
+  ModuleRegistry.registerModules([AllCommunityModule])
+  return undefined
+}
@@ -0,0 +1,55 @@
+// Hashes computed by Python for each gridOptions key and each columnDef
+export interface GridOptionsFingerprint {
+  options: { [key: string]: string }
+  columnDefs: string[]
+}
+
+// Options not applied from gridOptions updates
+const IGNORED_KEYS = ["rowData", "theme"]
+
+/**
+ * gridOptions keys added, removed or changed between two fingerprints
+ */
+export function changedOptionKeys(
+  prev: GridOptionsFingerprint,
+  curr: GridOptionsFingerprint
+): string[] {
+  const keys = new Set([
+    ...Object.keys(prev.options),
+    ...Object.keys(curr.options),
+  ])
+  return Array.from(keys).filter(
+    (key) =>
+      !IGNORED_KEYS.includes(key) && prev.options[key] !== curr.options[key]
+  )
+}
+
+/**
+ * Parsed columnDefs by fingerprint, so only new or changed columnDefs are
+ * parsed and the grid gets the same objects for unchanged ones.
+ */
+export class ColumnDefsCache {
+  private parsed: Map<string, any> = new Map()
+
+  update(
+    columnDefs: any[],
+    hashes: string[],
+    parse: (colDef: any) => any
+  ): any[] {
+    const next = new Map<string, any>()
+    const result = columnDefs.map((colDef, i) => {
+      const hash = hashes[i]
+      // Identical columnDefs in the same update still get their own object
+      let parsed = next.has(hash) ? undefined : this.parsed.get(hash)
+      if (parsed === undefined) {
+        parsed = parse(colDef)
+      }
+      if (hash !== undefined && !next.has(hash)) {
+        next.set(hash, parsed)
+      }
+      return parsed
+    })
+    this.parsed = next
+    return result
+  }
+}
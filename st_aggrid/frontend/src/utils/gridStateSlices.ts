@@ -0,0 +1,144 @@
+import { GridApi } from "ag-grid-community"
+
+interface StateSlice {
+  // Keys of api.getState() to send
+  gridState: string[]
+  // Whether api.getColumnState() must be sent
+  columnsState: boolean
+}
+
+// getState() keys that change with column events
+const COLUMN_STATE_KEYS = [
+  "aggregation",
+  "columnGroup",
+  "columnOrder",
+  "columnPinning",
+  "columnSizing",
+  "columnVisibility",
+  "partialColumnState",
+  "pivot",
+  "rowGroup",
+  "sort",
+]
+
+const NO_STATE: StateSlice = { gridState: [], columnsState: false }
+const COLUMN_SLICE: StateSlice = {
+  gridState: COLUMN_STATE_KEYS,
+  columnsState: true,
+}
+const SELECTION_SLICE: StateSlice = {
+  gridState: ["rowSelection"],
+  columnsState: false,
+}
+
+// State needed by each event, events not listed here send the full state
+export const EVENT_STATE_SLICES: { [eventName: string]: StateSlice } = {
+  cellValueChanged: NO_STATE,
+  rowValueChanged: NO_STATE,
+  selectionChanged: SELECTION_SLICE,
+  rowSelected: SELECTION_SLICE,
+  filterChanged: { gridState: ["filter"], columnsState: false },
+  sortChanged: { gridState: ["sort"], columnsState: true },
+  columnResized: COLUMN_SLICE,
+  columnMoved: COLUMN_SLICE,
+  columnPinned: COLUMN_SLICE,
+  columnVisible: COLUMN_SLICE,
+  columnRowGroupChanged: COLUMN_SLICE,
+  columnPivotChanged: COLUMN_SLICE,
+  columnPivotModeChanged: COLUMN_SLICE,
+  columnValueChanged: COLUMN_SLICE,
+  columnGroupOpened: COLUMN_SLICE,
+  displayedColumnsChanged: COLUMN_SLICE,
+  gridColumnsChanged: COLUMN_SLICE,
+  newColumnsLoaded: COLUMN_SLICE,
+  rowGroupOpened: { gridState: ["rowGroupExpansion"], columnsState: false },
+  paginationChanged: { gridState: ["pagination"], columnsState: false },
+  cellFocused: { gridState: ["focusedCell"], columnsState: false },
+  cellSelectionChanged: { gridState: ["cellSelection"], columnsState: false },
+  bodyScrollEnd: { gridState: ["scroll"], columnsState: false },
+  toolPanelVisibleChanged: { gridState: ["sideBar"], columnsState: false },
+}
+
+export interface StateDelta {
+  gridState: any
+  columnsState: any
+  stateToken: string
+  stateSeq: number
+  stateFull: boolean
+}
+
+/**
+ * Collects only the parts of the grid state that the triggering events changed.
+ *
+ * Python keeps the last full state of each grid, keyed by a per mount token,
+ * and merges the slices into it. The full state is sent while Python does not
+ * list the token in `state_tokens`, e.g. on the first return or after the
+ * session was lost. Slices of returns that were not sent are kept for the
+ * next one.
+ */
+export class GridStateSlicer {
+  readonly token: string = Math.random().toString(36).slice(2)
+  private seq: number = 0
+  private pendingKeys: Set<string> = new Set()
+  private pendingColumnsState: boolean = false
+  private pendingFull: boolean = false
+
+  collect(
+    api: GridApi | undefined,
+    eventNames: string[],
+    knownTokens: string[] | undefined
+  ): StateDelta {
+    eventNames.forEach((eventName) => {
+      const slice = EVENT_STATE_SLICES[eventName]
+      if (slice === undefined) {
+        this.pendingFull = true
+        return
+      }
+      slice.gridState.forEach((key) => this.pendingKeys.add(key))
+      this.pendingColumnsState = this.pendingColumnsState || slice.columnsState
+    })
+
+    const full =
+      this.pendingFull ||
+      !Array.isArray(knownTokens) ||
+      !knownTokens.includes(this.token)
+    const gridState: any = api?.getState()
+
+    let stateSlice: any = gridState
+    if (!full && gridState) {
+      // Missing keys are sent as null so Python drops them (e.g. cleared filter)
+      stateSlice = {}
+      this.pendingKeys.forEach((key) => {
+        stateSlice[key] = gridState[key] ?? null
+      })
+    }
+
+    // Client side row selection repeats every selected id, Python rebuilds it from the ranges
+    if (stateSlice && Array.isArray(stateSlice.rowSelection)) {
+      stateSlice = { ...stateSlice }
+      delete stateSlice.rowSelection
+    }
+
+    return {
+      gridState: stateSlice,
+      columnsState:
+        full || this.pendingColumnsState ? api?.getColumnState() : undefined,
+      stateToken: this.token,
+      stateSeq: this.seq + 1,
+      stateFull: full,
+    }
+  }
+
+  /**
+   * Pending slices are cleared once they reached Streamlit
+   */
+  acknowledge(seq: number): void {
+    if (seq !== this.seq + 1) {
+      return
+    }
+    this.seq = seq
+    this.pendingKeys.clear()
+    this.pendingColumnsState = false
+    this.pendingFull = false
+  }
+}
@@ -34,14 +34,35 @@ export function injectProAssets(jsCode: string, cssCode?: string) {
   }
 }
 
+const JS_PLACEHOLDER = "::JSCODE::"
+const JS_CODE_REGEX = new RegExp(`${JS_PLACEHOLDER}(.*?)${JS_PLACEHOLDER}`, "s")
+
+// Functions compiled from JsCode by source text, least recently used first.
+// Every render looks up all of its JsCode, so the current gridOptions' functions
+// stay in the cache while the ones of older gridOptions get evicted.
+const compiledJsCode: Map<string, any> = new Map()
+const COMPILED_JS_CODE_LIMIT = 500
+
 export function parseJsCodeFromPython(v: string) {
-  const JS_PLACEHOLDER = "::JSCODE::"
-  const funcReg = new RegExp(`${JS_PLACEHOLDER}(.*?)${JS_PLACEHOLDER}`, "s")
-  let match = funcReg.exec(v)
+  if (typeof v !== "string" || !v.includes(JS_PLACEHOLDER)) {
+    return v
+  }
+  let match = JS_CODE_REGEX.exec(v)
   if (match) {
     const funcStr = match[1]
-    // eslint-disable-next-line
-    return new Function("return " + funcStr)()
+    // Reruns get the same function instances, so the grid doesn't refresh unchanged columns
+    let func = compiledJsCode.get(funcStr)
+    if (compiledJsCode.has(funcStr)) {
+      compiledJsCode.delete(funcStr)
+    } else {
+      // eslint-disable-next-line
+      func = new Function("return " + funcStr)()
+      if (compiledJsCode.size >= COMPILED_JS_CODE_LIMIT) {
+        compiledJsCode.delete(compiledJsCode.keys().next().value as string)
+      }
+    }
+    compiledJsCode.set(funcStr, func)
+    return func
   } else {
     return v
   }
@@ -0,0 +1,41 @@
+import { IRowNode } from "ag-grid-community"
+
+/**
+ * Group keys and integer references of group nodes, kept across returns.
+ *
+ * The keys of a group are its parent's keys plus its own, so each group is
+ * computed once. Leaves reference their group with the integer `groupRef`
+ * of the group node instead of its (long) id. The cache is cleared when
+ * grouping or row data changes.
+ */
+export class GroupPathCache {
+  private keys: WeakMap<IRowNode, any[]> = new WeakMap()
+  private refs: Map<string, number> = new Map()
+
+  groupKeys(node: IRowNode | null): any[] {
+    if (!node || node.level < 0) {
+      return []
+    }
+    let keys = this.keys.get(node)
+    if (keys === undefined) {
+      keys = [...this.groupKeys(node.parent), node.key]
+      this.keys.set(node, keys)
+    }
+    return keys
+  }
+
+  groupRef(node: IRowNode): number {
+    const id = node.id as string
+    let ref = this.refs.get(id)
+    if (ref === undefined) {
+      ref = this.refs.size
+      this.refs.set(id, ref)
+    }
+    return ref
+  }
+
+  invalidate(): void {
+    this.keys = new WeakMap()
+    this.refs.clear()
+  }
+}
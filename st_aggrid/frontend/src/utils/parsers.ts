@@ -4,15 +4,24 @@ import { deepMap } from "../utils"
 import { parseJsCodeFromPython } from "./gridUtils"
 import { columnFormaters } from "../customColumns"
 import { ThemeParser } from "../ThemeParser"
+import { decompressPayload } from "./payloadEncoding"
+import { createArrowRowStore } from "./arrowRowStore"
+import { arrowTableToRows } from "./arrowToRows"
+import { ColumnDefsCache } from "./gridOptionsDiff"
 
 
-export function parseGridOptions(props: any){
-    let gridOptions: GridOptions = cloneDeep(props.args.gridOptions)
+function parseJsCode(props: any, options: any): any {
+    // deepMap already copies the options
+    return props.args.allow_unsafe_jscode
+        ? deepMap(options, parseJsCodeFromPython, ["rowData"])
+        : cloneDeep(options)
+}
 
+export function parseGridOptions(props: any){
     if (props.args.allow_unsafe_jscode) {
         console.warn("flag allow_unsafe_jscode is on.")
-        gridOptions = deepMap(gridOptions, parseJsCodeFromPython, ["rowData"])
     }
+    let gridOptions: GridOptions = parseJsCode(props, props.args.gridOptions)
 
     if (!("getRowId" in gridOptions)) {
         console.warn("getRowId was not set. Auto Rows hashes will be used as row ids.")
@@ -33,6 +42,69 @@ export function parseGridOptions(props: any){
     return gridOptions
 }
 
+/**
+ * Parses only the given gridOptions keys, for updateGridOptions. Removed keys are set to undefined,
+ * columnDefs unchanged since the last update are taken from columnDefsCache.
+ */
+export function parseGridOptionsUpdate(props: any, keys: string[], columnDefsCache: ColumnDefsCache){
+    const source = props.args.gridOptions
+    const update: any = {}
+
+    keys.forEach((key) => {
+      if (!(key in source)) {
+        update[key] = undefined
+      } else if (key === "columnDefs" && Array.isArray(source.columnDefs)) {
+        update.columnDefs = columnDefsCache.update(
+          source.columnDefs,
+          props.args.grid_options_fingerprint.columnDefs,
+          (colDef: any) => parseJsCode(props, { colDef }).colDef
+        )
+      } else {
+        update[key] = parseJsCode(props, { [key]: source[key] })[key]
+      }
+    })
+
+    if ("columnTypes" in update) {
+      update.columnTypes = Object.assign(update.columnTypes || {}, columnFormaters)
+    }
+    return update
+}
+
+/**
+ * Arrow table of the data sent by Python without the pandas index columns, undefined for JSON data
+ */
+export function selectDataTable(props: any): any {
+    const data = props.args.data
+    if (!data) {
+        return undefined
+    }
+    const arrowTable = data.dataTable || data.table
+
+    // Extract index column names from pandas metadata
+    let indexColumns: string[] = []
+    try {
+      const pandasMeta = JSON.parse(arrowTable?.schema?.metadata?.get('pandas') || '{}')
+      indexColumns = pandasMeta.index_columns || []
+    } catch (e) {}
+
+    // Filter out index columns and select only data fields
+    const dataFields = arrowTable?.schema?.fields
+      ?.map((f: any) => f.name)
+      .filter((name: string) => !indexColumns.includes(name)) || []
+
+    return arrowTable.select(dataFields)
+}
+
+/**
+ * Row data of an Arrow table holding only data fields
+ */
+export function tableToRowData(table: any, props: any): any[] {
+    if (props.args.columnar_row_store) {
+      return createArrowRowStore(table)
+    }
+    return arrowTableToRows(table)
+}
+
 export function parseData(props: any){
 
     var data = props.args.data
@@ -41,43 +113,7 @@ export function parseData(props: any){
 
         // Handle rowData: use data.table if available, otherwise check gridOptions.rowData
         if (data) {
-
-          //Quick fix for bigInt serializations. Python side should avoid sending non-json-serializabe entities.
-          const bigintReplacer = (key: any, value: any): any => {
-            if (typeof value === "bigint") {
-              return Number(value)
-            }
-            if (Array.isArray(value)) {
-              return value.map((item: any) => bigintReplacer(null, item))
-            }
-            if (value && typeof value === "object") {
-              // Recursively handle object properties
-              const replacedObj: any = {}
-              for (const prop in value) {
-            if (Object.prototype.hasOwnProperty.call(value, prop)) {
-              replacedObj[prop] = bigintReplacer(prop, value[prop])
-            }
-              }
-              return replacedObj
-            }
-            return value
-          }
-          const arrowTable = data.dataTable || data.table
-
-          // Extract index column names from pandas metadata
-          let indexColumns: string[] = []
-          try {
-            const pandasMeta = JSON.parse(arrowTable?.schema?.metadata?.get('pandas') || '{}')
-            indexColumns = pandasMeta.index_columns || []
-          } catch (e) {}
-
-          // Filter out index columns and select only data fields
-          const dataFields = arrowTable?.schema?.fields
-            ?.map((f: any) => f.name)
-            .filter((name: string) => !indexColumns.includes(name)) || []
-
-          const filteredTable = arrowTable.select(dataFields)
-          rowData = JSON.parse(JSON.stringify(filteredTable.toArray(), bigintReplacer))  
+          rowData = tableToRowData(selectDataTable(props), props)
         } 
          // If data is null but gridOptions.rowData contains JSON string, parse it
          else if (gridOptions_rowData && typeof gridOptions_rowData === 'string') {
@@ -90,4 +126,16 @@ export function parseData(props: any){
           }
         } 
         return rowData
-}
\ No newline at end of file
+}
+
+/**
+ * Row data sent gzip compressed by Python (compress_payloads=True), undefined when not compressed
+ */
+export async function parseCompressedData(props: any): Promise<any[] | undefined> {
+    const compressed = props.args.compressed_row_data
+    if (!compressed) {
+        return undefined
+    }
+    const json = new TextDecoder().decode(await decompressPayload(compressed))
+    return JSON.parse(json)
+}
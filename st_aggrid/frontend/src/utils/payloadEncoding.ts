@@ -0,0 +1,105 @@
+// Binary grid return layout, decoded by st_aggrid/grid_payload.py:
+//   "AGR1" | header length (uint32 LE) | JSON header | padding | buffers
+// Float64Arrays found in the value are written to the buffer region, 8 bytes
+// aligned, and replaced in the header by {"__buffer__": [offset, length, dtype]}.
+const MAGIC = [0x41, 0x47, 0x52, 0x31]
+const BUFFER_KEY = "__buffer__"
+
+const align8 = (n: number): number => (n + 7) & ~7
+
+/**
+ * Encodes a grid return value as a single binary payload.
+ */
+export function encodePayload(value: any): Uint8Array {
+  const buffers: Float64Array[] = []
+  let dataLength = 0
+
+  const header = JSON.stringify(value, (key, v) => {
+    if (v instanceof Float64Array) {
+      const offset = dataLength
+      buffers.push(v)
+      dataLength = align8(dataLength + v.byteLength)
+      return { [BUFFER_KEY]: [offset, v.length, "<f8"] }
+    }
+    return v
+  })
+  const headerBytes = new TextEncoder().encode(header)
+  const dataStart = align8(8 + headerBytes.length)
+
+  const payload = new Uint8Array(dataStart + dataLength)
+  payload.set(MAGIC, 0)
+  new DataView(payload.buffer).setUint32(4, headerBytes.length, true)
+  payload.set(headerBytes, 8)
+
+  let offset = dataStart
+  buffers.forEach((buffer) => {
+    payload.set(
+      new Uint8Array(buffer.buffer, buffer.byteOffset, buffer.byteLength),
+      offset
+    )
+    offset = align8(offset + buffer.byteLength)
+  })
+  return payload
+}
+
+const streamClass = (name: string): any => (globalThis as any)[name]
+
+async function pipeThrough(bytes: Uint8Array, transform: any): Promise<Uint8Array> {
+  const stream = new Blob([bytes]).stream().pipeThrough(transform)
+  return new Uint8Array(await new Response(stream).arrayBuffer())
+}
+
+/**
+ * Gzip compresses payloads of at least `threshold` bytes, when the browser supports it
+ */
+export async function compressPayload(
+  payload: Uint8Array,
+  threshold: number | null | undefined
+): Promise<Uint8Array> {
+  const CompressionStream = streamClass("CompressionStream")
+  if (
+    threshold === null ||
+    threshold === undefined ||
+    payload.length < threshold ||
+    CompressionStream === undefined
+  ) {
+    return payload
+  }
+  return pipeThrough(payload, new CompressionStream("gzip"))
+}
+
+/**
+ * Inflates gzip compressed bytes sent by Python
+ */
+export async function decompressPayload(bytes: Uint8Array): Promise<Uint8Array> {
+  const DecompressionStream = streamClass("DecompressionStream")
+  if (DecompressionStream === undefined) {
+    throw new Error(
+      "This browser can't inflate compressed grid data, set compress_payloads=False."
+    )
+  }
+  return pipeThrough(bytes, new DecompressionStream("gzip"))
+}
+
+// Returns of grids in an AgGridLayout carry the key of the sending grid:
+//   "AGL1" | key length (uint32 LE) | key | payload   for binary payloads
+//   {"__grid_key__": key, "value": value}             for other values
+const LAYOUT_MAGIC = [0x41, 0x47, 0x4c, 0x31]
+const LAYOUT_KEY = "__grid_key__"
+
+/**
+ * Tags a component value with the key of the grid sending it, for routing by AgGridLayout
+ */
+export function routeToGrid(gridKey: string, value: any): any {
+  if (!(value instanceof Uint8Array)) {
+    return { [LAYOUT_KEY]: gridKey, value: value }
+  }
+
+  const key = new TextEncoder().encode(gridKey)
+  const routed = new Uint8Array(8 + key.length + value.length)
+  routed.set(LAYOUT_MAGIC, 0)
+  new DataView(routed.buffer).setUint32(4, key.length, true)
+  routed.set(key, 8)
+  routed.set(value, 8 + key.length)
+  return routed
+}
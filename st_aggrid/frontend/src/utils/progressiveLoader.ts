@@ -0,0 +1,83 @@
+import { GridApi } from "ag-grid-community"
+import { arrowTableToRows } from "./arrowToRows"
+
+// Tables smaller than this are loaded at once
+export const PROGRESSIVE_MIN_ROWS = 10000
+// Rows rendered before the rest of the table is converted
+const FIRST_BLOCK_ROWS = 1000
+// Rows converted and added per transaction afterwards
+const CHUNK_ROWS = 20000
+
+type ProgressCallback = (loaded: number, total: number) => void
+
+/**
+ * Renders the first rows of a large Arrow table right away and adds the rest
+ * in chunks with applyTransactionAsync, yielding to the browser between chunks.
+ *
+ * Chunks are zero copy slices of the table, so the time to first row does
+ * not depend on the table size.
+ */
+export class ProgressiveLoader {
+  private table: any
+  private onProgress: ProgressCallback
+  private loaded: number = 0
+  private cancelled: boolean = false
+  private timer: ReturnType<typeof setTimeout> | undefined = undefined
+
+  constructor(table: any, onProgress: ProgressCallback) {
+    this.table = table
+    this.onProgress = onProgress
+  }
+
+  get total(): number {
+    return this.table.numRows
+  }
+
+  get loading(): boolean {
+    return !this.cancelled && this.loaded < this.total
+  }
+
+  firstBlock(): any[] {
+    this.loaded = Math.min(FIRST_BLOCK_ROWS, this.total)
+    return arrowTableToRows(this.table.slice(0, this.loaded))
+  }
+
+  start(api: GridApi): void {
+    this.onProgress(this.loaded, this.total)
+    this.schedule(api)
+  }
+
+  cancel(): void {
+    this.cancelled = true
+    if (this.timer !== undefined) {
+      clearTimeout(this.timer)
+      this.timer = undefined
+    }
+  }
+
+  private schedule(api: GridApi): void {
+    if (!this.loading) {
+      return
+    }
+    this.timer = setTimeout(() => {
+      this.timer = undefined
+      this.addChunk(api)
+    }, 0)
+  }
+
+  private addChunk(api: GridApi): void {
+    if (!this.loading) {
+      return
+    }
+    const end = Math.min(this.loaded + CHUNK_ROWS, this.total)
+    const rows = arrowTableToRows(this.table.slice(this.loaded, end))
+    this.loaded = end
+
+    api.applyTransactionAsync({ add: rows })
+    if (this.loaded >= this.total) {
+      api.flushAsyncTransactions()
+    }
+    this.onProgress(this.loaded, this.total)
+    this.schedule(api)
+  }
+}
@@ -0,0 +1,149 @@
+import { Column, GridApi, IRowNode } from "ag-grid-community"
+
+// Events after which the rows matching the current query must be searched again
+const ROWS_CHANGED_EVENTS = [
+  "rowDataUpdated",
+  "asyncTransactionsFlushed",
+  "displayedColumnsChanged",
+]
+
+function queryWords(query: string): string[] {
+  return query.toLowerCase().split(" ").filter((word) => word.length > 0)
+}
+
+/**
+ * Toolbar quick search, applied as the grid's external filter.
+ *
+ * Each row is turned once into a lowercased string of its values, later
+ * searches only look for the query words in it. Rows matching the query are
+ * kept, so a query narrowing the previous one (e.g. typing one more letter)
+ * only searches the previous matches.
+ *
+ * Row text is built like AG Grid's quick filter text: the value of each
+ * displayed column (all columns with includeHiddenColumnsInQuickFilter),
+ * or colDef.getQuickFilterText when defined. A row matches when it contains
+ * every word of the query.
+ */
+export class QuickSearchIndex {
+  private api: GridApi | undefined = undefined
+  private texts: WeakMap<IRowNode, string> = new WeakMap()
+  // Columns searched, undefined until the next row text is built
+  private columns: Column[] | undefined = undefined
+  private words: string[] = []
+  // Rows matching words, undefined when they must be searched again
+  private matches: IRowNode[] | undefined = undefined
+  private matchSet: Set<IRowNode> = new Set()
+
+  get active(): boolean {
+    return this.words.length > 0
+  }
+
+  attach(api: GridApi): void {
+    this.api = api
+    ROWS_CHANGED_EVENTS.forEach((eventName) =>
+      api.addEventListener(eventName as any, () => {
+        this.texts = new WeakMap()
+        this.columns = undefined
+        this.matches = undefined
+      })
+    )
+    api.addEventListener("cellValueChanged", (e: any) => {
+      this.texts.delete(e.node)
+      this.matches = undefined
+    })
+  }
+
+  /**
+   * Searches the rows for query, the grid must then be refiltered with onFilterChanged
+   */
+  search(api: GridApi, query: string): void {
+    const previousWords = this.words
+    this.words = queryWords(query)
+    if (!this.active) {
+      this.matches = undefined
+      this.matchSet = new Set()
+      return
+    }
+
+    // Rows matching the new query are among the previous matches when every
+    // previous word is part of a new word
+    const previousMatches = this.matches
+    const narrowing =
+      previousMatches !== undefined &&
+      previousWords.length > 0 &&
+      previousWords.every((previous) =>
+        this.words.some((word) => word.includes(previous))
+      )
+
+    const matches: IRowNode[] = []
+    if (narrowing && previousMatches !== undefined) {
+      previousMatches.forEach((node) => {
+        if (this.rowMatches(node)) {
+          matches.push(node)
+        }
+      })
+    } else {
+      api.forEachLeafNode((node) => {
+        if (this.rowMatches(node)) {
+          matches.push(node)
+        }
+      })
+    }
+    this.matches = matches
+    this.matchSet = new Set(matches)
+  }
+
+  passes(node: IRowNode): boolean {
+    if (this.matches === undefined) {
+      // Rows changed since the last search
+      return this.rowMatches(node)
+    }
+    return this.matchSet.has(node)
+  }
+
+  private rowMatches(node: IRowNode): boolean {
+    const text = this.rowText(node)
+    return this.words.every((word) => text.includes(word))
+  }
+
+  private rowText(node: IRowNode): string {
+    let text = this.texts.get(node)
+    if (text === undefined) {
+      const api = this.api
+      if (api === undefined) {
+        return ""
+      }
+      const parts: string[] = []
+      this.searchedColumns(api).forEach((column) => {
+        const colDef = column.getColDef()
+        let value = api.getCellValue({ rowNode: node, colKey: column })
+        if (colDef.getQuickFilterText) {
+          value = colDef.getQuickFilterText({
+            value: value,
+            node: node,
+            data: node.data,
+            column: column,
+            colDef: colDef,
+            api: api,
+            context: api.getGridOption("context"),
+          })
+        }
+        if (value !== null && value !== undefined) {
+          parts.push(String(value).toLowerCase())
+        }
+      })
+      text = parts.join("\n")
+      this.texts.set(node, text)
+    }
+    return text
+  }
+
+  private searchedColumns(api: GridApi): Column[] {
+    if (this.columns === undefined) {
+      this.columns = api.getGridOption("includeHiddenColumnsInQuickFilter")
+        ? api.getColumns() || []
+        : api.getAllDisplayedColumns()
+    }
+    return this.columns
+  }
+}
@@ -0,0 +1,27 @@
+/**
+ * Run-length encoding of increasing integer positions as half-open ranges.
+ *
+ * Positions are appended in ascending order and stored as a flat
+ * [start0, end0, start1, end1, ...] array, so selecting every row of a grid
+ * costs two numbers instead of one flag per node.
+ */
+export class RangeEncoder {
+  private ranges: number[] = []
+
+  add(position: number): void {
+    const last = this.ranges.length - 1
+    if (last > 0 && this.ranges[last] === position) {
+      this.ranges[last] = position + 1
+    } else {
+      this.ranges.push(position, position + 1)
+    }
+  }
+
+  get isEmpty(): boolean {
+    return this.ranges.length === 0
+  }
+
+  toArray(): number[] {
+    return this.ranges
+  }
+}
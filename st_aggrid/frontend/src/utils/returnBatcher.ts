@@ -0,0 +1,98 @@
+export interface BatchInfo {
+  size: number
+  events: { [eventName: string]: number }
+}
+
+type FlushCallback = (
+  eventData: any,
+  eventName: string,
+  batch: BatchInfo
+) => void
+
+export function mergeBatches(a: BatchInfo, b: BatchInfo): BatchInfo {
+  const events = { ...a.events }
+  for (const eventName in b.events) {
+    events[eventName] = (events[eventName] || 0) + b.events[eventName]
+  }
+  return { size: a.size + b.size, events: events }
+}
+
+// Grid operations that fire one event per cell, returns are held until they end
+export const BULK_OPERATIONS: [string, string][] = [
+  ["pasteStart", "pasteEnd"],
+  ["fillStart", "fillEnd"],
+  ["undoStarted", "undoEnded"],
+  ["redoStarted", "redoEnded"],
+]
+
+/**
+ * Coalesces grid events into a single return to Streamlit.
+ *
+ * Events are collected until the next animation frame, or until the
+ * surrounding bulk operation (paste, fill handle, undo/redo) ends, and are
+ * flushed as one return for the last event with a summary of the batch.
+ */
+export class ReturnBatcher {
+  private flushCallback: FlushCallback
+  private lastEvent: any = undefined
+  private lastEventName: string | undefined = undefined
+  private events: { [eventName: string]: number } = {}
+  private size: number = 0
+  private openOperations: number = 0
+  private scheduled: boolean = false
+
+  constructor(flushCallback: FlushCallback) {
+    this.flushCallback = flushCallback
+  }
+
+  push(eventData: any, eventName: string): void {
+    this.lastEvent = eventData
+    this.lastEventName = eventName
+    this.events[eventName] = (this.events[eventName] || 0) + 1
+    this.size++
+    this.schedule()
+  }
+
+  beginOperation(): void {
+    this.openOperations++
+  }
+
+  endOperation(): void {
+    this.openOperations = Math.max(0, this.openOperations - 1)
+    this.schedule()
+  }
+
+  private schedule(): void {
+    if (this.scheduled || this.openOperations > 0 || this.size === 0) {
+      return
+    }
+    this.scheduled = true
+
+    const run = () => {
+      this.scheduled = false
+      this.flush()
+    }
+    if (typeof window.requestAnimationFrame === "function") {
+      window.requestAnimationFrame(run)
+    } else {
+      setTimeout(run, 0)
+    }
+  }
+
+  private flush(): void {
+    if (this.openOperations > 0 || this.size === 0) {
+      return
+    }
+
+    const batch: BatchInfo = { size: this.size, events: this.events }
+    const eventData = this.lastEvent
+    const eventName = this.lastEventName as string
+
+    this.lastEvent = undefined
+    this.lastEventName = undefined
+    this.events = {}
+    this.size = 0
+
+    this.flushCallback(eventData, eventName, batch)
+  }
+}
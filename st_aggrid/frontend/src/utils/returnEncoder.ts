@@ -0,0 +1,132 @@
+import { compressPayload, encodePayload } from "./payloadEncoding"
+
+interface PendingEncode {
+  resolve: (payload: Uint8Array) => void
+  reject: (error: Error) => void
+}
+
+/**
+ * Web Worker gzip compressing payloads, shared by every grid of the iframe.
+ *
+ * Payloads are transferred to the worker and back without copy.
+ */
+class CompressionWorker {
+  public users: number = 0
+  private worker: Worker | undefined = undefined
+  private ready: boolean = false
+  private nextId: number = 0
+  private pending: Map<number, PendingEncode> = new Map()
+
+  constructor() {
+    try {
+      this.worker = new Worker(
+        new URL("../workers/returnEncoder.worker.ts", import.meta.url)
+      )
+      this.worker.onmessage = (event: MessageEvent) => this.onMessage(event)
+      this.worker.onerror = () => this.terminate()
+    } catch (error) {
+      this.worker = undefined
+    }
+  }
+
+  get available(): boolean {
+    return this.worker !== undefined && this.ready
+  }
+
+  compress(payload: Uint8Array, compressionThreshold: number): Promise<Uint8Array> {
+    const worker = this.worker as Worker
+    return new Promise((resolve, reject) => {
+      const id = this.nextId++
+      this.pending.set(id, { resolve, reject })
+      worker.postMessage({ id, payload, compressionThreshold }, [
+        payload.buffer,
+      ])
+    })
+  }
+
+  terminate(): void {
+    this.worker?.terminate()
+    this.worker = undefined
+    this.ready = false
+    this.pending.forEach(({ reject }) =>
+      reject(new Error("Return encoder worker stopped"))
+    )
+    this.pending.clear()
+  }
+
+  private onMessage(event: MessageEvent): void {
+    const { id, ready, payload, error } = event.data
+    if (ready) {
+      this.ready = true
+      return
+    }
+
+    const request = this.pending.get(id)
+    if (!request) {
+      return
+    }
+    this.pending.delete(id)
+    if (error !== undefined) {
+      request.reject(new Error(error))
+    } else {
+      request.resolve(payload)
+    }
+  }
+}
+
+// Started by the first grid, stopped when the last one unmounts
+let sharedWorker: CompressionWorker | undefined = undefined
+
+/**
+ * Encodes grid returns, keeping the grid responsive while large returns are
+ * prepared.
+ *
+ * Returns are written to a single binary payload on the main thread, numeric
+ * leaf columns are copied into it as they are. Payloads over the compression
+ * threshold are then transferred whole to the shared worker and gzip
+ * compressed there. Until the worker reported it is ready, or when workers
+ * are not available, they are compressed on the main thread.
+ */
+export class ReturnEncoder {
+  private worker: CompressionWorker | undefined
+
+  constructor() {
+    if (!sharedWorker) {
+      sharedWorker = new CompressionWorker()
+    }
+    sharedWorker.users++
+    this.worker = sharedWorker
+  }
+
+  async encode(
+    value: any,
+    compressionThreshold?: number | null
+  ): Promise<Uint8Array> {
+    const payload = encodePayload(value)
+    const worker = this.worker
+    if (
+      !worker?.available ||
+      compressionThreshold === null ||
+      compressionThreshold === undefined ||
+      payload.length < compressionThreshold
+    ) {
+      return compressPayload(payload, compressionThreshold)
+    }
+    return worker.compress(payload, compressionThreshold)
+  }
+
+  terminate(): void {
+    const worker = this.worker
+    if (!worker) {
+      return
+    }
+    this.worker = undefined
+    worker.users--
+    if (worker.users === 0) {
+      worker.terminate()
+      if (sharedWorker === worker) {
+        sharedWorker = undefined
+      }
+    }
+  }
+}
@@ -0,0 +1,142 @@
+import { BatchInfo, mergeBatches } from "./returnBatcher"
+
+interface PendingReturn {
+  eventData: any
+  eventName: string
+  batch: BatchInfo
+}
+
+type SendCallback = (
+  eventData: any,
+  eventName: string,
+  batch: BatchInfo,
+  returnSeq: number
+) => Promise<boolean>
+
+type LostCallback = (eventData: any, eventName: string, batch: BatchInfo) => void
+
+// Bounds for the delay applied before sending returns collapsed while a rerun was running
+const MAX_FLUSH_DELAY_MS = 500
+const LATENCY_DELAY_FACTOR = 0.25
+// A return not acknowledged after this long is considered lost
+const IN_FLIGHT_TIMEOUT_MS = 10000
+
+/**
+ * Backpressure between grid returns and Streamlit reruns.
+ *
+ * Only one return is in flight at a time. Each return gets a sequence number,
+ * Python echoes the last one it received in the component args and the
+ * return is acknowledged when its number comes back. Everything submitted
+ * meanwhile is collapsed into a single return collected from the latest grid
+ * state. That return is sent after a delay that follows the measured rerun
+ * latency. A return not acknowledged in time is taken as lost and handed to
+ * lostCallback, unless a newer return is waiting to be sent.
+ */
+export class ReturnFlowControl {
+  private sendCallback: SendCallback
+  private lostCallback: LostCallback | undefined
+  private inFlight: boolean = false
+  // Starts at the mount time so numbers of a previous mount aren't taken for this one's
+  private seq: number = Date.now()
+  private sentAt: number = 0
+  private latency: number | undefined = undefined
+  private pending: PendingReturn | undefined = undefined
+  private timer: ReturnType<typeof setTimeout> | undefined = undefined
+
+  constructor(sendCallback: SendCallback, lostCallback?: LostCallback) {
+    this.sendCallback = sendCallback
+    this.lostCallback = lostCallback
+  }
+
+  /**
+   * Average rerun latency in ms (exponentially weighted), undefined until measured
+   */
+  get rerunLatency(): number | undefined {
+    return this.latency
+  }
+
+  submit(eventData: any, eventName: string, batch: BatchInfo): void {
+    this.pending = {
+      eventData: eventData,
+      eventName: eventName,
+      batch: this.pending ? mergeBatches(this.pending.batch, batch) : batch,
+    }
+
+    if (!this.inFlight && this.timer === undefined) {
+      this.flush()
+    }
+  }
+
+  /**
+   * Acknowledges the return in flight if it is the one numbered returnSeq
+   */
+  acknowledgeSeq(returnSeq: number): void {
+    if (this.inFlight && returnSeq === this.seq) {
+      this.acknowledge()
+    }
+  }
+
+  acknowledge(measureLatency: boolean = true): void {
+    if (!this.inFlight) {
+      return
+    }
+    this.inFlight = false
+
+    if (measureLatency) {
+      const elapsed = Date.now() - this.sentAt
+      this.latency =
+        this.latency === undefined ? elapsed : 0.7 * this.latency + 0.3 * elapsed
+    }
+
+    if (this.pending && this.timer === undefined) {
+      const delay = Math.min(
+        MAX_FLUSH_DELAY_MS,
+        (this.latency || 0) * LATENCY_DELAY_FACTOR
+      )
+      this.timer = setTimeout(() => {
+        this.timer = undefined
+        this.flush()
+      }, delay)
+    }
+  }
+
+  private async flush(): Promise<void> {
+    const pending = this.pending
+    if (!pending || this.inFlight) {
+      return
+    }
+    this.pending = undefined
+
+    // Marked in flight before collecting, so events fired meanwhile are collapsed
+    this.inFlight = true
+    this.sentAt = Date.now()
+    this.seq += 1
+
+    let sent = false
+    try {
+      sent = await this.sendCallback(
+        pending.eventData,
+        pending.eventName,
+        pending.batch,
+        this.seq
+      )
+    } finally {
+      if (!sent) {
+        this.inFlight = false
+        if (this.pending) {
+          this.flush()
+        }
+      } else {
+        const sentAt = this.sentAt
+        setTimeout(() => {
+          if (this.inFlight && this.sentAt === sentAt) {
+            this.acknowledge(false)
+            if (!this.pending) {
+              this.lostCallback?.(pending.eventData, pending.eventName, pending.batch)
+            }
+          }
+        }, IN_FLIGHT_TIMEOUT_MS)
+      }
+    }
+  }
+}
@@ -0,0 +1,19 @@
+/* eslint-disable no-restricted-globals */
+import { compressPayload } from "../utils/payloadEncoding"
+
+// Compresses encoded grid returns off the main thread, see utils/returnEncoder.ts
+const ctx: any = self
+
+ctx.onmessage = async (event: MessageEvent) => {
+  const { id, payload: encoded, compressionThreshold } = event.data
+  try {
+    const payload = await compressPayload(encoded, compressionThreshold)
+    ctx.postMessage({ id, payload }, [payload.buffer])
+  } catch (error) {
+    ctx.postMessage({ id, error: String(error) })
+  }
+}
+
+ctx.postMessage({ ready: true })
+
+export {}
@@ -0,0 +1,74 @@
+"""
+Decoding of binary grid returns.
+
+Large returns are encoded by the grid as a single binary payload (see
+``frontend/src/utils/payloadEncoding.ts``)::
+
+    b"AGR1" | header length (uint32 LE) | JSON header | padding | buffers
+
+Numeric columns are stored in the buffer region and referenced from the
+header by ``{"__buffer__": [offset, length, dtype]}``; they are read back as
+NumPy arrays without copy. Payloads over the compression threshold are
+gzip compressed as a whole.
+
+Returns of grids rendered in an ``AgGridLayout`` carry the key of the grid
+that sent them: binary payloads are prefixed with
+``b"AGL1" | key length (uint32 LE) | key``, other values are wrapped in
+``{"__grid_key__": key, "value": value}``.
+"""
+
+import gzip
+import json
+
+import numpy as np
+
+_MAGIC = b"AGR1"
+_GZIP_MAGIC = b"\x1f\x8b"
+_BUFFER_KEY = "__buffer__"
+_LAYOUT_MAGIC = b"AGL1"
+_LAYOUT_KEY = "__grid_key__"
+
+
+def _align8(n):
+    return (n + 7) & ~7
+
+
+def decode_component_value(value):
+    """Decode a binary grid return, other component values are returned unchanged."""
+    if not isinstance(value, (bytes, bytearray, memoryview)):
+        return value
+
+    if bytes(value[:2]) == _GZIP_MAGIC:
+        value = gzip.decompress(value)
+
+    payload = memoryview(value)
+    if bytes(payload[:4]) != _MAGIC:
+        raise ValueError("Unknown grid return payload format.")
+
+    header_length = int.from_bytes(payload[4:8], "little")
+    header_end = 8 + header_length
+    data_start = _align8(header_end)
+
+    def object_hook(obj):
+        if len(obj) == 1 and _BUFFER_KEY in obj:
+            offset, length, dtype = obj[_BUFFER_KEY]
+            return np.frombuffer(
+                payload, dtype=dtype, count=length, offset=data_start + offset
+            )
+        return obj
+
+    return json.loads(bytes(payload[8:header_end]), object_hook=object_hook)
+
+
+def split_layout_value(value):
+    """Grid key and value of a return sent through an AgGridLayout, ``(None, value)`` otherwise."""
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        payload = memoryview(value)
+        if bytes(payload[:4]) != _LAYOUT_MAGIC:
+            return None, value
+        key_end = 8 + int.from_bytes(payload[4:8], "little")
+        return bytes(payload[8:key_end]).decode("utf-8"), payload[key_end:]
+
+    if isinstance(value, dict) and _LAYOUT_KEY in value:
+        return value[_LAYOUT_KEY], value.get("value")
+    return None, value
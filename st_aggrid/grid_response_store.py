@@ -0,0 +1,394 @@
+"""
+Compact, NumPy backed storage for grid responses.
+
+The component returns one dict per grid node. Keeping that list around in
+``st.session_state`` for every grid of every session is what dominates server
+memory on large grids, so responses are turned into a few flat arrays plus a
+single DataFrame for leaf data as soon as they arrive.
+"""
+
+import threading
+import weakref
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+# isSelected values, AgGrid sends undefined for half-selected groups
+SELECTED = 1
+NOT_SELECTED = 0
+UNDEFINED = -1
+
+# Row id indexes kept per session by ViewCache
+ID_INDEX_CACHE_SIZE = 4
+
+
+class CompactNodes:
+    """Columnar representation of the ``nodes`` list of a grid response.
+
+    Selection is either read from each node's ``isSelected`` flag or, when the
+    grid sends them, from ``selected_ranges``/``indeterminate_ranges``: flat
+    ``[start, end, ...]`` lists of half-open node position ranges.
+
+    Leaf data is either read from each node's ``data`` or from
+    ``leaf_columns``, a dict of column name to the values of every leaf node.
+    """
+
+    def __init__(
+        self,
+        nodes,
+        selected_ranges=None,
+        indeterminate_ranges=None,
+        leaf_columns=None,
+    ):
+        nodes = nodes or []
+
+        self.ids = np.array([n.get("id") for n in nodes], dtype=object)
+        self.is_group = np.fromiter(
+            (bool(n.get("group", False)) for n in nodes), dtype=bool, count=len(nodes)
+        )
+        if selected_ranges is None and indeterminate_ranges is None:
+            self.selected = np.fromiter(
+                (_encode_selected(n.get("isSelected")) for n in nodes),
+                dtype=np.int8,
+                count=len(nodes),
+            )
+        else:
+            self.selected = np.full(len(nodes), NOT_SELECTED, dtype=np.int8)
+            self.selected[ranges_to_mask(indeterminate_ranges, len(nodes))] = UNDEFINED
+            self.selected[ranges_to_mask(selected_ranges, len(nodes))] = SELECTED
+        self.row_index = np.array(
+            [n.get("rowIndex") for n in nodes], dtype=float
+        )
+
+        # Group nodes are few, keep only their key tuples
+        self.group_keys = {
+            n.get("id"): tuple(n["groupKeys"])
+            for n in nodes
+            if n.get("group", False) and "groupKeys" in n
+        }
+
+        # Leaves reference their group by the group node's integer groupRef
+        group_ids = {
+            n["groupRef"]: n.get("id")
+            for n in nodes
+            if n.get("group", False) and "groupRef" in n
+        }
+
+        leaves = [n for n in nodes if not n.get("group", False)]
+        self.leaf_positions = np.flatnonzero(~self.is_group)
+        self.leaf_parents = np.array(
+            [_leaf_parent(n, group_ids) for n in leaves], dtype=object
+        )
+        if leaf_columns is not None:
+            self.leaf_data = pd.DataFrame(
+                {name: _restore_ints(values) for name, values in leaf_columns.items()},
+                index=range(len(leaves)),
+            )
+        else:
+            self.leaf_data = pd.DataFrame(
+                [n.get("data", {}) for n in leaves], dtype=object
+            ).infer_objects()
+
+    def __len__(self):
+        return len(self.ids)
+
+    @property
+    def leaf_selected(self):
+        """isSelected codes of leaf nodes, aligned with ``leaf_data`` rows."""
+        return self.selected[self.leaf_positions]
+
+    def selected_ids(self):
+        """Ids of the selected nodes, in grid order."""
+        return self.ids[self.selected == SELECTED].tolist()
+
+    @property
+    def has_groups(self):
+        return bool(self.is_group.any())
+
+    @property
+    def nbytes(self):
+        """Approximate memory held by this object."""
+        return int(
+            self.ids.nbytes
+            + self.is_group.nbytes
+            + self.selected.nbytes
+            + self.row_index.nbytes
+            + self.leaf_positions.nbytes
+            + self.leaf_parents.nbytes
+            + self.leaf_data.memory_usage(index=True, deep=True).sum()
+        )
+
+    def to_nodes(self):
+        """Rebuild the original list of node dicts (slow, for backwards compatibility)."""
+        records = self.leaf_data.to_dict(orient="records")
+        leaf_of = np.full(len(self.ids), -1)
+        leaf_of[self.leaf_positions] = np.arange(len(self.leaf_positions))
+
+        nodes = []
+        for i, node_id in enumerate(self.ids):
+            row_index = self.row_index[i]
+            node = {
+                "id": node_id,
+                "rowIndex": None if np.isnan(row_index) else int(row_index),
+                "group": bool(self.is_group[i]),
+                "isSelected": _decode_selected(self.selected[i]),
+            }
+            if self.is_group[i]:
+                node["data"] = {}
+                if node_id in self.group_keys:
+                    node["groupKeys"] = list(self.group_keys[node_id])
+            else:
+                leaf = leaf_of[i]
+                node["data"] = records[leaf]
+                if self.leaf_parents[leaf]:
+                    node["parentId"] = self.leaf_parents[leaf]
+            nodes.append(node)
+        return nodes
+
+
+class ViewCache:
+    """Per-session LRU of materialized views (``data``, ``selected_data``...).
+
+    Views are owned by ``AgGridReturn`` objects and are only weakly referenced
+    here. When the total size of cached views goes over ``max_bytes``, the
+    least recently used views are dropped and will be rebuilt from the compact
+    response on next access.
+    """
+
+    def __init__(self, max_bytes=None):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._nbytes = 0
+        self._lock = threading.Lock()
+        self._id_indexes = OrderedDict()
+
+    @property
+    def nbytes(self):
+        return self._nbytes
+
+    def touch(self, owner, name):
+        with self._lock:
+            key = (id(owner), name)
+            if key in self._entries:
+                self._entries.move_to_end(key)
+
+    def add(self, owner, name, value):
+        nbytes = _view_nbytes(value)
+        with self._lock:
+            key = (id(owner), name)
+            self._discard(key)
+            self._entries[key] = (weakref.ref(owner), name, nbytes)
+            self._nbytes += nbytes
+            self._evict()
+
+    def id_index(self, key, index):
+        """Returns the row id index cached under ``key``, or caches ``index`` there.
+
+        ``key`` identifies the rows (dataset hash and row count). The cached
+        ``pd.Index`` is reused only when it holds the same ids in the same
+        order, its hash table is built once and reused by later reruns.
+        """
+        with self._lock:
+            cached = self._id_indexes.get(key)
+            if cached is not None:
+                self._id_indexes.move_to_end(key)
+                if cached.equals(index):
+                    return cached
+
+            self._id_indexes[key] = index
+            while len(self._id_indexes) > ID_INDEX_CACHE_SIZE:
+                self._id_indexes.popitem(last=False)
+            return index
+
+    def discard(self, owner, name):
+        with self._lock:
+            self._discard((id(owner), name))
+
+    def _discard(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._nbytes -= entry[2]
+
+    def _evict(self):
+        # Drop entries whose owner is gone, then the oldest ones
+        for key, (ref, _, _) in list(self._entries.items()):
+            if ref() is None:
+                self._discard(key)
+
+        if self.max_bytes is None:
+            return
+
+        while self._nbytes > self.max_bytes and self._entries:
+            _, (ref, name, nbytes) = self._entries.popitem(last=False)
+            self._nbytes -= nbytes
+            owner = ref()
+            if owner is not None:
+                owner._views.pop(name, None)
+
+
+class GridStateStore:
+    """Last full grid and column state of each grid in a session.
+
+    After its first return the grid only sends the state slices changed by
+    the triggering events. They are merged here into the last full state,
+    keyed by a per mount token chosen by the grid. Tokens whose state is
+    known to be complete are sent back to the grid, which sends its full
+    state again when its token is missing (first return, lost session, or a
+    gap in the sequence numbers).
+    """
+
+    def __init__(self, max_grids=32):
+        self.max_grids = max_grids
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def known_tokens(self):
+        with self._lock:
+            return [token for token, entry in self._entries.items() if entry["complete"]]
+
+    def merge(self, token, seq, full, grid_state, columns_state):
+        """Merge a state slice into the stored state, returns the merged ``(grid_state, columns_state)``."""
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is not None and entry["seq"] == seq:
+                # Same component value read again by a later rerun
+                self._entries.move_to_end(token)
+                return entry["gridState"], entry["columnsState"]
+
+            if full or entry is None:
+                merged, base_columns = {}, None
+                complete = bool(full)
+            else:
+                merged, base_columns = dict(entry["gridState"]), entry["columnsState"]
+                complete = entry["complete"] and seq == entry["seq"] + 1
+
+            # null values mark state removed since the last return (e.g. cleared filter)
+            for name, value in (grid_state or {}).items():
+                if value is None:
+                    merged.pop(name, None)
+                else:
+                    merged[name] = value
+            if columns_state is None:
+                columns_state = base_columns
+
+            self._entries[token] = {
+                "seq": seq,
+                "complete": complete,
+                "gridState": merged,
+                "columnsState": columns_state,
+            }
+            self._entries.move_to_end(token)
+            while len(self._entries) > self.max_grids:
+                self._entries.popitem(last=False)
+
+            return merged, columns_state
+
+
+class EditsStore:
+    """Cells edited in each grid of a session (DataReturnMode.EDITS).
+
+    The grid numbers its edits from 0 since it was mounted and sends every
+    edit Python hasn't acknowledged yet, with the number of the first one.
+    Edits are accumulated here under the grid's per mount token, so ``data``
+    can apply every edit made since the grid was mounted (or got new data).
+    Edits sent again, by a return repeating a lost one or by a rerun reading
+    the same component value, are not added twice.
+    """
+
+    def __init__(self, max_grids=32):
+        self.max_grids = max_grids
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def merge(self, token, start, edits):
+        """Add edit records numbered from ``start``, returns every edit record received for ``token``.
+
+        ``token`` is any hashable identifying the grid and its dataset.
+        """
+        edits = edits or []
+        start = start or 0
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is None:
+                # Edits before start were acknowledged to an earlier (evicted) entry
+                entry = {"next": start, "edits": []}
+                self._entries[token] = entry
+
+            # Skip the edits already received
+            skip = max(entry["next"] - start, 0)
+            entry["edits"].extend(edits[skip:])
+            entry["next"] = max(entry["next"], start + len(edits))
+            self._entries.move_to_end(token)
+            while len(self._entries) > self.max_grids:
+                self._entries.popitem(last=False)
+
+            return list(entry["edits"])
+
+
+def ranges_to_mask(ranges, length):
+    """Boolean mask of ``length`` items from a flat ``[start, end, ...]`` range list."""
+    if not ranges:
+        return np.zeros(length, dtype=bool)
+
+    bounds = np.asarray(ranges, dtype=np.int64).reshape(-1, 2)
+    bounds = np.clip(bounds, 0, length)
+
+    # +1 at each start, -1 at each end, a position is inside a range while the sum is positive
+    steps = np.zeros(length + 1, dtype=np.int64)
+    np.add.at(steps, bounds[:, 0], 1)
+    np.add.at(steps, bounds[:, 1], -1)
+    return np.cumsum(steps[:-1]) > 0
+
+
+def _view_nbytes(value):
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=True).sum())
+    if isinstance(value, (str, bytes)):
+        return len(value)
+    if isinstance(value, (list, tuple)):
+        return sum(_view_nbytes(v) for v in value)
+    if isinstance(value, dict):
+        return sum(_view_nbytes(v) for v in value.values())
+    return 0
+
+
+def _restore_ints(values):
+    """Binary payloads send numbers as float64, turn integral columns back to int64 as JSON would."""
+    if not isinstance(values, np.ndarray) or values.dtype.kind != "f" or not len(values):
+        return values
+    if (
+        np.isfinite(values).all()
+        and (values == np.trunc(values)).all()
+        and np.abs(values).max() <= 2**53
+    ):
+        return values.astype(np.int64)
+    return values
+
+
+def _encode_selected(value):
+    if value is True:
+        return SELECTED
+    if value is False:
+        return NOT_SELECTED
+    return UNDEFINED
+
+
+def _decode_selected(code):
+    if code == SELECTED:
+        return True
+    if code == NOT_SELECTED:
+        return False
+    return None
+
+
+def _leaf_parent(node, group_ids):
+    """Parent group id of a leaf node, falling back to the legacy parentId/parentPath."""
+    parent_ref = node.get("parentRef")
+    if parent_ref is not None:
+        return group_ids.get(parent_ref, "")
+
+    parent_id = node.get("parentId")
+    if parent_id is not None:
+        return parent_id
+    return node.get("parentPath", "")
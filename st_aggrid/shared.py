@@ -98,6 +98,7 @@ class DataReturnMode(str, Enum):
     FILTERED_AND_SORTED = "FILTERED_AND_SORTED"
     MINIMAL = "MINIMAL"
     CUSTOM = "CUSTOM"
+    EDITS = "EDITS"
 
 
 class ColumnsAutoSizeMode(IntEnum):
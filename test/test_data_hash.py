@@ -0,0 +1,85 @@
+import sys
+from unittest import mock
+
+import pandas as pd
+import pytest
+import streamlit as st
+
+from st_aggrid import AgGrid
+
+aggrid_module = sys.modules["st_aggrid.AgGrid"]
+
+
+def script_run_ctx(suppress_warning=False):
+    """Stands in for the script run context, so grids get their session objects."""
+    return object()
+
+
+@pytest.fixture
+def render():
+    """Renders a grid with a fake component, returns its component args."""
+    renders = []
+
+    def component_func(**kwargs):
+        renders.append(kwargs)
+        return None
+
+    def _render(data, **kwargs):
+        AgGrid(data, **kwargs)
+        return renders[-1]
+
+    with mock.patch.object(aggrid_module, "_component_func", component_func), mock.patch.object(
+        st, "session_state", {}
+    ), mock.patch.object(aggrid_module, "get_script_run_ctx", script_run_ctx):
+        yield _render
+
+
+def test_data_hash_is_stable(render):
+    df = pd.DataFrame({"a": [1, 2, 3], "b": ["x", "y", "z"]})
+    assert render(df)["data_hash"] == render(df.copy())["data_hash"]
+
+
+@pytest.mark.parametrize(
+    "change",
+    [
+        lambda df: df.rename(columns={"a": "c"}),
+        lambda df: df.astype({"a": "float64"}),
+        lambda df: df.set_axis([10, 11, 12]),
+        lambda df: df.iloc[::-1].reset_index(drop=True),
+    ],
+    ids=["renamed columns", "dtypes", "index", "row order"],
+)
+def test_data_hash_changes(render, change):
+    df = pd.DataFrame({"a": [1, 2, 3], "b": ["x", "y", "z"]})
+    assert render(df)["data_hash"] != render(change(df))["data_hash"]
+
+
+def test_browser_cache_skips_small_data(render):
+    df = pd.DataFrame({"a": [1, 2, 3]})
+    args = render(df, key="grid", browser_cache=True)
+    assert args["browser_cache_max_bytes"] is None
+    assert args["data"] is not None
+
+
+def grid_return(args, value):
+    """Simulates the grid sending a return, which runs its on_change callback."""
+    st.session_state[args["key"]] = value
+    args["on_change"]()
+
+
+def test_browser_cache_sends_data_once(render):
+    df = pd.DataFrame({"a": range(200_000)})
+    args = render(df, key="grid", browser_cache=True)
+
+    # Sent until the grid reported the data stored in the browser cache
+    args = render(df, key="grid", browser_cache=True)
+    assert not args["data_cached"]
+    assert args["data"] is not None
+
+    grid_return(args, {"returnSeq": 1, "dataCacheHash": args["data_hash"]})
+    args = render(df, key="grid", browser_cache=True)
+    assert args["data_cached"]
+    assert args["data"] is None
+
+    args = render(df.rename(columns={"a": "b"}), key="grid", browser_cache=True)
+    assert not args["data_cached"]
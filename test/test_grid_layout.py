@@ -0,0 +1,102 @@
+import sys
+from unittest import mock
+
+import pandas as pd
+import pytest
+import streamlit as st
+
+from st_aggrid import AgGrid, AgGridLayout
+
+aggrid_module = sys.modules["st_aggrid.AgGrid"]
+
+
+def script_run_ctx(suppress_warning=False):
+    """Stands in for the script run context, so grids get their session objects."""
+    return object()
+
+
+@pytest.fixture
+def component():
+    """Replaces the component, returns the args of each render and the session state."""
+    renders = []
+    session_state = {}
+
+    def component_func(**kwargs):
+        renders.append(kwargs)
+        return None
+
+    with mock.patch.object(aggrid_module, "_component_func", component_func), mock.patch.object(
+        st, "session_state", session_state
+    ), mock.patch.object(aggrid_module, "get_script_run_ctx", script_run_ctx):
+        yield renders, session_state
+
+
+def render_layout(orders, customers, callback=None):
+    with AgGridLayout(key="dashboard", columns=2):
+        AgGrid(orders, key="orders", callback=callback)
+        AgGrid(customers, key="customers")
+
+
+@pytest.fixture
+def frames():
+    return pd.DataFrame({"order": [1, 2]}), pd.DataFrame({"customer": ["a", "b", "c"]})
+
+
+def test_layout_renders_grids_in_one_component(component, frames):
+    renders, _ = component
+    render_layout(*frames)
+
+    assert len(renders) == 1
+    args = renders[0]
+    assert args["key"] == "dashboard"
+    assert args["layout_columns"] == 2
+    assert [g["grid_key"] for g in args["layout_grids"]] == ["orders", "customers"]
+
+    # DataFrames are hoisted to top level args, suffixed with the grid key
+    orders_spec = args["layout_grids"][0]
+    assert "data" in orders_spec["hoisted_args"]
+    assert "data" not in orders_spec
+    assert args["data::orders"]["order"].tolist() == [1, 2]
+    assert args["data::customers"]["customer"].tolist() == ["a", "b", "c"]
+
+
+def test_layout_routes_returns_to_their_grid(component, frames):
+    renders, session_state = component
+    received = []
+    render_layout(*frames, callback=received.append)
+
+    session_state["dashboard"] = {
+        "__grid_key__": "orders",
+        "value": {"returnSeq": 3, "gridState": {"focus": 1}},
+    }
+    renders[-1]["on_change"]()
+
+    assert len(received) == 1
+    assert received[0].grid_state == {"focus": 1}
+    assert session_state["orders"] is received[0]
+    assert "customers" not in session_state
+
+    render_layout(*frames)
+    orders_spec, customers_spec = renders[-1]["layout_grids"]
+    assert orders_spec["ack_seq"] == 3
+    assert customers_spec["ack_seq"] is None
+
+
+def test_layout_requires_grid_keys(component, frames):
+    with pytest.raises(ValueError):
+        with AgGridLayout(key="dashboard"):
+            AgGrid(frames[0])
+
+
+def test_layout_rejects_duplicate_grid_keys(component, frames):
+    with pytest.raises(ValueError):
+        with AgGridLayout(key="dashboard"):
+            AgGrid(frames[0], key="orders")
+            AgGrid(frames[1], key="orders")
+
+
+def test_layout_can_not_be_nested(component):
+    with pytest.raises(ValueError):
+        with AgGridLayout(key="outer"):
+            with AgGridLayout(key="inner"):
+                pass
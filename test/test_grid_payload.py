@@ -0,0 +1,98 @@
+import gzip
+import json
+
+import numpy as np
+import pytest
+
+from st_aggrid.grid_payload import decode_component_value, split_layout_value
+
+
+def encode(header, buffers=()):
+    """Builds an AGR1 payload like the grid's encoder, buffers are referenced as "__buffer__" by index."""
+    data = b""
+    refs = []
+    for array in buffers:
+        refs.append([len(data), len(array), array.dtype.str])
+        data += array.tobytes()
+        data += b"\0" * (-len(data) % 8)
+
+    def resolve(value):
+        if isinstance(value, dict):
+            if set(value) == {"__buffer__"} and isinstance(value["__buffer__"], int):
+                return {"__buffer__": refs[value["__buffer__"]]}
+            return {k: resolve(v) for k, v in value.items()}
+        if isinstance(value, list):
+            return [resolve(v) for v in value]
+        return value
+
+    header_bytes = json.dumps(resolve(header)).encode("utf-8")
+    payload = b"AGR1" + len(header_bytes).to_bytes(4, "little") + header_bytes
+    payload += b"\0" * (-len(payload) % 8)
+    return payload + data
+
+
+def test_decode_passes_other_values_through():
+    value = {"gridState": {}}
+    assert decode_component_value(value) is value
+    assert decode_component_value(None) is None
+
+
+def test_decode_header_only():
+    assert decode_component_value(encode({"a": [1, "x"]})) == {"a": [1, "x"]}
+
+
+def test_decode_buffers():
+    numbers = np.array([1.5, 2.5, 3.5])
+    flags = np.array([1, 0, 1], dtype=np.uint8)
+    value = decode_component_value(
+        encode(
+            {"leafColumns": {"x": {"__buffer__": 0}, "y": {"__buffer__": 1}}, "n": 3},
+            [numbers, flags],
+        )
+    )
+
+    assert value["n"] == 3
+    np.testing.assert_array_equal(value["leafColumns"]["x"], numbers)
+    np.testing.assert_array_equal(value["leafColumns"]["y"], flags)
+    assert value["leafColumns"]["x"].dtype == numbers.dtype
+
+
+def test_decode_gzip():
+    payload = gzip.compress(encode({"a": 1}, [np.arange(4, dtype=np.float64)]))
+    value = decode_component_value(payload)
+    assert value["a"] == 1
+
+
+def test_decode_memoryview():
+    assert decode_component_value(memoryview(encode({"a": 1}))) == {"a": 1}
+
+
+def test_decode_unknown_format():
+    with pytest.raises(ValueError):
+        decode_component_value(b"XXXX\0\0\0\0")
+
+
+def test_split_layout_binary_value():
+    inner = encode({"a": 1})
+    key = "orders".encode("utf-8")
+    grid_key, value = split_layout_value(b"AGL1" + len(key).to_bytes(4, "little") + key + inner)
+
+    assert grid_key == "orders"
+    assert bytes(value) == inner
+    assert decode_component_value(value) == {"a": 1}
+
+
+def test_split_layout_dict_value():
+    assert split_layout_value({"__grid_key__": "orders", "value": {"a": 1}}) == (
+        "orders",
+        {"a": 1},
+    )
+
+
+@pytest.mark.parametrize(
+    "value",
+    [None, {"a": 1}, b"AGR1\0\0\0\0"],
+    ids=["none", "dict", "grid payload"],
+)
+def test_split_layout_other_values(value):
+    assert split_layout_value(value) == (None, value)
@@ -0,0 +1,272 @@
+import gc
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from st_aggrid.grid_response_store import (
+    NOT_SELECTED,
+    SELECTED,
+    UNDEFINED,
+    CompactNodes,
+    EditsStore,
+    GridStateStore,
+    ViewCache,
+    _restore_ints,
+    ranges_to_mask,
+)
+
+
+NODES = [
+    {"id": "g0", "group": True, "groupKeys": ["A"], "groupRef": 0, "isSelected": None},
+    {"id": "0", "rowIndex": 1, "parentRef": 0, "isSelected": True, "data": {"x": 1}},
+    {"id": "1", "rowIndex": 2, "parentRef": 0, "isSelected": False, "data": {"x": 2}},
+    {"id": "2", "rowIndex": 3, "isSelected": False, "data": {"x": 3}},
+]
+
+
+def test_compact_nodes_from_node_list():
+    nodes = CompactNodes(NODES)
+
+    assert len(nodes) == 4
+    assert nodes.has_groups
+    assert nodes.selected.tolist() == [UNDEFINED, SELECTED, NOT_SELECTED, NOT_SELECTED]
+    assert nodes.selected_ids() == ["0"]
+    assert nodes.group_keys == {"g0": ("A",)}
+    assert nodes.leaf_positions.tolist() == [1, 2, 3]
+    assert nodes.leaf_parents.tolist() == ["g0", "g0", ""]
+    assert nodes.leaf_data["x"].tolist() == [1, 2, 3]
+    assert nodes.leaf_selected.tolist() == [SELECTED, NOT_SELECTED, NOT_SELECTED]
+
+
+def test_compact_nodes_selection_ranges():
+    nodes = CompactNodes(
+        [{k: v for k, v in n.items() if k != "isSelected"} for n in NODES],
+        selected_ranges=[1, 2],
+        indeterminate_ranges=[0, 1],
+    )
+    assert nodes.selected.tolist() == [UNDEFINED, SELECTED, NOT_SELECTED, NOT_SELECTED]
+
+
+def test_compact_nodes_leaf_columns():
+    nodes = CompactNodes(
+        [{k: v for k, v in n.items() if k != "data"} for n in NODES],
+        leaf_columns={"x": np.array([1.0, 2.0, 3.0]), "y": ["a", "b", "c"]},
+    )
+    assert nodes.leaf_data["x"].dtype == np.int64
+    assert nodes.leaf_data.to_dict(orient="list") == {"x": [1, 2, 3], "y": ["a", "b", "c"]}
+
+
+def test_compact_nodes_legacy_parent_id():
+    nodes = CompactNodes([{"id": "0", "parentId": "row-group-A", "data": {}}])
+    assert nodes.leaf_parents.tolist() == ["row-group-A"]
+
+
+def test_compact_nodes_to_nodes():
+    rebuilt = CompactNodes(NODES).to_nodes()
+
+    assert [n["id"] for n in rebuilt] == ["g0", "0", "1", "2"]
+    assert rebuilt[0]["groupKeys"] == ["A"]
+    assert rebuilt[0]["isSelected"] is None
+    assert rebuilt[1] == {
+        "id": "0",
+        "rowIndex": 1,
+        "group": False,
+        "isSelected": True,
+        "data": {"x": 1},
+        "parentId": "g0",
+    }
+    assert "parentId" not in rebuilt[3]
+
+
+def test_compact_nodes_empty():
+    nodes = CompactNodes(None)
+    assert len(nodes) == 0
+    assert not nodes.has_groups
+    assert nodes.leaf_data.empty
+
+
+class Owner:
+    def __init__(self):
+        self._views = {}
+
+
+def cached(cache, owner, name, value):
+    owner._views[name] = value
+    cache.add(owner, name, value)
+
+
+def test_view_cache_evicts_least_recently_used():
+    frame = pd.DataFrame({"x": np.arange(100)})
+    size = int(frame.memory_usage(index=True, deep=True).sum())
+    cache = ViewCache(max_bytes=2 * size)
+    owner = Owner()
+
+    cached(cache, owner, "a", frame)
+    cached(cache, owner, "b", frame.copy())
+    cache.touch(owner, "a")
+    cached(cache, owner, "c", frame.copy())
+
+    assert set(owner._views) == {"a", "c"}
+    assert cache.nbytes == 2 * size
+
+
+def test_view_cache_discard():
+    cache = ViewCache()
+    owner = Owner()
+    cached(cache, owner, "a", "text")
+    cache.discard(owner, "a")
+    assert cache.nbytes == 0
+
+
+def test_view_cache_drops_views_of_collected_owners():
+    cache = ViewCache()
+    owner = Owner()
+    cached(cache, owner, "a", "text")
+    del owner
+    gc.collect()
+
+    cached(cache, Owner(), "b", "other")
+    assert cache.nbytes == len("other")
+
+
+def test_view_cache_id_index():
+    cache = ViewCache()
+    index = pd.Index(["0", "1", "2"])
+
+    assert cache.id_index(("hash", 3), index) is index
+    assert cache.id_index(("hash", 3), pd.Index(["0", "1", "2"])) is index
+
+    # Rows in another order are not taken for the cached ones
+    other = pd.Index(["2", "1", "0"])
+    assert cache.id_index(("hash", 3), other) is other
+
+
+def test_view_cache_id_index_checks_every_id():
+    cache = ViewCache()
+    index = pd.Index(["0", "1", "2", "3"])
+    cache.id_index(("hash", 4), index)
+
+    # Same first and last ids, middle rows swapped
+    permuted = pd.Index(["0", "2", "1", "3"])
+    assert cache.id_index(("hash", 4), permuted) is permuted
+    assert cache.id_index(("hash", 4), pd.Index(["0", "2", "1", "3"])) is permuted
+
+
+def test_grid_state_store_merges_slices():
+    store = GridStateStore()
+    store.merge("t", 1, True, {"sort": ["a"], "filter": {"x": 1}}, [{"colId": "a"}])
+
+    grid_state, columns_state = store.merge("t", 2, False, {"filter": None, "focus": 3}, None)
+
+    assert grid_state == {"sort": ["a"], "focus": 3}
+    assert columns_state == [{"colId": "a"}]
+    assert store.known_tokens() == ["t"]
+
+
+def test_grid_state_store_repeated_seq_returns_stored_state():
+    store = GridStateStore()
+    store.merge("t", 1, True, {"sort": ["a"]}, None)
+    store.merge("t", 2, False, {"focus": 1}, None)
+
+    grid_state, _ = store.merge("t", 2, False, {"focus": 1}, None)
+    assert grid_state == {"sort": ["a"], "focus": 1}
+
+
+def test_grid_state_store_gap_makes_token_incomplete():
+    store = GridStateStore()
+    store.merge("t", 1, True, {"sort": ["a"]}, None)
+    store.merge("t", 3, False, {"focus": 1}, None)
+
+    # The grid will send its full state again
+    assert store.known_tokens() == []
+    store.merge("t", 4, True, {"sort": ["b"]}, None)
+    assert store.known_tokens() == ["t"]
+
+
+def test_grid_state_store_slice_without_full_state():
+    store = GridStateStore()
+    grid_state, _ = store.merge("t", 5, False, {"focus": 1}, None)
+    assert grid_state == {"focus": 1}
+    assert store.known_tokens() == []
+
+
+def test_grid_state_store_bounded():
+    store = GridStateStore(max_grids=2)
+    for token in ["a", "b", "c"]:
+        store.merge(token, 1, True, {}, None)
+    assert store.known_tokens() == ["b", "c"]
+
+
+def test_edits_store_accumulates_edits():
+    store = EditsStore()
+    assert store.merge("t", 0, [{"rowId": "0"}]) == [{"rowId": "0"}]
+    assert store.merge("t", 1, [{"rowId": "1"}]) == [{"rowId": "0"}, {"rowId": "1"}]
+
+
+def test_edits_store_ignores_edits_already_received():
+    store = EditsStore()
+    store.merge("t", 0, [{"rowId": "0"}])
+    store.merge("t", 1, [{"rowId": "1"}])
+    assert store.merge("t", 1, [{"rowId": "1"}]) == [{"rowId": "0"}, {"rowId": "1"}]
+    assert store.merge("t", 0, [{"rowId": "0"}]) == [{"rowId": "0"}, {"rowId": "1"}]
+
+
+def test_edits_store_takes_new_edits_of_a_batch_sent_again():
+    store = EditsStore()
+    store.merge("t", 0, [{"rowId": "0"}])
+    # Edits 0 and 1, edit 0 was not acknowledged to the grid yet
+    assert store.merge("t", 0, [{"rowId": "0"}, {"rowId": "1"}]) == [
+        {"rowId": "0"},
+        {"rowId": "1"},
+    ]
+
+
+def test_edits_store_keeps_grids_apart():
+    store = EditsStore(max_grids=1)
+    store.merge("a", 0, [{"rowId": "0"}])
+    assert store.merge("b", 0, [{"rowId": "1"}]) == [{"rowId": "1"}]
+    # "a" was evicted
+    assert store.merge("a", 1, []) == []
+
+
+def test_ranges_to_mask():
+    assert ranges_to_mask([1, 3, 5, 6], 7).tolist() == [
+        False, True, True, False, False, True, False
+    ]
+
+
+def test_ranges_to_mask_empty_and_out_of_bounds():
+    assert not ranges_to_mask(None, 3).any()
+    assert not ranges_to_mask([], 3).any()
+    assert ranges_to_mask([2, 10], 4).tolist() == [False, False, True, True]
+
+
+def test_ranges_to_mask_overlapping_ranges():
+    assert ranges_to_mask([0, 2, 1, 3], 4).tolist() == [True, True, True, False]
+
+
+def test_restore_ints():
+    restored = _restore_ints(np.array([1.0, 2.0, -3.0]))
+    assert restored.dtype == np.int64
+    assert restored.tolist() == [1, 2, -3]
+
+
+@pytest.mark.parametrize(
+    "values",
+    [
+        np.array([1.0, 2.5]),
+        np.array([1.0, np.nan]),
+        np.array([2.0**60]),
+    ],
+    ids=["fractional", "nan", "over 2**53"],
+)
+def test_restore_ints_keeps_floats(values):
+    assert _restore_ints(values).dtype.kind == "f"
+
+
+def test_restore_ints_ignores_other_values():
+    values = ["a", "b"]
+    assert _restore_ints(values) is values
+    empty = np.array([], dtype=float)
+    assert _restore_ints(empty) is empty
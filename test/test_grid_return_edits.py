@@ -0,0 +1,149 @@
+import pandas as pd
+import pytest
+
+from st_aggrid.AgGridReturn import AgGridReturn, _row_id_field
+from st_aggrid.grid_response_store import EditsStore
+from st_aggrid.shared import DataReturnMode, JsCode
+
+
+def edit(row_id, column, old, new):
+    return {"rowId": row_id, "column": column, "oldValue": old, "newValue": new}
+
+
+def edits_return(df, edits, seq, store=None, token="t", start=0, **kwargs):
+    response = AgGridReturn(
+        df,
+        data_return_mode=DataReturnMode.EDITS,
+        data_hash="hash",
+        edits_store=store,
+        **kwargs,
+    )
+    response._set_component_value(
+        {"edits": edits, "editsToken": token, "editsSeq": seq, "editsStart": start}
+    )
+    return response
+
+
+@pytest.fixture
+def df():
+    return pd.DataFrame(
+        {"id": ["a", "b", "c"], "qty": [1, 2, 3], "name": ["x", "y", "z"]},
+        index=[10, 11, 12],
+    )
+
+
+def test_edits_log(df):
+    response = edits_return(df, [edit("0", "qty", 1, 5)], 1)
+    assert response.edits.to_dict(orient="records") == [edit("0", "qty", 1, 5)]
+    assert response.edits_batch_id == "t:1"
+
+
+def test_apply_edits_by_position_with_auto_row_ids(df):
+    response = edits_return(df, [edit("1", "qty", 2, 20), edit("2", "name", "z", "w")], 1)
+    patched = response.apply_edits(df)
+
+    assert patched["qty"].tolist() == [1, 20, 3]
+    assert patched["name"].tolist() == ["x", "y", "w"]
+    assert patched["qty"].dtype == df["qty"].dtype
+    # The input is left as it is
+    assert df["qty"].tolist() == [1, 2, 3]
+
+
+def test_apply_edits_keeps_last_value_of_a_cell(df):
+    response = edits_return(df, [edit("0", "qty", 1, 4), edit("0", "qty", 4, 8)], 1)
+    assert response.apply_edits(df)["qty"].tolist() == [8, 2, 3]
+
+
+def test_apply_edits_ignores_unknown_rows_and_columns(df):
+    response = edits_return(df, [edit("9", "qty", 0, 1), edit("0", "missing", 0, 1)], 1)
+    pd.testing.assert_frame_equal(response.apply_edits(df), df)
+
+
+def test_apply_edits_falls_back_to_object_dtype(df):
+    response = edits_return(df, [edit("0", "qty", 1, "many")], 1)
+    patched = response.apply_edits(df)
+    assert patched["qty"].tolist() == ["many", 2, 3]
+
+
+def test_apply_edits_adds_categories(df):
+    df["name"] = df["name"].astype("category")
+    response = edits_return(df, [edit("1", "name", "y", "w"), edit("2", "name", "z", "x")], 1)
+    patched = response.apply_edits(df)
+    assert patched["name"].tolist() == ["x", "w", "x"]
+    assert list(patched["name"].cat.categories) == ["x", "y", "z", "w"]
+    assert list(df["name"].cat.categories) == ["x", "y", "z"]
+
+
+def test_apply_edits_by_row_id_field(df):
+    response = edits_return(
+        df, [edit("c", "qty", 3, 30)], 1, auto_row_ids=False, row_id_field="id"
+    )
+    assert response.apply_edits(df)["qty"].tolist() == [1, 2, 30]
+
+
+def test_apply_edits_by_index_without_row_id_field(df):
+    response = edits_return(df, [edit("11", "qty", 2, 20)], 1, auto_row_ids=False)
+    assert response.apply_edits(df)["qty"].tolist() == [1, 20, 3]
+
+
+def test_data_applies_every_batch(df):
+    store = EditsStore()
+    edits_return(df, [edit("0", "qty", 1, 10)], 1, store)
+    response = edits_return(df, [edit("2", "qty", 3, 30)], 2, store, start=1)
+
+    assert response.data["qty"].tolist() == [10, 2, 30]
+    # apply_edits only applies the batch of this return
+    assert response.apply_edits(df)["qty"].tolist() == [1, 2, 30]
+
+
+def test_data_does_not_apply_a_batch_twice(df):
+    store = EditsStore()
+    edits_return(df, [edit("0", "name", "x", "x1")], 1, store)
+    edits_return(df, [edit("0", "name", "x1", "x2")], 2, store, start=1)
+    # Rerun not triggered by the grid, the last batch is read again
+    response = edits_return(df, [edit("0", "name", "x1", "x2")], 2, store, start=1)
+
+    assert response.data["name"].tolist() == ["x2", "y", "z"]
+    assert len(store.merge(("t", "hash"), 2, [])) == 2
+
+
+def test_data_applies_edits_sent_again(df):
+    store = EditsStore()
+    edits_return(df, [edit("0", "qty", 1, 10)], 1, store)
+    # The first return was not acknowledged, its edit is sent again
+    response = edits_return(
+        df, [edit("0", "qty", 1, 10), edit("1", "qty", 2, 20)], 2, store
+    )
+
+    assert response.data["qty"].tolist() == [10, 20, 3]
+    assert len(store.merge(("t", "hash"), 2, [])) == 2
+
+
+def test_data_of_another_mount_starts_over(df):
+    store = EditsStore()
+    edits_return(df, [edit("0", "qty", 1, 10)], 1, store)
+    response = edits_return(df, [edit("1", "qty", 2, 20)], 1, store, token="other")
+    assert response.data["qty"].tolist() == [1, 20, 3]
+
+
+def test_selected_data_is_not_tracked(df):
+    assert edits_return(df, [], 1).selected_data is None
+
+
+@pytest.mark.parametrize(
+    "get_row_id, field",
+    [
+        (JsCode("function(params) { return params.data.id }"), "id"),
+        ("params => params.data['order id']", "order id"),
+        ('params => String(params.data["id"])', "id"),
+        ("params => params.data.a + '-' + params.data.b", None),
+        ("params => params.node.rowIndex", None),
+    ],
+)
+def test_row_id_field(get_row_id, field):
+    assert _row_id_field({"getRowId": get_row_id}) == field
+
+
+def test_row_id_field_without_get_row_id():
+    assert _row_id_field({}) is None
+    assert _row_id_field(None) is None
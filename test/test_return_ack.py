@@ -0,0 +1,77 @@
+import sys
+from unittest import mock
+
+import pandas as pd
+import pytest
+import streamlit as st
+
+from st_aggrid import AgGrid
+
+aggrid_module = sys.modules["st_aggrid.AgGrid"]
+
+
+def script_run_ctx(suppress_warning=False):
+    """Stands in for the script run context, so grids get their session objects."""
+    return object()
+
+
+@pytest.fixture
+def component():
+    """Replaces the component, returns the args of each render."""
+    renders = []
+    session_state = {}
+    values = {}
+
+    def component_func(**kwargs):
+        renders.append(kwargs)
+        return values.get(kwargs["key"])
+
+    with mock.patch.object(aggrid_module, "_component_func", component_func), mock.patch.object(
+        st, "session_state", session_state
+    ), mock.patch.object(aggrid_module, "get_script_run_ctx", script_run_ctx):
+        yield renders, session_state, values
+
+
+def grid_return(component, key, return_seq):
+    """Simulates the grid sending a return, which runs its on_change callback."""
+    renders, session_state, values = component
+    value = {"returnSeq": return_seq, "gridState": {}}
+    values[key] = session_state[key] = value
+    renders[-1]["on_change"]()
+
+
+def test_ack_seq_echoes_last_return(component):
+    renders, _, _ = component
+    df = pd.DataFrame({"a": [1, 2, 3]})
+
+    AgGrid(df, key="grid")
+    assert renders[-1]["ack_seq"] is None
+
+    grid_return(component, "grid", 7)
+    response = AgGrid(df, key="grid")
+    assert renders[-1]["ack_seq"] == 7
+    assert "returnSeq" not in response.grid_response
+
+
+def test_identical_args_rerun_keeps_ack_seq(component):
+    renders, _, _ = component
+    df = pd.DataFrame({"a": [1, 2, 3]})
+
+    AgGrid(df, key="grid")
+    grid_return(component, "grid", 7)
+    AgGrid(df, key="grid")
+
+    # A rerun not triggered by the grid must not acknowledge a later return
+    AgGrid(df, key="grid")
+    assert renders[-1]["ack_seq"] == renders[-2]["ack_seq"] == 7
+
+    grid_return(component, "grid", 8)
+    AgGrid(df, key="grid")
+    assert renders[-1]["ack_seq"] == 8
+
+
+def test_grid_without_key_has_no_ack_seq(component):
+    renders, _, _ = component
+
+    AgGrid(pd.DataFrame({"a": [1, 2, 3]}))
+    assert renders[-1]["ack_seq"] is None